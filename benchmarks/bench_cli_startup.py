@@ -0,0 +1,130 @@
+"""Time how long each CLI subcommand takes to start, and compare two runs.
+
+Every subcommand is run in a fresh interpreter against a small config in a temporary folder. The best wall time of
+`--repeat` runs is recorded as `startup/<subcommand>`, and the time the interpreter spent importing modules, as
+reported by `python -X importtime`, as `startup/<subcommand>/imports`. The run subcommand is a dry run that stops on
+the missing schema file, so it measures the imports of the pipeline rather than a pipeline. The results are saved as
+JSON in the format of bench_pipeline.py, so its `compare` flags startup regressions too.
+
+Usage:
+    python benchmarks/bench_cli_startup.py run --output results/startup_main.json
+    python benchmarks/bench_cli_startup.py compare results/startup_main.json results/startup_branch.json --threshold 0.1
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench_pipeline import compare, git_commit
+
+ROOT = Path(__file__).resolve().parents[1]
+MAIN = ROOT / "src" / "main.py"
+
+CONFIG = """
+[details]
+project_path = "./"
+name = "startup"
+description = "Startup benchmark"
+transformer_pipeline = "transformer.py"
+
+[[extract_files]]
+data_file = "data.csv"
+schema_file = "schema.py"
+label = "data"
+
+[output]
+schema_file = "schema.py"
+output_path = "./"
+table_name = "table"
+db = "db"
+data_label = "label"
+"""
+
+SUBCOMMANDS = {
+    "help": [],
+    "list": ["list", "--dir", "."],
+    "validate": ["validate", "--config", "config.toml"],
+    "run": ["run", "--config", "config.toml", "--dry-run"],
+}
+
+# A line of `-X importtime` output: self and cumulative microseconds, then the module name indented by its depth
+IMPORT_TIME = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| (\S.*)$")
+
+
+def best_wall_time(args: list[str], cwd: Path, repeat: int) -> float:
+    """Return the best wall time in seconds of `repeat` runs of the CLI with `args`, interpreter startup included."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, str(MAIN), *args], capture_output=True, cwd=cwd)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def import_seconds(args: list[str], cwd: Path) -> float:
+    """Return the seconds one run of the CLI with `args` spends importing modules, summed over top-level imports."""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", str(MAIN), *args], capture_output=True, text=True, cwd=cwd).stderr
+    # Nested imports are indented and already counted in the cumulative time of the module that imported them
+    cumulative = [int(match.group(1)) for match in map(IMPORT_TIME.match, stderr.splitlines()) if match]
+    return sum(cumulative) / 1e6
+
+
+def run(args: argparse.Namespace) -> None:
+    print(f"{'benchmark':<60} {'seconds':>9}")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = Path(tmp)
+        (cwd / "config.toml").write_text(CONFIG)
+        for name in args.subcommands:
+            timings = {
+                f"startup/{name}": best_wall_time(SUBCOMMANDS[name], cwd=cwd, repeat=args.repeat),
+                f"startup/{name}/imports": min(import_seconds(SUBCOMMANDS[name], cwd=cwd) for _ in range(args.repeat)),
+            }
+            for benchmark, seconds in timings.items():
+                results.append({"benchmark": benchmark, "rows": 0, "seconds": seconds})
+                print(f"{benchmark:<60} {seconds:>9.3f}", flush=True)
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results of {len(results)} benchmarks saved to {output}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the startup time of the CLI subcommands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks and save the results as JSON")
+    run_parser.add_argument("--subcommands", nargs="+", default=list(SUBCOMMANDS), choices=list(SUBCOMMANDS), help="Subcommands")
+    run_parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs of each subcommand")
+    run_parser.add_argument("--output", required=True, help="JSON file to save the results to")
+
+    compare_parser = subparsers.add_parser("compare", help="Flag subcommands that got slower to start between two result files")
+    compare_parser.add_argument("base", help="Results of the baseline, such as the main branch")
+    compare_parser.add_argument("head", help="Results to check for regressions")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="Relative slowdown to flag (default: 0.1)")
+    compare_parser.add_argument("--min-seconds", type=float, default=0.01, help="Ignore changes shorter than this")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
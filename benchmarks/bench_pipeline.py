@@ -0,0 +1,249 @@
+"""Time the stages of the sample pipelines on synthetic inputs of 1e5, 1e6 and 1e7 rows, and compare two runs.
+
+Each pipeline config in sample_projects/ is scaled to every requested size. The rows of its data files are repeated
+and the customer keys of each repetition get a suffix of their own, so the scaled files still satisfy their input
+schemas, the keys the output schemas require to be unique stay unique, and the files of a set still join. Every
+input is written in each file format `read_table` supports and timed through a read; the data read from the first
+format is then timed through validation, the transformer, output validation and a write with every backend in the
+DataFrameWriterRegistry. The best of `--repeat` runs of each stage is saved as JSON with the commit and library
+versions it was measured on.
+
+`compare` matches the benchmarks of two result files and flags those that got slower by more than `--threshold`.
+It exits with status 1 if any did, so it can gate a nightly job or a release.
+
+Usage:
+    python benchmarks/bench_pipeline.py run --rows 100000 1000000 10000000 --output results/main.json
+    python benchmarks/bench_pipeline.py compare results/main.json results/branch.json --threshold 0.1
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from bench_read_engines import scale_dataframe  # noqa: E402
+from data_loader.data_writer import DataFrameWriter, DataFrameWriterRegistry  # noqa: E402
+from data_loader.file_type_readers import READER_ENGINES, read_input_data, read_table  # noqa: E402
+from data_loader.object_loader import load_object_from_file  # noqa: E402
+from data_loader.pipeline import DEFAULT_PATHS  # noqa: E402
+from data_loader.pipeline_config_io import load_pipeline_config  # noqa: E402
+from data_loader.schema_pushdown import schema_read_options  # noqa: E402
+from data_loader.transformer_loader import load_transformer_function  # noqa: E402
+from data_loader.validation_engines import validate_dataframe  # noqa: E402
+
+SAMPLE_CONFIGS = sorted((ROOT / "sample_projects").glob("set*/*.toml"))
+SIZES = [100_000, 1_000_000, 10_000_000]
+
+# Columns that identify a customer in the sample data files
+KEY_COLUMNS = {"person_id", "cust_id"}
+
+# An Excel worksheet holds at most 1,048,576 rows, including the header
+EXCEL_MAX_ROWS = 1_048_575
+
+INPUT_FORMATS: dict[str, tuple[str, Callable[[pd.DataFrame, Path], None]]] = {
+    "csv": (".csv", lambda df, path: df.to_csv(path, index=False)),
+    "tsv": (".tsv", lambda df, path: df.to_csv(path, sep="\t", index=False)),
+    "parquet": (".parquet", lambda df, path: df.to_parquet(path, index=False)),
+    "feather": (".feather", lambda df, path: df.to_feather(path)),
+    "excel": (".xlsx", lambda df, path: df.to_excel(path, index=False)),
+}
+
+
+def sample_path(path: str | Path) -> Path:
+    """Map a path from a sample config, written on another machine, to the sample_projects folder of this checkout."""
+    parts = Path(path).parts
+    return ROOT.joinpath(*parts[parts.index("sample_projects") :])
+
+
+def synthesize(df: pd.DataFrame, rows: int) -> pd.DataFrame:
+    """Repeat the rows of a sample file until it has `rows` rows, with a suffix on the keys of each repetition."""
+    scaled = scale_dataframe(df, rows=rows)
+    repetition = pd.Series(np.arange(rows) // len(df)).astype(str)
+    for column in KEY_COLUMNS.intersection(df.columns):
+        scaled[column] = scaled[column].astype(str) + "_" + repetition
+    return scaled
+
+
+def best_time(func: Callable, repeat: int) -> tuple[float, object]:
+    """Return the best wall time in seconds of `repeat` calls of `func`, and the result of the last call."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def bench_pipeline(config_file: Path, rows: int, formats: list[str], engine: str, repeat: int, work_dir: Path) -> list[dict]:
+    """Time every stage of one sample pipeline on inputs of `rows` rows."""
+    config = load_pipeline_config(path=config_file)
+    results = []
+
+    def record(benchmark: str, seconds: float) -> None:
+        results.append({"benchmark": f"{config_file.stem}/{benchmark}", "rows": rows, "seconds": seconds})
+        print(f"{config_file.stem + '/' + benchmark:<60} {rows:>10} {seconds:>9.3f} {rows / seconds:>12,.0f}", flush=True)
+
+    validated_inputs = []
+    for extract_file in config.extract_files:
+        data_file, schema_file = sample_path(extract_file.data_file), sample_path(extract_file.schema_file)
+        schema = load_object_from_file(folder_name=schema_file.parent, file_name=schema_file.name, object_name="schema")
+        scaled = synthesize(read_table(data_file), rows=rows)
+        read_options = {"engine": engine, **schema_read_options(schema)}
+
+        data = None
+        for file_format in formats:
+            if file_format == "excel" and rows > EXCEL_MAX_ROWS:
+                continue
+            suffix, write = INPUT_FORMATS[file_format]
+            path = work_dir / f"{data_file.stem}{suffix}"
+            write(scaled, path)
+            seconds, frame = best_time(lambda: read_input_data(path=path, **read_options), repeat)
+            record(f"read/{data_file.stem}/{file_format}", seconds)
+            data = frame if data is None else data
+            path.unlink()
+
+        seconds, validated = best_time(lambda: validate_dataframe(df=data, schema=schema, schema_file=schema_file), repeat)
+        record(f"validate/{data_file.stem}", seconds)
+        validated_inputs.append(validated)
+
+    output_schema_file = sample_path(config.output_table.schema_file)
+    output_schema = load_object_from_file(folder_name=output_schema_file.parent, file_name=output_schema_file.name, object_name="schema")
+    transform = load_transformer_function(
+        transformer_file=sample_path(config.details.transformer_pipeline),
+        template_file=ROOT / DEFAULT_PATHS["signature_model"],
+    )
+
+    seconds, transformed = best_time(lambda: transform(*validated_inputs, output_schema=output_schema), repeat)
+    record("transform", seconds)
+
+    seconds, output = best_time(lambda: validate_dataframe(df=transformed, schema=output_schema, schema_file=output_schema_file), repeat)
+    record("validate/output", seconds)
+
+    for write_method in DataFrameWriterRegistry.available_writers():
+        output_path = work_dir / "output" / write_method
+        output_path.mkdir(parents=True)
+        writer = DataFrameWriter(
+            df=output,
+            output_path=output_path,
+            write_method=write_method,
+            db=config.output_table.db,
+            table_name=config.output_table.table_name,
+            static_partitions={"data_label": config.output_table.data_label},
+            mode="overwrite",
+        )
+        # The writers print the path of every write
+        with contextlib.redirect_stdout(io.StringIO()):
+            seconds, _ = best_time(writer.write, repeat)
+        record(f"write/{write_method}", seconds)
+        shutil.rmtree(output_path)
+
+    return results
+
+
+def git_commit() -> str | None:
+    """Return the commit of this checkout, with a `-dirty` suffix if it has uncommitted changes."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, capture_output=True, text=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit.strip() + ("-dirty" if status.strip() else "")
+
+
+def run(args: argparse.Namespace) -> None:
+    configs = [config for config in SAMPLE_CONFIGS if not args.pipelines or config.stem in args.pipelines]
+    print(f"{'benchmark':<60} {'rows':>10} {'seconds':>9} {'rows/s':>12}")
+
+    results = []
+    for rows in args.rows:
+        for config_file in configs:
+            with tempfile.TemporaryDirectory() as tmp:
+                results.extend(bench_pipeline(config_file, rows, args.formats, args.engine, args.repeat, Path(tmp)))
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "pyarrow": pyarrow.__version__,
+        "engine": args.engine,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results of {len(results)} benchmarks saved to {output}")
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Print the change of every benchmark between two result files and return 1 if any got slower."""
+    base, head = (json.loads(Path(path).read_text()) for path in (args.base, args.head))
+    base_seconds = {(result["benchmark"], result["rows"]): result["seconds"] for result in base["results"]}
+    head_seconds = {(result["benchmark"], result["rows"]): result["seconds"] for result in head["results"]}
+
+    print(f"Comparing {base.get('commit')} ({args.base}) with {head.get('commit')} ({args.head})")
+    print(f"{'benchmark':<60} {'rows':>10} {'base s':>9} {'head s':>9} {'change':>8}")
+    regressions = 0
+    for key in sorted(base_seconds.keys() & head_seconds.keys()):
+        before, after = base_seconds[key], head_seconds[key]
+        change = after / before - 1 if before else 0.0
+        # Very short timings are too noisy to flag
+        flag = ""
+        if after - before > args.min_seconds and change > args.threshold:
+            flag = "  SLOWER"
+            regressions += 1
+        elif before - after > args.min_seconds and -change > args.threshold / (1 + args.threshold):
+            flag = "  faster"
+        print(f"{key[0]:<60} {key[1]:>10} {before:>9.3f} {after:>9.3f} {change:>+8.1%}{flag}")
+
+    for key in sorted(base_seconds.keys() ^ head_seconds.keys()):
+        print(f"{key[0]:<60} {key[1]:>10}  only in {args.base if key in base_seconds else args.head}")
+
+    print(f"{regressions} regressions above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the stages of the sample pipelines on scaled inputs")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks and save the results as JSON")
+    run_parser.add_argument("--rows", type=int, nargs="+", default=SIZES, help="Number of rows in each scaled input")
+    run_parser.add_argument("--pipelines", nargs="+", default=None, help="Names of sample configs to run (default: all)")
+    run_parser.add_argument("--formats", nargs="+", default=list(INPUT_FORMATS), choices=list(INPUT_FORMATS), help="Input formats")
+    run_parser.add_argument("--engine", default="pandas-c", choices=READER_ENGINES, help="Parsing engine for CSV and TSV files")
+    run_parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs of each stage")
+    run_parser.add_argument("--output", required=True, help="JSON file to save the results to")
+
+    compare_parser = subparsers.add_parser("compare", help="Flag benchmarks that got slower between two result files")
+    compare_parser.add_argument("base", help="Results of the baseline, such as the main branch")
+    compare_parser.add_argument("head", help="Results to check for regressions")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="Relative slowdown to flag (default: 0.1)")
+    compare_parser.add_argument("--min-seconds", type=float, default=0.01, help="Ignore changes shorter than this")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
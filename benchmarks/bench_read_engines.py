@@ -0,0 +1,69 @@
+"""Compare the CSV/TSV reader engines of `read_table` on scaled-up copies of the sample project files.
+
+Each sample CSV is repeated until it reaches the requested number of rows, written once to a temporary
+folder (as CSV and TSV) and then read with every engine in READER_ENGINES. The best of `--repeat` runs is
+reported for every file, format and engine.
+
+Usage:
+    python benchmarks/bench_read_engines.py --rows 2000000 --repeat 3
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from data_loader.file_type_readers import READER_ENGINES, read_table  # noqa: E402
+
+SAMPLE_FILES = sorted((ROOT / "sample_projects").glob("set*/data/*.csv"))
+
+
+def scale_dataframe(df: pd.DataFrame, rows: int) -> pd.DataFrame:
+    """Repeat the rows of `df` until the result has exactly `rows` rows."""
+    return df.iloc[np.resize(np.arange(len(df)), rows)].reset_index(drop=True)
+
+
+def time_read(file_path: Path, engine: str, repeat: int) -> float:
+    """Return the best wall time in seconds of reading `file_path` with `engine`."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read_table(file_path, engine=engine)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the CSV/TSV reader engines of read_table")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Number of rows in each scaled file")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed reads per file and engine")
+    args = parser.parse_args()
+
+    print(f"{'file':<32} {'format':<6} {'engine':<10} {'seconds':>9} {'rows/s':>12} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for sample_file in SAMPLE_FILES:
+            scaled = scale_dataframe(pd.read_csv(sample_file), rows=args.rows)
+            for file_format, sep in (("csv", ","), ("tsv", "\t")):
+                file_path = Path(tmp) / f"{sample_file.stem}.{file_format}"
+                scaled.to_csv(file_path, sep=sep, index=False)
+
+                baseline = None
+                for engine in READER_ENGINES:
+                    seconds = time_read(file_path, engine=engine, repeat=args.repeat)
+                    baseline = baseline or seconds
+                    print(
+                        f"{sample_file.stem:<32} {file_format:<6} {engine:<10} {seconds:>9.3f} "
+                        f"{args.rows / seconds:>12,.0f} {baseline / seconds:>7.2f}x"
+                    )
+                file_path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,14 @@
-from pandas import DataFrame
+from pandas import DataFrame, get_option
 # from pandera.pandas import DataFrameSchema
 
+# The inputs are joined on person_id, so each person's rows can be transformed in a separate process
+PARTITION_BY = "person_id"
+
 
 def transform(*dfs: DataFrame, **kwargs) -> DataFrame:
-    # Make a copy of the dataframes
-    df0 = dfs[0].copy(deep=True)
-    df1 = dfs[1].copy(deep=True)
+    # Make a copy of the dataframes. With copy-on-write the inputs are read-only, so a lazy copy is enough
+    df0 = dfs[0].copy(deep=not get_option("mode.copy_on_write"))
+    df1 = dfs[1].copy(deep=not get_option("mode.copy_on_write"))
 
     df_final = df0.merge(df1, how="outer", on="person_id")
 
@@ -1,9 +1,13 @@
-from pandas import DataFrame, to_datetime
+from pandas import DataFrame, get_option, to_datetime
+
+
+# Every row is transformed on its own, so the input can be split across processes
+ROW_LOCAL = True
 
 
 def transform(*dfs: DataFrame, **kwargs) -> DataFrame:
-    # Make a copy of the dataframe
-    df_final = dfs[0].copy(deep=True)
+    # Make a copy of the dataframe. With copy-on-write the input is read-only, so a lazy copy is enough
+    df_final = dfs[0].copy(deep=not get_option("mode.copy_on_write"))
 
     # Rename these columns
     rename_map = {
@@ -1,10 +1,10 @@
-from pandas import DataFrame
+from pandas import DataFrame, get_option
 from datetime import datetime
 
 
 def transform(*dfs: DataFrame, **kwargs) -> DataFrame:
-    # Make a copy of the dataframe
-    df_final = dfs[0].copy(deep=True)
+    # Make a copy of the dataframe. With copy-on-write the input is read-only, so a lazy copy is enough
+    df_final = dfs[0].copy(deep=not get_option("mode.copy_on_write"))
 
     # Rename these columns
     rename_map = {"cust_id": "customer_id", "postal_code": "address_postal_code", "country": "address_country"}
@@ -0,0 +1,97 @@
+import json
+import numpy as np
+import os
+import pandas as pd
+import pyarrow as pa
+from pandas import DataFrame
+from pathlib import Path
+
+# Schema metadata key holding the missing value of each object column, which Arrow stores as null
+MISSING_VALUES_KEY = b"data_loader.missing_values"
+MISSING_VALUES = {"nan": np.nan, "None": None, "NA": pd.NA, "NaT": pd.NaT}
+
+
+def write_arrow_ipc(df: DataFrame, path: Path) -> int:
+    """Write a DataFrame to an Arrow IPC file.
+    The file is written next to its destination and moved into place, so readers never see a partial file.
+    The pandas index and dtypes are kept in the Arrow schema metadata, with the missing value of each object column.
+    Args:
+        df (DataFrame): The dataframe to write.
+        path (Path): Destination of the Arrow IPC file.
+    Returns:
+        int: Size of the written file in bytes.
+    Raises:
+        pyarrow.ArrowException: If the dataframe holds values that cannot be converted to Arrow.
+        ValueError: If an object column mixes missing values, such as NaN and None, which Arrow cannot tell apart.
+    """
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+    table = pa.Table.from_pandas(df)
+    # pandas reads Arrow nulls in object columns back as None
+    missing_values = {position: name for position, name in _missing_values(df).items() if name != "None"}
+    if missing_values:
+        table = table.replace_schema_metadata({**table.schema.metadata, MISSING_VALUES_KEY: json.dumps(missing_values).encode()})
+    try:
+        with pa.OSFile(str(tmp_path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    return path.stat().st_size
+
+
+def read_arrow_ipc(path: Path, memory_map: bool = True) -> DataFrame:
+    """Read a DataFrame from an Arrow IPC file written by `write_arrow_ipc`.
+    Args:
+        path (Path): Path to the Arrow IPC file.
+        memory_map (bool, optional): Memory-map the file instead of reading it into memory. Defaults to True.
+    Returns:
+        DataFrame: The dataframe with its original index, dtypes and missing values.
+    """
+
+    source = pa.memory_map(str(path)) if memory_map else pa.OSFile(str(path))
+    with source:
+        table = pa.ipc.open_file(source).read_all()
+        df = table.to_pandas()
+
+    missing_values = json.loads((table.schema.metadata or {}).get(MISSING_VALUES_KEY, b"{}"))
+    for position, name in missing_values.items():
+        values = df.iloc[:, int(position)].to_numpy(dtype=object, copy=True)
+        values[pd.isna(values)] = MISSING_VALUES[name]
+        df.isetitem(int(position), values)
+    return df
+
+
+def _missing_values(df: DataFrame) -> dict[str, str]:
+    """Return the name of the missing value of each object column that has missing values, keyed by column position."""
+    missing_values = {}
+    for position, (column_name, column) in enumerate(df.items()):
+        if column.dtype != object:
+            continue
+        values = column.to_numpy()
+        missing = pd.isna(values)
+        if not missing.any():
+            continue
+        names = {_missing_value_name(value) for value in values[missing]}
+        if len(names) > 1 or None in names:
+            raise ValueError(f"Column '{column_name}' holds missing values that Arrow cannot tell apart")
+        missing_values[str(position)] = names.pop()
+    return missing_values
+
+
+def _missing_value_name(value) -> str | None:
+    """Return the name of a missing value in MISSING_VALUES, or None if it is not one of them."""
+    if value is None:
+        return "None"
+    if value is pd.NA:
+        return "NA"
+    if value is pd.NaT:
+        return "NaT"
+    # Also matches the NumPy float NaN
+    if isinstance(value, float):
+        return "nan"
+    return None
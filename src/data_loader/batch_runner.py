@@ -0,0 +1,134 @@
+from data_loader.data_writer import ConnectionPool
+from data_loader.pipeline import run_pipeline
+from data_loader.pipeline_config_io import load_pipeline_config
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class PipelineRunResult:
+    config: str
+    status: str
+    rows: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the pipeline ran, or was skipped because it is unchanged since its last write."""
+        return self.status == "ok" or (self.status == "skipped" and self.error is None)
+
+
+def find_configs(config_dir: Path | str) -> list[Path]:
+    """Return the TOML configuration files of a directory, sorted by name."""
+    return sorted(Path(config_dir).resolve().glob("*.toml"))
+
+
+def writer_target(config: Path, save_method: str) -> tuple[str, ...]:
+    """
+    Return the output a pipeline writes to: its output folder and database. Pipelines with the same target have to run
+    one after the other, because a DuckDB file can only be opened by one process at a time. Configurations that cannot
+    be loaded get a target of their own, and report their error when they run.
+    """
+    try:
+        output_table = load_pipeline_config(path=config).output_table
+    except Exception:
+        return ("unreadable", str(config))
+    return (save_method, str(Path(output_table.output_path).resolve()), output_table.db)
+
+
+def group_by_target(configs: list[Path], save_method: str) -> list[list[Path]]:
+    """Group configurations by the output they write to, keeping their order within each group."""
+    groups: dict[tuple[str, ...], list[Path]] = {}
+    for config in configs:
+        groups.setdefault(writer_target(config, save_method), []).append(config)
+    return list(groups.values())
+
+
+def run_group(configs: list[Path], mode: str, dry_run: bool, save_method: str, force: bool = False) -> list[PipelineRunResult]:
+    """
+    Run pipelines that write to the same output one after the other, sharing one connection pool. A pipeline that
+    fails is reported in its result and does not stop the others.
+    """
+    results = []
+    with ConnectionPool() as connections:
+        for config in configs:
+            start = time.perf_counter()
+            try:
+                run = run_pipeline(
+                    config=str(config), mode=mode, dry_run=dry_run, save_method=save_method, connections=connections, force=force
+                )
+                result = PipelineRunResult(config=str(config), status=run.status, rows=run.rows)
+            except Exception as e:
+                result = PipelineRunResult(config=str(config), status="failed", error=f"{type(e).__name__}: {e}")
+            result.seconds = time.perf_counter() - start
+            results.append(result)
+    return results
+
+
+def run_batch(
+    config_dir: Path | str,
+    workers: int = 1,
+    mode: str = "append",
+    dry_run: bool = False,
+    save_method: str = "parquet",
+    force: bool = False,
+) -> list[PipelineRunResult]:
+    """
+    Run every pipeline configuration in a directory, on a pool of worker processes.
+
+    Workers are started once and run many pipelines, so interpreter startup and imports are paid once per worker, and
+    the schema and transformer modules each worker loads stay cached between pipelines. Pipelines that write to the
+    same output run in order in one worker and share its database connections. With one worker, the pipelines run in
+    the current process.
+
+    :param config_dir: Directory holding the TOML configuration files
+    :type config_dir: Path | str
+    :param workers: Number of worker processes
+    :type workers: int
+    :param mode: Write mode for the output of every pipeline
+    :type mode: str
+    :param dry_run: Run validation and transformation only, skip loading
+    :type dry_run: bool
+    :param save_method: Method to save the output of every pipeline
+    :type save_method: str
+    :param force: Run pipelines even if they are unchanged since their last write
+    :type force: bool
+    :return: The result of every pipeline, in the order of the configuration files
+    :rtype: list[PipelineRunResult]
+    """
+    configs = find_configs(config_dir)
+    groups = group_by_target(configs, save_method)
+    options = {"mode": mode, "dry_run": dry_run, "save_method": save_method, "force": force}
+
+    if workers <= 1 or len(groups) <= 1:
+        group_results = [run_group(group, **options) for group in groups]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(groups)), mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [executor.submit(run_group, group, **options) for group in groups]
+            group_results = [future.result() for future in futures]
+
+    results = {result.config: result for group in group_results for result in group}
+    return [results[str(config)] for config in configs]
+
+
+def format_summary(results: list[PipelineRunResult], seconds: float) -> str:
+    """Format the results of a batch as a table with one line per pipeline and a total line."""
+    width = max([len(Path(result.config).name) for result in results] + [len("Pipeline")])
+    lines = [f"{'Pipeline':<{width}}  {'Status':<7}  {'Rows':>10}  {'Seconds':>8}"]
+    for result in results:
+        line = f"{Path(result.config).name:<{width}}  {result.status:<7}  {result.rows:>10}  {result.seconds:>8.2f}"
+        if result.error:
+            line += f"  {result.error.splitlines()[0]}"
+        lines.append(line)
+
+    ok = sum(result.status == "ok" for result in results)
+    skipped = sum(result.status == "skipped" for result in results)
+    rows = sum(result.rows for result in results)
+    counts = f"{ok} ok, {len(results) - ok - skipped} failed" + (f", {skipped} skipped" if skipped else "")
+    lines.append(f"{len(results)} pipelines: {counts}, {rows} rows in {seconds:.2f} s")
+    return "\n".join(lines)
@@ -0,0 +1,419 @@
+import ast
+import copy
+import inspect
+import operator
+import re
+import warnings
+from dataclasses import dataclass
+from pandas import DataFrame, Series
+from pandas.api.types import infer_dtype
+from pandera.errors import SchemaError, SchemaErrorReason, SchemaErrors, SchemaWarning
+from pandera.engines import pandas_engine
+from pandera.pandas import Check, Column, DataFrameSchema
+from typing import Any, Callable
+
+
+Kernel = Callable[[Series], Series]
+
+COMPARISONS: dict[type, Callable] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+# Comparison to use when the constant is on the left, e.g. `5 < len(s)` is `len(s) > 5`
+FLIPPED_COMPARISONS: dict[type, type] = {
+    ast.Eq: ast.Eq,
+    ast.NotEq: ast.NotEq,
+    ast.Lt: ast.Gt,
+    ast.LtE: ast.GtE,
+    ast.Gt: ast.Lt,
+    ast.GtE: ast.LtE,
+}
+STRING_PREDICATES = {"isdigit", "isalpha", "isalnum", "isnumeric", "isdecimal", "isspace", "islower", "isupper", "istitle"}
+DUPLICATE_KEEP = {"all": False, "exclude_first": "first", "exclude_last": "last"}
+STRING_DTYPE = pandas_engine.Engine.dtype(str)
+
+
+@dataclass
+class CompiledCheck:
+    """A column check translated into a vectorised kernel that returns True for every passing value."""
+
+    column: Column
+    kernel: Kernel
+    reason_code: SchemaErrorReason
+    check: Check | str
+    check_index: int | None = None
+    ignore_na: bool = False
+    raise_warning: bool = False
+
+    def run(self, series: Series) -> SchemaError | None:
+        """Run the check on a column and return the error it raises, or None if every value passes."""
+        try:
+            passed = self.kernel(series)
+        except (TypeError, ValueError, AttributeError):
+            # The data is not of the type the kernel was written for: run the check the way pandera does
+            passed = self.check(series).check_output
+        if self.ignore_na:
+            passed = passed | series.isna()
+
+        failed = series[~passed.astype(bool)]
+        if failed.empty:
+            return None
+
+        failure_cases = DataFrame({"index": failed.index, "failure_case": failed.to_numpy()})
+        message = self._message(failed)
+        if self.raise_warning:
+            warnings.warn(message, SchemaWarning)
+            return None
+
+        return SchemaError(
+            schema=self.column,
+            data=None,
+            message=message,
+            failure_cases=failure_cases,
+            check=self.check,
+            check_index=self.check_index,
+            reason_code=self.reason_code,
+            column_name=self.column.name,
+        )
+
+    def _message(self, failed: Series) -> str:
+        if self.reason_code == SchemaErrorReason.WRONG_DATATYPE:
+            failure_cases = DataFrame({"index": failed.index, "failure_case": failed.to_numpy()})
+            return f"expected series '{self.column.name}' to have type {self.column.dtype}:\nfailure cases:\n{failure_cases}"
+        if self.reason_code == SchemaErrorReason.SERIES_CONTAINS_NULLS:
+            return f"non-nullable series '{self.column.name}' contains null values:\n{failed}"
+        if self.reason_code == SchemaErrorReason.SERIES_CONTAINS_DUPLICATES:
+            return f"series '{self.column.name}' contains duplicate values:\n{failed}"
+        check_name = self.check.error or self.check.name
+        failure_cases = ", ".join(str(value) for value in failed.to_numpy())
+        return f"Column '{self.column.name}' failed element-wise validator number {self.check_index}: {check_name} failure cases: {failure_cases}"
+
+
+@dataclass
+class CompiledSchema:
+    """A schema split into vectorised kernels and a residual pandera schema for everything that could not be compiled."""
+
+    schema: DataFrameSchema
+    residual_schema: DataFrameSchema
+    checks: list[CompiledCheck]
+    coerced_string_columns: list[str]
+
+    def validate(self, df: DataFrame) -> DataFrame:
+        """
+        Validate a dataframe with the residual schema, then run the compiled checks on the coerced columns
+
+        :param df: The dataframe to validate
+        :type df: DataFrame
+        :return: The validated, coerced dataframe
+        :rtype: DataFrame
+        :raises SchemaErrors: With the failures of the residual schema and of the compiled checks
+        """
+        errors = []
+        coerced = {name: STRING_DTYPE.coerce(df[name]) for name in self.coerced_string_columns if name in df.columns}
+        if coerced:
+            df = df.assign(**coerced)
+        try:
+            # A frame built by assign() is already a copy, so the residual schema can work on it in place
+            validated = self.residual_schema.validate(df, lazy=True, inplace=bool(coerced))
+        except SchemaErrors as residual_errors:
+            errors.extend(residual_errors.schema_errors)
+            validated = df
+
+        for compiled in self.checks:
+            if compiled.column.name not in validated.columns:
+                # Missing columns are reported by the residual schema
+                continue
+            try:
+                error = compiled.run(validated[compiled.column.name])
+            except Exception:
+                if errors:
+                    # The column could not be coerced, and that failure is already reported
+                    continue
+                raise
+            if error is not None:
+                errors.append(error)
+
+        if errors:
+            raise SchemaErrors(schema=self.schema, schema_errors=errors, data=df)
+        return validated
+
+
+def compile_schema(schema: DataFrameSchema) -> CompiledSchema:
+    """
+    Translate the common checks of a pandera schema into vectorised kernels
+
+    Built-in comparison, range, `isin`/`notin` and `str_length` checks, column nullability and uniqueness, the `str`
+    dtype check, and element-wise lambdas made of comparisons, `len(...)`, `in` and string predicates such as
+    `str.isdigit` are compiled. Every other check, the coercion of non-string columns and the schema-wide options
+    stay in the residual schema.
+
+    :param schema: The schema to compile
+    :type schema: DataFrameSchema
+    :return: The compiled checks and the residual schema
+    :rtype: CompiledSchema
+    """
+    residual_schema = copy.deepcopy(schema)
+    compiled_checks = []
+    coerced_string_columns = []
+    for name, column in schema.columns.items():
+        if column.regex:
+            continue
+        residual_column = residual_schema.columns[name]
+
+        if str(column.dtype) == "str" and schema.dtype is None:
+            # pandera checks the type of every value in Python; coerce the same way and check the whole column at once
+            if schema.coerce or column.coerce:
+                coerced_string_columns.append(name)
+            compiled_checks.append(
+                CompiledCheck(
+                    column=column,
+                    kernel=_is_string,
+                    reason_code=SchemaErrorReason.WRONG_DATATYPE,
+                    check=f"dtype('{column.dtype}')",
+                )
+            )
+            residual_column.dtype = None
+            residual_column.coerce = False
+
+        residual_checks = []
+        for check_index, check in enumerate(column.checks):
+            kernel = compile_check(check)
+            if kernel is None:
+                residual_checks.append(residual_column.checks[check_index])
+                continue
+            compiled_checks.append(
+                CompiledCheck(
+                    column=column,
+                    kernel=kernel,
+                    reason_code=SchemaErrorReason.DATAFRAME_CHECK,
+                    check=check,
+                    check_index=check_index,
+                    ignore_na=check.ignore_na,
+                    raise_warning=check.raise_warning,
+                )
+            )
+        residual_column.checks = residual_checks
+
+        if not column.nullable:
+            compiled_checks.append(
+                CompiledCheck(
+                    column=column,
+                    kernel=lambda series: series.notna(),
+                    reason_code=SchemaErrorReason.SERIES_CONTAINS_NULLS,
+                    check="not_nullable",
+                )
+            )
+            residual_column.nullable = True
+        if column.unique:
+            keep = DUPLICATE_KEEP.get(column.report_duplicates, False)
+            compiled_checks.append(
+                CompiledCheck(
+                    column=column,
+                    kernel=lambda series, keep=keep: ~series.duplicated(keep=keep),
+                    reason_code=SchemaErrorReason.SERIES_CONTAINS_DUPLICATES,
+                    check="field_uniqueness",
+                )
+            )
+            residual_column.unique = False
+
+    return CompiledSchema(
+        schema=schema, residual_schema=residual_schema, checks=compiled_checks, coerced_string_columns=coerced_string_columns
+    )
+
+
+def _is_string(series: Series) -> Series:
+    if infer_dtype(series, skipna=True) in ("string", "empty"):
+        return Series(True, index=series.index)
+    return series.map(lambda value: isinstance(value, str)).astype(bool) | series.isna()
+
+
+def compile_check(check: Check) -> Kernel | None:
+    """Return a vectorised kernel for a pandera check, or None if the check has to run through pandera."""
+    if check.element_wise:
+        return compile_lambda(check._check_fn)
+    if check.name == "<lambda>" or check.statistics is None:
+        return None
+    return _builtin_kernel(check.name, check.statistics)
+
+
+def _builtin_kernel(name: str, statistics: dict) -> Kernel | None:
+    if name == "isin":
+        allowed_values = list(statistics["allowed_values"])
+        return lambda series: series.isin(allowed_values)
+    if name == "notin":
+        forbidden_values = list(statistics["forbidden_values"])
+        return lambda series: ~series.isin(forbidden_values)
+    if name in ("equal_to", "not_equal_to"):
+        compare = operator.eq if name == "equal_to" else operator.ne
+        return lambda series: compare(series, statistics["value"])
+    if name in ("greater_than", "greater_than_or_equal_to"):
+        compare = operator.gt if name == "greater_than" else operator.ge
+        return lambda series: compare(series, statistics["min_value"])
+    if name in ("less_than", "less_than_or_equal_to"):
+        compare = operator.lt if name == "less_than" else operator.le
+        return lambda series: compare(series, statistics["max_value"])
+    if name == "in_range":
+        lower = operator.ge if statistics["include_min"] else operator.gt
+        upper = operator.le if statistics["include_max"] else operator.lt
+        return lambda series: lower(series, statistics["min_value"]) & upper(series, statistics["max_value"])
+    if name == "str_length":
+        min_value, max_value = statistics.get("min_value"), statistics.get("max_value")
+        return lambda series: _length_in_range(series.str.len(), min_value, max_value)
+    return None
+
+
+def _length_in_range(lengths: Series, min_value: int | None, max_value: int | None) -> Series:
+    passed = lengths.notna()
+    if min_value is not None:
+        passed &= lengths >= min_value
+    if max_value is not None:
+        passed &= lengths <= max_value
+    return passed
+
+
+def compile_lambda(fn: Callable) -> Kernel | None:
+    """
+    Translate a one-argument element-wise lambda, such as `lambda s: len(s) == 5`, into a vectorised kernel
+
+    :param fn: The function of an element-wise check
+    :type fn: Callable
+    :return: A kernel that applies the lambda to a whole series, or None if the lambda cannot be translated
+    :rtype: Kernel | None
+    """
+    node = lambda_node(fn)
+    if node is None or len(node.args.args) != 1 or node.args.vararg or node.args.kwarg or node.args.kwonlyargs:
+        return None
+
+    closure = inspect.getclosurevars(fn)
+    names = {**closure.builtins, **closure.globals, **closure.nonlocals}
+    return _compile_expression(node.body, node.args.args[0].arg, names)
+
+
+def lambda_node(fn: Callable) -> ast.Lambda | None:
+    """Find the AST of a lambda in its source file, or None if the function is not a lambda or has no source."""
+    if getattr(fn, "__name__", None) != "<lambda>":
+        return None
+    try:
+        source = inspect.getsource(fn)
+    except (OSError, TypeError):
+        return None
+
+    # The source holds the whole line, so try every expression that starts at `lambda` and ends at a delimiter,
+    # longest first, and keep the one that compiles to the same bytecode as the function
+    ends = [match.start() for match in re.finditer(r"[,)\]}\n]", source)] + [len(source)]
+    for start in (match.start() for match in re.finditer(r"\blambda\b", source)):
+        for end in sorted((end for end in ends if end > start), reverse=True):
+            try:
+                tree = ast.parse(source[start:end].strip(), mode="eval")
+            except SyntaxError:
+                continue
+            if isinstance(tree.body, ast.Lambda) and _same_code(tree, fn):
+                return tree.body
+    return None
+
+
+def _same_code(tree: ast.Expression, fn: Callable) -> bool:
+    module_code = compile(tree, "<lambda>", "eval")
+    lambda_code = next((const for const in module_code.co_consts if inspect.iscode(const)), None)
+    return (
+        lambda_code is not None
+        and lambda_code.co_code == fn.__code__.co_code
+        and lambda_code.co_names == fn.__code__.co_names
+        and lambda_code.co_consts == fn.__code__.co_consts
+    )
+
+
+def _compile_expression(node: ast.expr, arg: str, names: dict[str, Any]) -> Kernel | None:
+    """Compile a lambda body into a kernel. Returns None for any construct it does not know."""
+    if isinstance(node, ast.BoolOp):
+        kernels = [_compile_expression(value, arg, names) for value in node.values]
+        if any(kernel is None for kernel in kernels):
+            return None
+        combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+
+        def kernel(series: Series) -> Series:
+            passed = kernels[0](series)
+            for other in kernels[1:]:
+                passed = combine(passed, other(series))
+            return passed
+
+        return kernel
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        operand = _compile_expression(node.operand, arg, names)
+        return None if operand is None else lambda series: ~operand(series)
+
+    if isinstance(node, ast.Call) and not node.args and not node.keywords:
+        # s.isdigit() and the other argument-free string predicates
+        function = node.func
+        if isinstance(function, ast.Attribute) and function.attr in STRING_PREDICATES and is_arg(function.value, arg):
+            return lambda series: getattr(series.str, function.attr)().fillna(False).astype(bool)
+        return None
+
+    if isinstance(node, ast.Compare) and len(node.ops) == 1:
+        op, left, right = type(node.ops[0]), node.left, node.comparators[0]
+        if op in (ast.In, ast.NotIn):
+            value = _operand(left, arg, names)
+            values = constant_value(right, names)
+            if value is None or not isinstance(values, (list, tuple, set, frozenset)):
+                return None
+            values = list(values)
+            if op is ast.In:
+                return lambda series: value(series).isin(values)
+            return lambda series: ~value(series).isin(values)
+
+        if op not in COMPARISONS:
+            return None
+        value, constant = _operand(left, arg, names), constant_value(right, names)
+        if value is None:
+            op = FLIPPED_COMPARISONS[op]
+            value, constant = _operand(right, arg, names), constant_value(left, names)
+        if value is None or constant is None or isinstance(constant, (list, tuple, set, frozenset)):
+            return None
+        compare = COMPARISONS[op]
+        return lambda series: compare(value(series), constant).fillna(False).astype(bool)
+
+    return None
+
+
+def is_arg(node: ast.expr, arg: str) -> bool:
+    """Whether a node is the argument of the lambda."""
+    return isinstance(node, ast.Name) and node.id == arg
+
+
+def _operand(node: ast.expr, arg: str, names: dict[str, Any]) -> Kernel | None:
+    """Kernel for the value side of a comparison: the argument itself or `len(argument)`."""
+    if is_arg(node, arg):
+        return lambda series: series
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and names.get(node.func.id) is len
+        and len(node.args) == 1
+        and is_arg(node.args[0], arg)
+    ):
+        return lambda series: series.str.len()
+    return None
+
+
+def constant_value(node: ast.expr, names: dict[str, Any]) -> Any:
+    """Value of a literal or of a module-level constant, or None if the node is not a constant."""
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        value = constant_value(node.operand, names)
+        return -value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        values = [constant_value(element, names) for element in node.elts]
+        return None if any(value is None for value in values) else values
+    if isinstance(node, ast.Name) and node.id in names:
+        value = names[node.id]
+        if isinstance(value, (int, float, str, bool)):
+            return value
+        if isinstance(value, (list, tuple, set, frozenset)) and all(isinstance(element, (int, float, str, bool)) for element in value):
+            return list(value)
+    return None
@@ -0,0 +1,143 @@
+from data_loader.arrow_io import read_arrow_ipc, write_arrow_ipc
+from data_loader.extract_cache import hash_file
+from data_loader.logging_utilties import get_timestamp
+
+import json
+import pyarrow as pa
+import secrets
+import shutil
+import time
+from pandas import DataFrame
+from pathlib import Path
+
+
+class RunCheckpoints:
+    """
+    Outputs of the completed stages of one pipeline run, stored as memory-mappable Arrow IPC files.
+
+    The run folder holds a `state.json` that identifies the config of the run and hashes the files it reads, and one
+    file per completed stage: `extract_<n>.arrow` for each validated extract file, `transform.arrow` for the
+    transformed frame and `output.arrow` for the validated output. Files are moved into place once written, so a
+    stage with a file is complete. A failed run can be resumed from the stages it completed, as long as its config is
+    unchanged. Stages made from files that changed since, and the stages after them, are discarded and run again.
+    """
+
+    def __init__(self, run_dir: Path | str):
+        self.run_dir: Path = Path(run_dir)
+        # Stages discarded on resume because the files they were made from changed
+        self.discarded: list[str] = []
+
+    @property
+    def run_id(self) -> str:
+        return self.run_dir.name
+
+    @classmethod
+    def create(cls, runs_dir: Path | str, config_file: Path | str, inputs: dict | None = None) -> "RunCheckpoints":
+        """
+        Start the checkpoints of a new run in a folder of its own under `runs_dir`.
+
+        :param runs_dir: Folder holding the checkpoints of every run
+        :type runs_dir: Path | str
+        :param config_file: Path to the TOML config of the run
+        :type config_file: Path | str
+        :param inputs: Hashes of the files the run reads, from `RunManifest.inputs`
+        :type inputs: dict | None
+        :return: The checkpoints of the new run
+        :rtype: RunCheckpoints
+        """
+        run_dir = Path(runs_dir) / f"{get_timestamp()}__{secrets.token_hex(3)}"
+        run_dir.mkdir(parents=True)
+        state = {
+            "config": str(Path(config_file).resolve()),
+            "config_hash": hash_file(config_file),
+            "inputs": inputs,
+            "created_at": time.time(),
+        }
+        (run_dir / "state.json").write_text(json.dumps(state))
+        return cls(run_dir)
+
+    @classmethod
+    def resume(cls, runs_dir: Path | str, run_id: str, config_file: Path | str, inputs: dict | None = None) -> "RunCheckpoints":
+        """
+        Open the checkpoints of an earlier run to resume it. Stages whose files changed since the run started are
+        discarded and listed in `discarded`, and the state of the run is updated to the current files.
+
+        :param runs_dir: Folder holding the checkpoints of every run
+        :type runs_dir: Path | str
+        :param run_id: Identifier of the run, as logged when it started
+        :type run_id: str
+        :param config_file: Path to the TOML config of the resumed run
+        :type config_file: Path | str
+        :param inputs: Hashes of the files the resumed run reads, from `RunManifest.inputs`
+        :type inputs: dict | None
+        :return: The checkpoints of the run
+        :rtype: RunCheckpoints
+        :raises FileNotFoundError: If there are no checkpoints for the run
+        :raises ValueError: If the config has changed since the run started
+        """
+        run_dir = Path(runs_dir) / run_id
+        try:
+            state = json.loads((run_dir / "state.json").read_text())
+        except (OSError, ValueError):
+            raise FileNotFoundError(f"No checkpoints found for run '{run_id}' in {runs_dir}")
+
+        if state["config_hash"] != hash_file(config_file):
+            raise ValueError(f"Run '{run_id}' was started with a different version of {state['config']}. It cannot be resumed.")
+
+        checkpoints = cls(run_dir)
+        if inputs is not None:
+            checkpoints.discarded = checkpoints._stale_stages(state.get("inputs"), inputs)
+            for stage in checkpoints.discarded:
+                checkpoints._stage_path(stage).unlink(missing_ok=True)
+            state["inputs"] = inputs
+            (run_dir / "state.json").write_text(json.dumps(state))
+        return checkpoints
+
+    def _stale_stages(self, started: dict | None, current: dict) -> list[str]:
+        """Return the saved stages made from files whose hashes changed from `started` to `current`."""
+        stems = {path.stem for path in self.run_dir.glob("*.arrow")}
+        extracts = sorted((stem for stem in stems if stem.startswith("extract_")), key=lambda stem: int(stem.removeprefix("extract_")))
+        # In the order the stages run
+        saved = extracts + [stage for stage in ("transform", "output") if stage in stems]
+        if started is None:
+            # The run did not record the files it read
+            return saved
+
+        stale = set()
+        started_files = list(zip(started["data_files"], started["schema_files"]))
+        for number, files in enumerate(zip(current["data_files"], current["schema_files"])):
+            if number >= len(started_files) or started_files[number] != files:
+                stale.add(f"extract_{number}")
+        if stale or started["transformer"] != current["transformer"]:
+            stale.add("transform")
+        if "transform" in stale or started["output_schema"] != current["output_schema"]:
+            stale.add("output")
+        return [stage for stage in saved if stage in stale]
+
+    def _stage_path(self, stage: str) -> Path:
+        return self.run_dir / f"{stage}.arrow"
+
+    def has(self, stage: str) -> bool:
+        """Return True if the stage completed and its output was saved."""
+        return self._stage_path(stage).exists()
+
+    def load(self, stage: str) -> DataFrame:
+        """Return the saved output of a completed stage."""
+        return read_arrow_ipc(self._stage_path(stage))
+
+    def save(self, stage: str, df: DataFrame) -> bool:
+        """
+        Save the output of a completed stage.
+
+        :return: False if the dataframe holds values that cannot be stored as Arrow, True otherwise
+        :rtype: bool
+        """
+        try:
+            write_arrow_ipc(df, self._stage_path(stage))
+        except (pa.ArrowException, TypeError, ValueError):
+            return False
+        return True
+
+    def delete(self) -> None:
+        """Remove the checkpoints of the run."""
+        shutil.rmtree(self.run_dir, ignore_errors=True)
@@ -0,0 +1,437 @@
+from data_loader.check_compiler import COMPARISONS, FLIPPED_COMPARISONS, Kernel, compile_check, constant_value, is_arg, lambda_node
+
+import ast
+import csv
+import datetime
+import inspect
+import operator
+import string
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from pandera.pandas import Check, Column, DataFrameSchema
+from typing import Any
+
+
+GENERATED_FILE_FORMATS = {"csv": ".csv", "tsv": ".tsv", "parquet": ".parquet", "feather": ".feather", "excel": ".xlsx"}
+# An Excel worksheet holds at most 1,048,576 rows, including the header
+EXCEL_MAX_ROWS = 1_048_575
+# Number of times the values of a column that fail its checks are drawn again before giving up
+MAX_ATTEMPTS = 100
+
+ALPHABETS = {
+    "isdigit": string.digits,
+    "isnumeric": string.digits,
+    "isdecimal": string.digits,
+    "isalpha": string.ascii_letters,
+    "isalnum": string.ascii_letters + string.digits,
+    "isupper": string.ascii_uppercase,
+    "islower": string.ascii_lowercase,
+}
+DEFAULT_STRING_LENGTH = (5, 12)
+DEFAULT_DATE_RANGE = (pd.Timestamp("2000-01-01"), pd.Timestamp(datetime.date.today()))
+
+
+@dataclass
+class ColumnSpec:
+    """What the checks of a column say about the values it may hold, used to draw values that are likely to pass."""
+
+    choices: list | None = None
+    excluded: list = field(default_factory=list)
+    min_value: Any = None
+    max_value: Any = None
+    min_length: int | None = None
+    max_length: int | None = None
+    alphabet: str = string.ascii_letters + string.digits
+
+    def bound(self, op: type, value: Any) -> None:
+        """Narrow the range of values with a comparison such as `ast.GtE` and a constant."""
+        if op in (ast.Gt, ast.GtE):
+            self.min_value = value if self.min_value is None else max(self.min_value, value)
+        elif op in (ast.Lt, ast.LtE):
+            self.max_value = value if self.max_value is None else min(self.max_value, value)
+        elif op is ast.Eq:
+            self.choices = [value]
+        elif op is ast.NotEq:
+            self.excluded.append(value)
+
+    def bound_length(self, op: type, value: int) -> None:
+        """Narrow the range of string lengths with a comparison such as `ast.Eq` and a constant."""
+        if op in (ast.Gt, ast.GtE, ast.Eq):
+            self.min_length = max(self.min_length or 0, value + (op is ast.Gt))
+        if op in (ast.Lt, ast.LtE, ast.Eq):
+            self.max_length = min(self.max_length if self.max_length is not None else value, value - (op is ast.Lt))
+
+
+def column_spec(column: Column) -> ColumnSpec:
+    """
+    Read what the built-in checks and the element-wise lambdas of a column allow
+
+    `isin`, `notin`, `equal_to`, `not_equal_to`, the comparison and range checks and `str_length` are read from the
+    statistics of the check. Lambdas are parsed the way `check_compiler` compiles them, so `lambda s: len(s) == 5`,
+    `lambda s: s.isdigit()`, `lambda s: s in [...]` and comparisons joined by `and` are understood. Checks that are
+    not understood do not narrow the spec; generated values are still checked against them.
+
+    :param column: The column to read
+    :type column: Column
+    :return: The values the column may hold
+    :rtype: ColumnSpec
+    """
+    spec = ColumnSpec()
+    for check in column.checks:
+        if check.element_wise:
+            node = lambda_node(check._check_fn)
+            if node is not None and len(node.args.args) == 1:
+                closure = inspect.getclosurevars(check._check_fn)
+                names = {**closure.builtins, **closure.globals, **closure.nonlocals}
+                _read_lambda(node.body, node.args.args[0].arg, names, spec)
+        elif check.statistics is not None:
+            _read_statistics(check.name, check.statistics, spec)
+    return spec
+
+
+def _read_statistics(name: str, statistics: dict, spec: ColumnSpec) -> None:
+    if name == "isin":
+        spec.choices = list(statistics["allowed_values"])
+    elif name == "notin":
+        spec.excluded.extend(statistics["forbidden_values"])
+    elif name == "equal_to":
+        spec.choices = [statistics["value"]]
+    elif name == "not_equal_to":
+        spec.excluded.append(statistics["value"])
+    elif name in ("greater_than", "greater_than_or_equal_to"):
+        spec.bound(ast.Gt if name == "greater_than" else ast.GtE, statistics["min_value"])
+    elif name in ("less_than", "less_than_or_equal_to"):
+        spec.bound(ast.Lt if name == "less_than" else ast.LtE, statistics["max_value"])
+    elif name == "in_range":
+        spec.bound(ast.GtE if statistics["include_min"] else ast.Gt, statistics["min_value"])
+        spec.bound(ast.LtE if statistics["include_max"] else ast.Lt, statistics["max_value"])
+    elif name == "str_length":
+        if statistics.get("min_value") is not None:
+            spec.bound_length(ast.GtE, statistics["min_value"])
+        if statistics.get("max_value") is not None:
+            spec.bound_length(ast.LtE, statistics["max_value"])
+
+
+def _read_lambda(node: ast.expr, arg: str, names: dict[str, Any], spec: ColumnSpec) -> None:
+    """Narrow the spec with the parts of a lambda body it understands."""
+    if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And):
+        for value in node.values:
+            _read_lambda(value, arg, names, spec)
+
+    elif isinstance(node, ast.Call) and not node.args and isinstance(node.func, ast.Attribute) and is_arg(node.func.value, arg):
+        if node.func.attr in ALPHABETS:
+            spec.alphabet = ALPHABETS[node.func.attr]
+
+    elif isinstance(node, ast.Compare) and len(node.ops) == 1:
+        op, left, right = type(node.ops[0]), node.left, node.comparators[0]
+        if op in (ast.In, ast.NotIn) and is_arg(left, arg):
+            values = constant_value(right, names)
+            if isinstance(values, list):
+                if op is ast.In:
+                    spec.choices = values
+                else:
+                    spec.excluded.extend(values)
+            return
+        if op not in COMPARISONS:
+            return
+        if constant_value(left, names) is not None:
+            op, left, right = FLIPPED_COMPARISONS[op], right, left
+        constant = constant_value(right, names)
+        if constant is None or isinstance(constant, list):
+            return
+        if is_arg(left, arg):
+            spec.bound(op, constant)
+        elif _is_len(left, arg, names) and isinstance(constant, int):
+            spec.bound_length(op, constant)
+
+
+def _is_len(node: ast.expr, arg: str, names: dict[str, Any]) -> bool:
+    return (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and names.get(node.func.id) is len
+        and len(node.args) == 1
+        and is_arg(node.args[0], arg)
+    )
+
+
+def _check_kernel(check: Check) -> Kernel:
+    """Return a function that tells which values of a series pass a check: its compiled kernel, or pandera itself."""
+    kernel = compile_check(check)
+    if kernel is not None:
+        return kernel
+    return lambda series: check(series).check_output
+
+
+class ColumnGenerator:
+    """
+    Draw batches of values for one column of a schema
+
+    Values are drawn with NumPy from the type of the column and its `ColumnSpec`, then run through every check of the
+    column. Values that fail a check, and values of a unique column that were drawn before, are drawn again. A unique
+    column whose checks allow barely more values than there are rows takes its values from a shuffled pool of every
+    allowed value instead, since random draws from it would repeat values too often to finish.
+    """
+
+    def __init__(self, name: str, column: Column, rows: int, rng: np.random.Generator, null_fraction: float = 0.0):
+        self.name = name
+        self.column = column
+        self.rows = rows
+        self.rng = rng
+        self.spec = column_spec(column)
+        self.kind = _kind(column)
+        self.checks = [_check_kernel(check) for check in column.checks]
+        self.seen: set | None = set() if column.unique else None
+        # Nulls are only drawn for types that can hold them without changing dtype
+        self.null_fraction = null_fraction if column.nullable and not column.unique and self.kind in ("str", "float", "datetime") else 0.0
+
+        if self.spec.choices is not None:
+            self.choices = [value for value in self.spec.choices if value not in self.spec.excluded]
+            if not self.choices:
+                raise ValueError(f"The checks of column '{self.name}' exclude every allowed value")
+        self._pool: np.ndarray | None = None
+        self._pool_position = 0
+        if column.unique:
+            capacity = self._capacity()
+            if capacity is not None and capacity < rows:
+                raise ValueError(f"Column '{self.name}' is unique but its checks allow only {capacity} values, fewer than {rows} rows")
+            if capacity is not None and capacity <= 4 * rows:
+                self._pool = self._shuffled_values(capacity)
+
+    def _capacity(self) -> int | None:
+        """Return how many distinct values the spec allows, or None if it cannot tell."""
+        if self.spec.choices is not None:
+            return len(self.choices)
+        if self.kind == "bool":
+            return 2
+        if self.kind == "int":
+            low, high = self._int_range()
+            return high - low + 1
+        if self.kind == "str":
+            min_length, max_length = self._lengths()
+            return sum(len(self.spec.alphabet) ** length for length in range(min_length, max_length + 1))
+        return None
+
+    def _shuffled_values(self, capacity: int) -> np.ndarray | None:
+        """Return every value the spec allows in a random order, or None for strings of several lengths."""
+        if self.spec.choices is not None:
+            return self.rng.permutation(np.array(self.choices, dtype=object if self.kind == "str" else None))
+        if self.kind == "bool":
+            return self.rng.permutation(np.array([False, True]))
+        if self.kind == "int":
+            return (self._int_range()[0] + self.rng.permutation(capacity)).astype(self.column.dtype.type)
+        min_length, max_length = self._lengths()
+        if min_length != max_length:
+            return None
+        return _strings_at(self.rng.permutation(capacity), alphabet=self.spec.alphabet, length=max_length)
+
+    def _lengths(self) -> tuple[int, int]:
+        min_length = self.spec.min_length if self.spec.min_length is not None else DEFAULT_STRING_LENGTH[0]
+        max_length = self.spec.max_length if self.spec.max_length is not None else max(DEFAULT_STRING_LENGTH[1], min_length)
+        return min_length, max(min_length, max_length)
+
+    def _int_range(self) -> tuple[int, int]:
+        # Unbounded unique columns get a range wide enough that repeated values are rare
+        width = max(1_000_000, 10 * self.rows) if self.column.unique else 1_000_000
+        low, high = self.spec.min_value, self.spec.max_value
+        low = int(np.ceil(low)) if low is not None else (int(high) - width if high is not None else 0)
+        high = int(np.floor(high)) if high is not None else low + width
+        return low, high
+
+    def _draw(self, n: int) -> np.ndarray:
+        """Draw `n` values that are likely, but not certain, to pass the checks of the column."""
+        if self._pool is not None:
+            values = self._pool[self._pool_position : self._pool_position + n]
+            if len(values) < n:
+                raise ValueError(f"Column '{self.name}' ran out of unique values that pass its checks")
+            self._pool_position += n
+            return values.copy()
+        if self.spec.choices is not None:
+            return self.rng.choice(np.array(self.choices, dtype=object if self.kind == "str" else None), size=n)
+
+        if self.kind == "str":
+            min_length, max_length = self._lengths()
+            return _random_strings(self.rng, n, alphabet=self.spec.alphabet, min_length=min_length, max_length=max_length)
+        if self.kind == "int":
+            low, high = self._int_range()
+            return self.rng.integers(low, high, size=n, endpoint=True).astype(self.column.dtype.type)
+        if self.kind == "float":
+            low = float(self.spec.min_value) if self.spec.min_value is not None else 0.0
+            high = float(self.spec.max_value) if self.spec.max_value is not None else low + 1_000.0
+            return np.round(self.rng.uniform(low, high, size=n), 2).astype(self.column.dtype.type)
+        if self.kind == "bool":
+            return self.rng.integers(0, 2, size=n).astype(bool)
+        if self.kind == "datetime":
+            low = pd.Timestamp(self.spec.min_value if self.spec.min_value is not None else DEFAULT_DATE_RANGE[0])
+            high = pd.Timestamp(self.spec.max_value if self.spec.max_value is not None else DEFAULT_DATE_RANGE[1])
+            seconds = self.rng.integers(low.value // 10**9, high.value // 10**9, size=n, endpoint=True)
+            return (seconds * 10**9).astype("datetime64[ns]")
+        raise ValueError(f"Cannot generate values of type {self.column.dtype} for column '{self.name}'")
+
+    def _failed(self, values: np.ndarray) -> np.ndarray:
+        """Return a mask of the values that fail a check of the column, or repeat a value of a unique column."""
+        series = pd.Series(values)
+        failed = np.zeros(len(values), dtype=bool)
+        for kernel in self.checks:
+            failed |= ~np.asarray(kernel(series), dtype=bool)
+        if self.seen is not None:
+            failed |= series.duplicated().to_numpy()
+            failed |= np.fromiter((value in self.seen for value in values), dtype=bool, count=len(values))
+        return failed
+
+    def batch(self, n: int) -> np.ndarray:
+        """
+        Draw the values of the next `n` rows
+
+        :param n: Number of values to draw
+        :type n: int
+        :return: Values that pass every check of the column, with nulls at random positions if it is nullable
+        :rtype: np.ndarray
+        :raises ValueError: If no passing values are found after `MAX_ATTEMPTS` draws
+        """
+        values = self._draw(n)
+        for _ in range(MAX_ATTEMPTS):
+            failed = self._failed(values)
+            if not failed.any():
+                break
+            values[failed] = self._draw(int(failed.sum()))
+        else:
+            raise ValueError(f"Could not generate values for column '{self.name}' that pass its checks")
+
+        if self.seen is not None:
+            self.seen.update(values.tolist())
+        if self.null_fraction:
+            values = values.astype(object) if self.kind == "str" else values
+            values[self.rng.random(n) < self.null_fraction] = None
+        return values
+
+
+def _kind(column: Column) -> str:
+    dtype = str(column.dtype) if column.dtype is not None else "str"
+    if dtype in ("str", "string", "object"):
+        return "str"
+    if dtype.startswith(("int", "uint")):
+        return "int"
+    if dtype.startswith("float"):
+        return "float"
+    if dtype == "bool":
+        return "bool"
+    if dtype.startswith("datetime64"):
+        return "datetime"
+    return dtype
+
+
+def _random_strings(rng: np.random.Generator, n: int, alphabet: str, min_length: int, max_length: int) -> np.ndarray:
+    """Draw `n` strings of characters from `alphabet` with lengths between `min_length` and `max_length`."""
+    if max_length == 0:
+        return np.full(n, "", dtype=object)
+    codes = np.frombuffer(alphabet.encode("utf-32-le"), dtype=np.uint32)
+    chars = codes[rng.integers(0, len(codes), size=(n, max_length), dtype=np.uint8)]
+    if min_length < max_length:
+        # Trailing NUL characters end a NumPy string early
+        lengths = rng.integers(min_length, max_length, size=n, endpoint=True)
+        chars[np.arange(max_length) >= lengths[:, None]] = 0
+    return chars.view(f"<U{max_length}").ravel().astype(object)
+
+
+def generate_batches(
+    schema: DataFrameSchema, rows: int, chunksize: int = 1_000_000, seed: int | None = None, null_fraction: float = 0.0
+) -> Iterator[pd.DataFrame]:
+    """
+    Generate rows that pass a pandera schema, in batches of `chunksize` rows
+
+    Values are drawn with vectorised NumPy generators from the dtype and checks of each column, so that millions of
+    rows take seconds rather than the minutes of row-by-row strategies. Nullable columns hold nulls in about
+    `null_fraction` of their rows, and unique columns hold distinct values across every batch. The values of each
+    column are already run through its checks; if the schema also has checks of the whole DataFrame, every batch is
+    validated against it before it is returned.
+
+    :param schema: The schema the rows must pass
+    :type schema: DataFrameSchema
+    :param rows: Total number of rows
+    :type rows: int
+    :param chunksize: Maximum number of rows in each batch
+    :type chunksize: int
+    :param seed: Seed of the random generator, for repeatable data
+    :type seed: int | None
+    :param null_fraction: Fraction of nulls in nullable string, float and datetime columns
+    :type null_fraction: float
+    :return: The generated batches
+    :rtype: Iterator[pd.DataFrame]
+    :raises ValueError: If a column has a type that cannot be generated, or checks that no drawn value passes
+    """
+    rng = np.random.default_rng(seed)
+    columns = [name for name, column in schema.columns.items() if not column.regex]
+    generators = [ColumnGenerator(name, schema.columns[name], rows=rows, rng=rng, null_fraction=null_fraction) for name in columns]
+    for start in range(0, rows, chunksize):
+        n = min(chunksize, rows - start)
+        batch = pd.DataFrame({generator.name: generator.batch(n) for generator in generators})
+        yield schema.validate(batch) if schema.checks else batch
+
+
+def write_batches(batches: Iterable[pd.DataFrame], path: Path | str, file_format: str) -> int:
+    """
+    Write batches of rows to one file, holding one batch in memory at a time except for Excel
+
+    :param batches: Batches with the same columns and types
+    :type batches: Iterable[pd.DataFrame]
+    :param path: Path of the file to write
+    :type path: Path | str
+    :param file_format: One of the keys of GENERATED_FILE_FORMATS
+    :type file_format: str
+    :return: Number of rows written
+    :rtype: int
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rows = 0
+
+    if file_format in ("csv", "tsv"):
+        separator = "\t" if file_format == "tsv" else ","
+        with open(path, "w", newline="") as f:
+            for batch_number, batch in enumerate(batches):
+                batch.to_csv(f, sep=separator, index=False, header=batch_number == 0, quoting=csv.QUOTE_MINIMAL)
+                rows += len(batch)
+
+    elif file_format in ("parquet", "feather"):
+        writer, arrow_schema = None, None
+        try:
+            for batch in batches:
+                # Later batches take the types of the first, even where a column of theirs holds only nulls
+                table = pa.Table.from_pandas(batch, preserve_index=False, schema=arrow_schema)
+                if writer is None:
+                    arrow_schema = table.schema
+                    # Feather files are Arrow IPC files
+                    writer = pq.ParquetWriter(path, table.schema) if file_format == "parquet" else pa.ipc.new_file(path, table.schema)
+                writer.write_table(table)
+                rows += len(batch)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    elif file_format == "excel":
+        df = pd.concat(batches, ignore_index=True)
+        if len(df) > EXCEL_MAX_ROWS:
+            raise ValueError(f"An Excel worksheet holds at most {EXCEL_MAX_ROWS} rows")
+        df.to_excel(path, index=False)
+        rows = len(df)
+
+    else:
+        raise ValueError(f"Unknown file format '{file_format}'. Expected one of: {', '.join(GENERATED_FILE_FORMATS)}")
+
+    return rows
+
+
+def _strings_at(indices: np.ndarray, alphabet: str, length: int) -> np.ndarray:
+    """Return the strings of `length` characters from `alphabet` at the given positions in their sorted order."""
+    if length == 0:
+        return np.full(len(indices), "", dtype=object)
+    codes = np.frombuffer(alphabet.encode("utf-32-le"), dtype=np.uint32)
+    places = len(codes) ** np.arange(length - 1, -1, -1, dtype=np.int64)
+    chars = codes[(indices[:, None] // places) % len(codes)]
+    return chars.view(f"<U{length}").ravel().astype(object)
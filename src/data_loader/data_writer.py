@@ -2,7 +2,50 @@ import duckdb
 import sqlite3
 from pandas import DataFrame
 from pathlib import Path
-from typing import Optional, Union, Literal, Callable, Dict
+from typing import Any, Optional, Union, Literal, Callable, Dict
+from urllib.parse import quote
+
+# Rows written to a delimited text file at a time when constant partition columns are added to each chunk
+TEXT_CHUNK_ROWS = 100_000
+
+
+class ConnectionPool:
+    """
+    Open DuckDB and SQLite connections, kept by database file so that repeated writes to a database reuse one
+    connection. A DuckDB file stays locked against other processes while its connection is open, so a pool should
+    only be shared by writes that go to databases no other process writes to at the same time.
+    """
+
+    def __init__(self):
+        self._connections: Dict[Path, Any] = {}
+
+    def connect(self, path: Union[str, Path], connect: Callable[[Any], Any]) -> Any:
+        """
+        Return the open connection to a database file, opening it with `connect` on first use
+
+        :param path: Path to the database file
+        :type path: Union[str, Path]
+        :param connect: Function that opens a connection from the path, such as `duckdb.connect`
+        :type connect: Callable[[Any], Any]
+        :return: The connection to the database
+        :rtype: Any
+        """
+        key = Path(path).resolve()
+        if key not in self._connections:
+            self._connections[key] = connect(path)
+        return self._connections[key]
+
+    def close(self) -> None:
+        """Close every connection in the pool."""
+        for conn in self._connections.values():
+            conn.close()
+        self._connections.clear()
+
+    def __enter__(self) -> "ConnectionPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 
 class DataFrameWriterRegistry:
@@ -50,6 +93,11 @@ class DataFrameWriter:
       - SQLite databases
       - Tab-delimited text files
     and allows dynamic registration of new backends.
+
+    Columns with the same value in every row, such as the data label of a pipeline, can be given as
+    `static_partitions` instead of being added to the DataFrame. Parquet files are written straight into the folder
+    of those values, databases add them as literals in the insert, and text files add them chunk by chunk as the
+    rows are written. They come after the columns of the DataFrame, as if they had been assigned to it.
     """
 
     def __init__(
@@ -61,6 +109,8 @@ class DataFrameWriter:
         table_name: str,
         partition_cols: Optional[list[str]] = None,
         mode: Literal["overwrite", "append"] = "overwrite",
+        connections: Optional[ConnectionPool] = None,
+        static_partitions: Optional[Dict[str, Any]] = None,
     ):
         self.df: DataFrame = df
         self.output_path: Path = Path(output_path)
@@ -69,6 +119,8 @@ class DataFrameWriter:
         self.db: str = db
         self.partition_cols: list[str] = partition_cols or []
         self.mode: str = mode
+        self.connections: Optional[ConnectionPool] = connections
+        self.static_partitions: Dict[str, Any] = static_partitions or {}
 
         # Create output directories if needed
         if self.write_method == "parquet" and not self.output_path.exists():
@@ -82,6 +134,58 @@ class DataFrameWriter:
         writer_func(self)  # Pass the instance to the writer function
 
 
+def _connect(writer: DataFrameWriter, path: Union[str, Path], connect: Callable[[Any], Any]) -> Any:
+    """Open a database connection, or reuse the one in the connection pool of the writer."""
+    connections: Optional[ConnectionPool] = getattr(writer, "connections", None)
+    if connections is None:
+        return connect(path)
+    return connections.connect(path, connect)
+
+
+def _release(writer: DataFrameWriter, conn: Any) -> None:
+    """Close a connection opened by `_connect`, unless it belongs to the connection pool of the writer."""
+    if getattr(writer, "connections", None) is None:
+        conn.close()
+
+
+def _static_partitions(writer: DataFrameWriter) -> Dict[str, Any]:
+    """Return the constant partition columns of a writer and their values."""
+    return getattr(writer, "static_partitions", None) or {}
+
+
+def static_partition_path(path: Union[str, Path], static_partitions: Dict[str, Any]) -> Path:
+    """Return the folder of a Parquet dataset that holds constant partition values, named as pyarrow names its folders."""
+    path = Path(path)
+    for column, value in static_partitions.items():
+        path = path / f"{column}={quote(str(value), safe='')}"
+    return path
+
+
+def _sql_literal(value: Any) -> str:
+    """Return a value as a SQL literal, quoting anything other than a number."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _static_select(static_partitions: Dict[str, Any]) -> str:
+    """Return the constant partition columns as literals to add to a SELECT list."""
+    return "".join(f', {_sql_literal(value)} AS "{column}"' for column, value in static_partitions.items())
+
+
+def _to_csv(df: DataFrame, file_path: Path, sep: str, mode: str, header: bool, static_partitions: Dict[str, Any]) -> None:
+    """Write a DataFrame to a delimited text file, adding the constant partition columns to one chunk of rows at a time."""
+    if not static_partitions:
+        df.to_csv(file_path, sep=sep, mode=mode, index=False, header=header)
+        return
+    with open(file_path, mode, newline="") as f:
+        for start in range(0, max(len(df), 1), TEXT_CHUNK_ROWS):
+            chunk = df.iloc[start : start + TEXT_CHUNK_ROWS].assign(**static_partitions)
+            chunk.to_csv(f, sep=sep, index=False, header=header and start == 0)
+
+
 # Writers
 
 
@@ -89,11 +193,13 @@ class DataFrameWriter:
 def write_parquet(writer: DataFrameWriter):
     """Write to partitioned or flat Parquet files"""
     df: DataFrame = writer.df
-    partition_cols: list[str] = writer.partition_cols
+    static_partitions: Dict[str, Any] = _static_partitions(writer)
+    partition_cols: list[str] = [col for col in writer.partition_cols if col not in static_partitions]
     db: str = writer.db
-    table_name: str = writer.table_name if partition_cols else writer.table_name + ".parquet"
+    table_name: str = writer.table_name if partition_cols or static_partitions else writer.table_name + ".parquet"
 
-    output_path: Path = writer.output_path / db / table_name
+    # Constant partitions are written straight into their folder
+    output_path: Path = static_partition_path(writer.output_path / db / table_name, static_partitions)
     df.to_parquet(output_path, partition_cols=partition_cols, index=False)
 
     print(f"Wrote Parquet data to: {output_path}")
@@ -114,16 +220,18 @@ def write_duckdb(writer: DataFrameWriter):
 
     output_path = Path(output_path) / (db + ".duckdb")
 
-    conn = duckdb.connect(str(output_path))
+    conn = _connect(writer, str(output_path), duckdb.connect)
     if mode == "overwrite":
         conn.execute(f"DROP TABLE IF EXISTS {table_name}")
 
+    select: str = f"SELECT *{_static_select(_static_partitions(writer))} FROM tmp_df"
     conn.register("tmp_df", df)
-    conn.execute(f"CREATE TABLE IF NOT EXISTS {table_name} AS SELECT * FROM tmp_df")
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {table_name} AS {select}")
     if mode == "append":
-        conn.execute(f"INSERT INTO {table_name} SELECT * FROM tmp_df")
+        conn.execute(f"INSERT INTO {table_name} {select}")
+    conn.unregister("tmp_df")
 
-    conn.close()
+    _release(writer, conn)
     print(f"Wrote DuckDB table: {table_name} in {output_path}")
 
 
@@ -141,17 +249,46 @@ def write_sqlite(writer: DataFrameWriter):
 
     output_path: Path = Path(output_path) / (db + ".sqlite")
 
-    conn: sqlite3.Connection = sqlite3.connect(output_path)
+    conn: sqlite3.Connection = _connect(writer, output_path, sqlite3.connect)
+    static_partitions: Dict[str, Any] = _static_partitions(writer)
+    if_exists: str = "replace" if mode == "overwrite" else "append"
+    options: Dict[str, Any] = {}
+    if static_partitions:
+        # Create the table with the partition columns before inserting, so an empty DataFrame gets them too
+        df.head(0).to_sql(name=table_name, con=conn, if_exists=if_exists, index=False)
+        _add_sqlite_columns(conn, table_name, static_partitions)
+        if_exists, options = "append", {"method": _sqlite_insert(static_partitions)}
     df.to_sql(
         name=table_name,
         con=conn,
-        if_exists="replace" if mode == "overwrite" else "append",
+        if_exists=if_exists,
         index=False,
+        **options,
     )
-    conn.close()
+    _release(writer, conn)
     print(f"Wrote SQLite table: {table_name} in {output_path}")
 
 
+def _add_sqlite_columns(conn: sqlite3.Connection, table_name: str, static_partitions: Dict[str, Any]) -> None:
+    """Add the constant partition columns a SQLite table is missing, after its other columns."""
+    existing = {row[1] for row in conn.execute(f'PRAGMA table_info("{table_name}")')}
+    for column, value in static_partitions.items():
+        if column not in existing:
+            column_type = "INTEGER" if isinstance(value, int) else "REAL" if isinstance(value, float) else "TEXT"
+            conn.execute(f'ALTER TABLE "{table_name}" ADD COLUMN "{column}" {column_type}')
+
+
+def _sqlite_insert(static_partitions: Dict[str, Any]) -> Callable:
+    """Return a `to_sql` insert method that adds the constant partition columns as literals in the INSERT statement."""
+
+    def insert(table: Any, conn: Any, keys: list[str], data_iter: Any) -> int:
+        columns = ", ".join(f'"{column}"' for column in [*keys, *static_partitions])
+        values = ", ".join(["?"] * len(keys) + [_sql_literal(value) for value in static_partitions.values()])
+        return conn.executemany(f'INSERT INTO "{table.name}" ({columns}) VALUES ({values})', list(data_iter)).rowcount
+
+    return insert
+
+
 @DataFrameWriterRegistry.register("tsv")
 def write_tsv(writer: DataFrameWriter):
     """Write to tab-delimited text file"""
@@ -166,7 +303,7 @@ def write_tsv(writer: DataFrameWriter):
     mode: str = "a" if writer.mode == "append" and file_path.exists() else "w"
     header: bool = True if mode == "w" else False
 
-    df.to_csv(file_path, sep="\t", mode=mode, index=False, header=header)
+    _to_csv(df, file_path, sep="\t", mode=mode, header=header, static_partitions=_static_partitions(writer))
     print(f"Wrote TSV file: {file_path}")
 
 
@@ -184,5 +321,5 @@ def write_csv(writer: DataFrameWriter):
     mode: str = "a" if writer.mode == "append" and file_path.exists() else "w"
     header: bool = True if mode == "w" else False
 
-    df.to_csv(file_path, sep=",", mode=mode, index=False, header=header)
+    _to_csv(df, file_path, sep=",", mode=mode, header=header, static_partitions=_static_partitions(writer))
     print(f"Wrote CSV file: {file_path}")
@@ -0,0 +1,120 @@
+from data_loader.arrow_io import read_arrow_ipc, write_arrow_ipc
+
+import hashlib
+import json
+import os
+import pyarrow as pa
+from pandas import DataFrame
+from pathlib import Path
+
+
+def hash_file(path: Path | str) -> str:
+    """
+    Return the BLAKE2b hex digest of the content of a file. For a directory, such as a partitioned Parquet
+    dataset, the digest covers the relative path and content of every file below it.
+    """
+    path = Path(path)
+    if not path.is_dir():
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "blake2b").hexdigest()
+
+    digest = hashlib.blake2b()
+    for file_path in sorted(p for p in path.rglob("*") if p.is_file()):
+        digest.update(file_path.relative_to(path).as_posix().encode())
+        digest.update(bytes.fromhex(hash_file(file_path)))
+    return digest.hexdigest()
+
+
+class ExtractCache:
+    """
+    Content-addressed cache of validated extract data, stored as Arrow IPC files.
+
+    An entry is keyed on the content of the data file, the source of its schema file and the reader
+    options, so any change to one of them gives a new key and stale entries are never returned.
+    Entries are evicted least recently used first once the cache grows beyond `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: Path | str, max_bytes: int = 1024**3):
+        self.cache_dir: Path = Path(cache_dir)
+        self.max_bytes: int = max_bytes
+
+    def key(self, data_file: Path | str, schema_file: Path | str, read_options: dict) -> str:
+        """
+        Build the cache key of an extract file.
+
+        :param data_file: Path to the data file
+        :type data_file: Path | str
+        :param schema_file: Path to the schema file the data is validated against
+        :type schema_file: Path | str
+        :param read_options: Options passed to the reader
+        :type read_options: dict
+        :return: Hex digest identifying the validated extract
+        :rtype: str
+        """
+        parts = {
+            "data_file": hash_file(data_file),
+            "schema_file": hash_file(schema_file),
+            "read_options": read_options,
+        }
+        return hashlib.blake2b(json.dumps(parts, sort_keys=True, default=str).encode(), digest_size=20).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.arrow"
+
+    def get(self, key: str) -> DataFrame | None:
+        """Return the cached dataframe for a key, or None if it is not cached."""
+        path = self._entry_path(key)
+        try:
+            df = read_arrow_ipc(path)
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+
+        # Mark the entry as recently used
+        os.utime(path)
+        return df
+
+    def put(self, key: str, df: DataFrame) -> bool:
+        """
+        Store a validated dataframe under a key and evict old entries if the cache is over its size limit.
+
+        :return: False if the dataframe holds values that cannot be stored as Arrow, True otherwise
+        :rtype: bool
+        """
+        try:
+            write_arrow_ipc(df, self._entry_path(key))
+        except (pa.ArrowException, TypeError, ValueError):
+            return False
+
+        self.evict()
+        return True
+
+    def _entries(self) -> list[tuple[Path, os.stat_result]]:
+        """Return the cache entries with their stats, least recently used first."""
+        entries = []
+        for path in self.cache_dir.glob("*.arrow"):
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                pass
+        return sorted(entries, key=lambda entry: entry[1].st_mtime_ns)
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits in `max_bytes`. Returns the number removed."""
+        entries = self._entries()
+        total = sum(stat.st_size for _, stat in entries)
+
+        removed = 0
+        for path, stat in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """Remove every entry from the cache. Returns the number removed."""
+        entries = self._entries()
+        for path, _ in entries:
+            path.unlink(missing_ok=True)
+        return len(entries)
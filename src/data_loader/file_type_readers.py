@@ -1,7 +1,34 @@
+from data_loader.models.file_detection_model import FileDetection
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from pathlib import Path
+from dataclasses import asdict
+import bz2
+import codecs
 import csv
+import io
+import json
+import os
+import threading
+import zlib
 from pandas import DataFrame
+from typing import Iterator
+
+READER_ENGINES = ["pandas-c", "pyarrow"]
+DETECTION_SAMPLE_SIZE = 64 * 1024
+EXTENSION_FILE_TYPES = {
+    ".csv": "csv",
+    ".tsv": "tsv",
+    ".xls": "excel",
+    ".xlsx": "excel",
+    ".parquet": "parquet",
+    ".feather": "feather",
+}
+EXTENSION_COMPRESSIONS = {".gz": "gzip", ".bz2": "bz2"}
 
 
 def validate_path(path: str | Path) -> Path:
@@ -44,19 +71,69 @@ def validate_file(path: str | Path) -> Path:
     raise FileNotFoundError(f"File does not exist: {path}")
 
 
-def read_input_data(path: Path | str) -> DataFrame:
+def read_input_data(
+    path: Path | str,
+    engine: str = "pandas-c",
+    usecols: list[str] | None = None,
+    dtype: dict | None = None,
+    detection_cache: "DetectionCache | None" = None,
+) -> DataFrame:
     """
     Read input data from a file after validating its path
 
     :param path: Path to the input data file
     :type path: Path | str
+    :param engine: Parsing engine for CSV and TSV files, one of READER_ENGINES
+    :type engine: str
+    :param usecols: Only read these columns
+    :type usecols: list[str] | None
+    :param dtype: Types to parse columns into, keyed by column name
+    :type dtype: dict | None
+    :param detection_cache: Cache of file detection results to look the file up in
+    :type detection_cache: DetectionCache | None
     :return: DataFrame containing the loaded data
     :rtype: DataFrame
     """
 
     validated_file_path = validate_file(path=Path(path))
+    detection = detect_file(file_path=validated_file_path, cache=detection_cache)
+
+    return read_table(file_path=validated_file_path, engine=engine, usecols=usecols, dtype=dtype, detection=detection)
+
 
-    return read_table(file_path=validated_file_path)
+def read_input_batches(
+    path: Path | str,
+    chunksize: int,
+    engine: str = "pandas-c",
+    usecols: list[str] | None = None,
+    dtype: dict | None = None,
+    detection_cache: "DetectionCache | None" = None,
+) -> Iterator[DataFrame]:
+    """
+    Read input data from a file in batches after validating its path
+
+    :param path: Path to the input data file
+    :type path: Path | str
+    :param chunksize: Maximum number of rows in each batch
+    :type chunksize: int
+    :param engine: Parsing engine for CSV and TSV files, one of READER_ENGINES
+    :type engine: str
+    :param usecols: Only read these columns
+    :type usecols: list[str] | None
+    :param dtype: Types to parse columns into, keyed by column name
+    :type dtype: dict | None
+    :param detection_cache: Cache of file detection results to look the file up in
+    :type detection_cache: DetectionCache | None
+    :return: Iterator of DataFrames with at most `chunksize` rows each
+    :rtype: Iterator[DataFrame]
+    """
+
+    validated_file_path = validate_file(path=Path(path))
+    detection = detect_file(file_path=validated_file_path, cache=detection_cache)
+
+    return read_table_batches(
+        file_path=validated_file_path, chunksize=chunksize, engine=engine, usecols=usecols, dtype=dtype, detection=detection
+    )
 
 
 class UnsupportedFileTypeError(Exception):
@@ -71,104 +148,516 @@ def detect_file_type(file_path: Path) -> str:
 
     Returns
     -------
-    str : One of 'csv', 'tsv', 'csv.gz', 'tsv.gz', 'excel', 'parquet', 'feather'
+    str : One of 'csv', 'tsv', 'excel', 'parquet', 'feather'
     """
 
-    ext = "".join(file_path.suffixes).lower()
+    return detect_file(file_path).file_type
 
-    # 1️⃣ Extension-based hints
-    if ext in [".csv", ".csv.gz"]:
-        return "csv"
-    if ext in [".tsv"]:
-        return "tsv"
-    if ext in [".xls", ".xlsx"]:
-        return "excel"
-    if ext in [".parquet"]:
-        return "parquet"
-    if ext in [".feather"]:
-        return "feather"
 
-    # 2️⃣ Content-based detection
+def detect_file(file_path: Path, cache: "DetectionCache | None" = None) -> FileDetection:
+    """
+    Detect how a file should be parsed from a single buffered read of its first bytes.
+    The type comes from the extension when it is known and from magic bytes and text heuristics otherwise.
+    For delimited text files the result also holds the delimiter, encoding, compression, the column
+    names of the header row and the columns the pyarrow reader would infer as dates, times or timestamps,
+    so the parser does not have to open and sniff the file again.
+    A directory is read as a Parquet dataset partitioned in folders such as `data_label=Set1`, which is how
+    the Parquet writer stores an output table. Directories are not cached, because their modification time
+    does not change when the files inside them do.
+
+    Parameters
+    ----------
+    file_path : Path
+        Path to the file.
+    cache : DetectionCache | None
+        Cache to look the file up in before reading it, and to store the result in afterwards.
+
+    Returns
+    -------
+    FileDetection
+
+    Raises
+    ------
+    UnsupportedFileTypeError
+        If the file type cannot be determined.
+    """
+
+    file_path = Path(file_path)
+    if file_path.is_dir():
+        return FileDetection(file_type="parquet")
+
+    if cache is not None:
+        cached = cache.get(file_path)
+        if cached is not None:
+            return cached
+
     with open(file_path, "rb") as f:
-        header = f.read(8)
+        sample = f.read(DETECTION_SAMPLE_SIZE)
+
+    detection = _detect_from_sample(file_path, sample)
+
+    if cache is not None:
+        cache.put(file_path, detection)
+    return detection
+
+
+def _detect_from_sample(file_path: Path, sample: bytes) -> FileDetection:
+    """Detect the type and text dialect of a file from the first bytes of its content."""
 
+    suffixes = [suffix.lower() for suffix in file_path.suffixes]
+
+    # 1️⃣ Compression, from the extension or the magic bytes
+    compression = EXTENSION_COMPRESSIONS.get(suffixes[-1]) if suffixes else None
+    if compression is not None:
+        suffixes = suffixes[:-1]
+    elif sample.startswith(b"\x1f\x8b"):
+        compression = "gzip"
+    elif sample.startswith(b"BZh") and sample[4:10] == b"1AY&SY":
+        compression = "bz2"
+
+    complete = len(sample) < DETECTION_SAMPLE_SIZE
+    if compression is not None:
+        sample = decompress_sample(sample, compression)
+
+    # 2️⃣ Extension-based hints
+    file_type = EXTENSION_FILE_TYPES.get(suffixes[-1]) if suffixes else None
+    if file_type in ("excel", "parquet", "feather"):
+        return FileDetection(file_type=file_type)
+
+    # 3️⃣ Content-based detection
+    if file_type is None:
         # Parquet magic bytes
-        if header.startswith(b"PAR1"):
-            return "parquet"
+        if sample.startswith(b"PAR1"):
+            return FileDetection(file_type="parquet")
+
+        # Feather (Arrow IPC file) magic bytes
+        if sample.startswith(b"ARROW1"):
+            return FileDetection(file_type="feather")
 
         # Excel (XLSX = ZIP file, starts with PK)
-        if header.startswith(b"PK"):
-            return "excel"
+        if sample.startswith(b"PK"):
+            return FileDetection(file_type="excel")
+
+    encoding, text = _decode_sample(sample)
+
+    # Try text-based heuristics, then a CSV sniff
+    if file_type is None:
+        if "," in text[:8]:
+            file_type = "csv"
+        elif "\t" in text[:8]:
+            file_type = "tsv"
+        else:
+            delimiter = _sniff_delimiter(text, default=None)
+            if delimiter not in (",", "\t"):
+                raise UnsupportedFileTypeError(f"Could not determine file type for: {file_path}")
+            file_type = "tsv" if delimiter == "\t" else "csv"
+
+    delimiter = "\t" if file_type == "tsv" else _sniff_delimiter(text, default=",")
+    header = _parse_header(text, delimiter=delimiter, complete=complete)
+
+    return FileDetection(
+        file_type=file_type,
+        delimiter=delimiter,
+        encoding=encoding,
+        compression=compression,
+        header=header,
+        temporal_columns=None if header is None else _temporal_columns(text, delimiter=delimiter, complete=complete),
+    )
+
+
+def decompress_sample(sample: bytes, compression: str) -> bytes:
+    """Decompress as much of a truncated compressed sample as possible."""
+    try:
+        if compression == "gzip":
+            return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(sample)
+        return bz2.BZ2Decompressor().decompress(sample)
+    except (OSError, EOFError, zlib.error):
+        return b""
+
+
+def _decode_sample(sample: bytes) -> tuple[str, str]:
+    """Return the encoding of a text sample and the decoded text, ignoring a character cut off at the end."""
+    encoding = "utf-8-sig" if sample.startswith(codecs.BOM_UTF8) else "utf-8"
+    try:
+        return encoding, codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return "latin-1", sample.decode("latin-1")
 
-        # Try text-based heuristics
-        try:
-            text_sample = header.decode("utf-8", errors="ignore")
-            if "," in text_sample:
-                return "csv"
-            if "\t" in text_sample:
-                return "tsv"
-        except UnicodeDecodeError:
-            pass
 
-    # 3️⃣ Fallback heuristic (try CSV sniff)
+def _sniff_delimiter(text: str, default: str | None = ",") -> str | None:
+    """Return the delimiter sniffed from the start of a text sample, or `default` if it cannot be sniffed."""
     try:
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            sample = f.read(2048)
-            dialect = csv.Sniffer().sniff(sample)
-            delim = dialect.delimiter
-            if delim == "\t":
-                return "tsv"
-            if delim == ",":
-                return "csv"
-            raise
+        return csv.Sniffer().sniff(text[:2048]).delimiter
     except Exception:
-        pass
+        return default
+
+
+def _parse_header(text: str, delimiter: str, complete: bool) -> list[str] | None:
+    """Return the column names in the first row of a text sample, or None if the first row is cut off."""
+    if not complete and "\n" not in text:
+        return None
+    return next(csv.reader(io.StringIO(text), delimiter=delimiter), None)
+
 
-    raise UnsupportedFileTypeError(f"Could not determine file type for: {file_path}")
+def _temporal_columns(text: str, delimiter: str, complete: bool) -> list[str] | None:
+    """
+    Return the columns of a text sample that the pyarrow CSV reader infers as dates, times or timestamps, or None
+    if the sample cannot tell, such as when it cannot be parsed or a column has no values in it.
+    """
+    if not complete:
+        # Leave out the row that is cut off
+        text = text[: text.rfind("\n") + 1]
+    try:
+        sample = pa_csv.read_csv(io.BytesIO(text.encode("utf-8")), parse_options=pa_csv.ParseOptions(delimiter=delimiter))
+    except pa.ArrowInvalid:
+        return None
+    if sample.num_rows == 0 or any(pa.types.is_null(field.type) for field in sample.schema):
+        return None
+    return [field.name for field in sample.schema if pa.types.is_temporal(field.type)]
 
 
-def read_table(file_path: str | Path) -> pd.DataFrame:
+class DetectionCache:
+    """
+    On-disk cache of file detection results, keyed by resolved path, size and modification time.
+    A cached result is only returned while the file keeps the same size and modification time. New results
+    are held in memory until `save` is called. The cache can be shared between threads.
+    """
+
+    def __init__(self, cache_file: Path | str):
+        self.cache_file: Path = Path(cache_file)
+        self._entries: dict = {}
+        self._changed: bool = False
+        self._lock = threading.Lock()
+
+        if self.cache_file.exists():
+            try:
+                self._entries = json.loads(self.cache_file.read_text())
+            except (OSError, ValueError):
+                self._entries = {}
+
+    @staticmethod
+    def _stamp(file_path: Path) -> tuple[str, int, int]:
+        stat = os.stat(file_path)
+        return str(Path(file_path).resolve()), stat.st_size, stat.st_mtime_ns
+
+    def get(self, file_path: Path) -> FileDetection | None:
+        """Return the cached detection for a file, or None if it is missing or out of date."""
+        key, size, mtime_ns = self._stamp(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry["size"] != size or entry["mtime_ns"] != mtime_ns:
+            return None
+        return FileDetection(**entry["detection"])
+
+    def put(self, file_path: Path, detection: FileDetection) -> None:
+        """Store the detection for a file."""
+        key, size, mtime_ns = self._stamp(file_path)
+        with self._lock:
+            self._entries[key] = {"size": size, "mtime_ns": mtime_ns, "detection": asdict(detection)}
+            self._changed = True
+
+    def save(self) -> None:
+        """Write the cache to disk if it has changed."""
+        with self._lock:
+            if not self._changed:
+                return
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+            tmp_file.write_text(json.dumps(self._entries))
+            os.replace(tmp_file, self.cache_file)
+            self._changed = False
+
+
+def read_table(
+    file_path: str | Path,
+    engine: str = "pandas-c",
+    usecols: list[str] | None = None,
+    dtype: dict | None = None,
+    detection: FileDetection | None = None,
+) -> pd.DataFrame:
     """
     Read a tabular file (CSV, TSV, Excel, Feather, or Parquet) into a pandas DataFrame.
-    File type is detected automatically from both file extension and content.
+    File type is detected automatically from both file extension and content. A directory is read as a
+    partitioned Parquet dataset, with its partition keys as categorical columns.
 
     Parameters
     ----------
     file_path : str | Path
         Path to the file.
+    engine : str
+        Parsing engine for CSV and TSV files. "pandas-c" uses the single-threaded pandas C parser and
+        "pyarrow" uses the multi-threaded pyarrow CSV reader. Other file types ignore this option.
+    usecols : list[str] | None
+        Only read these columns. Names that are not in the file are ignored. Defaults to all columns.
+    dtype : dict | None
+        Types to parse columns into, keyed by column name; `str` for text or a numpy dtype. Parquet and
+        Feather files are already typed and ignore this option. If the data cannot be parsed into these
+        types the file is read again with inferred types, so that schema validation can report the problem.
+    detection : FileDetection | None
+        Result of `detect_file` for this file. The file is detected again if it is not given.
 
     Returns
     -------
     pd.DataFrame
     """
 
+    _check_engine(engine)
+
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {path}")
+
+    detection = detection or detect_file(path)
+
+    if dtype:
+        try:
+            return _read_table(path, detection=detection, engine=engine, usecols=usecols, dtype=dtype)
+        except (ValueError, TypeError):
+            pass
+
+    return _read_table(path, detection=detection, engine=engine, usecols=usecols, dtype=None)
+
+
+def _read_table(path: Path, detection: FileDetection, engine: str, usecols: list[str] | None, dtype: dict | None) -> pd.DataFrame:
+    """Read a whole file of a detected type with the given engine, columns and types."""
+
+    file_type = detection.file_type
+
+    if file_type in ("csv", "tsv") and engine == "pyarrow":
+        return _read_csv_pyarrow(path, detection=detection, usecols=usecols, dtype=dtype).to_pandas()
+
+    elif file_type in ("csv", "tsv"):
+        return pd.read_csv(path, usecols=_column_filter(usecols), dtype=dtype, **_pandas_csv_options(detection))
+
+    elif file_type == "excel":
+        return pd.read_excel(path, usecols=_column_filter(usecols), dtype=dtype)
+
+    elif file_type == "parquet":
+        return pd.read_parquet(path, columns=_select_columns(_parquet_column_names(path), usecols))
+
+    elif file_type == "feather":
+        return pd.read_feather(path, columns=_select_columns(_feather_column_names(path), usecols))
+
+    else:
+        raise UnsupportedFileTypeError(f"Unsupported or unrecognized file type: {file_type}")
+
+
+def _check_engine(engine: str) -> None:
+    """Raise a ValueError if `engine` is not one of READER_ENGINES."""
+    if engine not in READER_ENGINES:
+        raise ValueError(f"Unknown reader engine '{engine}'. Expected one of: {', '.join(READER_ENGINES)}")
+
+
+def _column_filter(usecols: list[str] | None):
+    """Return a pandas `usecols` callable that keeps the named columns, or None to keep every column."""
+    if usecols is None:
+        return None
+    keep = set(usecols)
+    return lambda column: column in keep
+
+
+def _select_columns(available: list[str], usecols: list[str] | None) -> list[str] | None:
+    """Return the columns of `available` that are in `usecols`, in file order, or None to keep every column."""
+    if usecols is None:
+        return None
+    keep = set(usecols)
+    return [column for column in available if column in keep]
+
+
+def parquet_dataset(path: Path) -> ds.Dataset:
+    """Open a directory of Parquet files partitioned in `key=value` folders, as pandas reads it."""
+    return ds.dataset(path, format="parquet", partitioning=ds.HivePartitioning.discover(infer_dictionary=True))
+
+
+def _parquet_column_names(path: Path) -> list[str]:
+    """Return the column names of a Parquet file, or of a partitioned Parquet directory, without reading its data."""
+    if path.is_dir():
+        return parquet_dataset(path).schema.names
+    return pq.read_schema(path).names
+
+
+def _feather_column_names(file_path: Path) -> list[str]:
+    """Return the column names of a Feather file without reading its data."""
+    with pa.memory_map(str(file_path)) as source:
+        return pa.ipc.open_file(source).schema.names
+
+
+def _arrow_type(dtype) -> pa.DataType:
+    """Convert a reader dtype (`str` or a numpy dtype) to an Arrow type."""
+    return pa.string() if dtype is str else pa.from_numpy_dtype(dtype)
+
+
+def _pandas_csv_options(detection: FileDetection) -> dict:
+    """Return the pandas `read_csv` arguments for a detected delimited text file."""
+    return {"sep": detection.delimiter, "encoding": detection.encoding, "compression": detection.compression}
+
+
+def _pyarrow_csv_source(path: Path, detection: FileDetection):
+    """Return a pyarrow input for a detected delimited text file, decompressing it if needed."""
+    if detection.compression is None:
+        return str(path)
+    return pa.input_stream(str(path), compression=detection.compression)
+
+
+def _pyarrow_csv_options(
+    path: Path, detection: FileDetection, usecols: list[str] | None = None, dtype: dict | None = None
+) -> tuple[pa_csv.ReadOptions, pa_csv.ParseOptions, pa_csv.ConvertOptions]:
+    """
+    Build pyarrow CSV options that parse a file the same way the pandas C engine does.
+    pyarrow infers dates, times and timestamps while pandas leaves them as text, so any temporal columns are
+    read as strings instead. The columns and the temporal columns come from the detection of the file; if it
+    could not tell them from its sample, they are inferred from the first block of the file.
+    Empty strings are read as nulls, as pandas does. Columns and types that are not in the file are ignored.
+    """
+    # pyarrow skips a UTF-8 byte order mark itself and transcodes any other encoding
+    encoding = "utf8" if detection.encoding in (None, "utf-8", "utf-8-sig") else detection.encoding
+    read_options = pa_csv.ReadOptions(use_threads=True, encoding=encoding)
+    parse_options = pa_csv.ParseOptions(delimiter=detection.delimiter)
+    if detection.header is not None and detection.temporal_columns is not None:
+        names, temporal_columns = detection.header, detection.temporal_columns
+    else:
+        with pa_csv.open_csv(_pyarrow_csv_source(path, detection), read_options=read_options, parse_options=parse_options) as reader:
+            schema = reader.schema
+        names, temporal_columns = schema.names, [field.name for field in schema if pa.types.is_temporal(field.type)]
+
+    column_types = {name: pa.string() for name in temporal_columns}
+    column_types.update({name: _arrow_type(column_dtype) for name, column_dtype in (dtype or {}).items() if name in names})
+
+    return (
+        read_options,
+        parse_options,
+        pa_csv.ConvertOptions(
+            column_types=column_types,
+            include_columns=_select_columns(names, usecols),
+            strings_can_be_null=True,
+        ),
+    )
+
+
+def _read_csv_pyarrow(path: Path, detection: FileDetection, usecols: list[str] | None = None, dtype: dict | None = None) -> pa.Table:
+    """Read a delimited text file into an Arrow table with the multi-threaded pyarrow CSV reader."""
+    read_options, parse_options, convert_options = _pyarrow_csv_options(path, detection=detection, usecols=usecols, dtype=dtype)
+    return pa_csv.read_csv(
+        _pyarrow_csv_source(path, detection),
+        read_options=read_options,
+        parse_options=parse_options,
+        convert_options=convert_options,
+    )
+
+
+def _slice_record_batches(batches: Iterator[pa.RecordBatch], chunksize: int) -> Iterator[DataFrame]:
+    """Convert Arrow record batches to DataFrames of at most `chunksize` rows."""
+    for batch in batches:
+        for offset in range(0, batch.num_rows, chunksize):
+            yield batch.slice(offset, chunksize).to_pandas()
+
+
+def read_table_batches(
+    file_path: str | Path,
+    chunksize: int,
+    engine: str = "pandas-c",
+    usecols: list[str] | None = None,
+    dtype: dict | None = None,
+    detection: FileDetection | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Read a tabular file (CSV, TSV, Excel, Feather, or Parquet) as a sequence of pandas DataFrames.
+    Only one batch is held in memory at a time for CSV, TSV, Parquet and Feather files, so peak memory
+    depends on `chunksize` rather than on the size of the file. Excel files cannot be read
+    incrementally; they are loaded whole and then sliced.
+
+    Parameters
+    ----------
+    file_path : str | Path
+        Path to the file.
+    chunksize : int
+        Maximum number of rows in each batch.
+    engine : str
+        Parsing engine for CSV and TSV files, one of READER_ENGINES. The pyarrow engine reads the file in
+        blocks of bytes, so its batches can hold fewer than `chunksize` rows.
+    usecols : list[str] | None
+        Only read these columns, as in `read_table`.
+    dtype : dict | None
+        Types to parse columns into, as in `read_table`. If a batch cannot be parsed into these types, the
+        rest of the file is read with inferred types.
+    detection : FileDetection | None
+        Result of `detect_file` for this file. The file is detected again if it is not given.
+
+    Returns
+    -------
+    Iterator[pd.DataFrame]
+    """
+
+    _check_engine(engine)
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be a positive integer, got: {chunksize}")
+
     path = Path(file_path)
     if not path.exists():
         raise FileNotFoundError(f"File not found: {path}")
 
-    file_type = detect_file_type(path)
+    detection = detection or detect_file(path)
 
-    if file_type == "csv":
+    rows_read = 0
+    if dtype:
         try:
-            with open(path, "r", newline="", encoding="utf-8") as f:
-                sample = f.read(2048)
-                f.seek(0)
-                dialect = csv.Sniffer().sniff(sample)
-                return pd.read_csv(f, sep=dialect.delimiter)
-        except Exception:
-            return pd.read_csv(path)
+            for batch in _iter_table_batches(path, detection=detection, chunksize=chunksize, engine=engine, usecols=usecols, dtype=dtype):
+                yield batch
+                rows_read += len(batch)
+            return
+        except (ValueError, TypeError):
+            pass
+
+    # Untyped read, skipping any rows that were already returned by the typed read
+    for batch in _iter_table_batches(path, detection=detection, chunksize=chunksize, engine=engine, usecols=usecols, dtype=None):
+        if rows_read >= len(batch):
+            rows_read -= len(batch)
+            continue
+        yield batch.iloc[rows_read:]
+        rows_read = 0
+
+
+def _iter_table_batches(
+    path: Path, detection: FileDetection, chunksize: int, engine: str, usecols: list[str] | None, dtype: dict | None
+) -> Iterator[pd.DataFrame]:
+    """Read a file of a detected type in batches with the given engine, columns and types."""
 
-    elif file_type == "tsv":
-        return pd.read_csv(path, sep="\t")
+    file_type = detection.file_type
+
+    if file_type in ("csv", "tsv") and engine == "pyarrow":
+        read_options, parse_options, convert_options = _pyarrow_csv_options(path, detection=detection, usecols=usecols, dtype=dtype)
+        with pa_csv.open_csv(
+            _pyarrow_csv_source(path, detection), read_options=read_options, parse_options=parse_options, convert_options=convert_options
+        ) as reader:
+            yield from _slice_record_batches(reader, chunksize=chunksize)
+
+    elif file_type in ("csv", "tsv"):
+        with pd.read_csv(
+            path, chunksize=chunksize, usecols=_column_filter(usecols), dtype=dtype, **_pandas_csv_options(detection)
+        ) as reader:
+            yield from reader
 
     elif file_type == "excel":
-        return pd.read_excel(path)
+        df = pd.read_excel(path, usecols=_column_filter(usecols), dtype=dtype)
+        for offset in range(0, len(df), chunksize):
+            yield df.iloc[offset : offset + chunksize]
+
+    elif file_type == "parquet" and path.is_dir():
+        dataset = parquet_dataset(path)
+        columns = _select_columns(dataset.schema.names, usecols)
+        yield from _slice_record_batches(dataset.to_batches(columns=columns, batch_size=chunksize), chunksize=chunksize)
 
     elif file_type == "parquet":
-        return pd.read_parquet(path)
+        parquet_file = pq.ParquetFile(path)
+        columns = _select_columns(parquet_file.schema_arrow.names, usecols)
+        yield from _slice_record_batches(parquet_file.iter_batches(batch_size=chunksize, columns=columns), chunksize=chunksize)
 
     elif file_type == "feather":
-        return pd.read_feather(path)
+        with pa.memory_map(str(path)) as source:
+            reader = pa.ipc.open_file(source)
+            columns = _select_columns(reader.schema.names, usecols)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+            yield from _slice_record_batches((batch.select(columns) if columns is not None else batch for batch in batches), chunksize)
 
     else:
         raise UnsupportedFileTypeError(f"Unsupported or unrecognized file type: {file_type}")
@@ -1,7 +1,17 @@
+import atexit
+import json
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 import datetime
 
+# Fields that pipeline code passes to log records with `extra=` and the JSON formatter writes when present
+STRUCTURED_FIELDS = ["run_id", "stage", "rows", "duration"]
+
+# Listeners of the queued loggers, by logger name
+_listeners: dict[str, QueueListener] = {}
+
 
 def get_timestamp() -> str:
     """Returns a formatted timestamp string.
@@ -22,23 +32,96 @@ def get_timestamp() -> str:
     return datetime.datetime.now().strftime(format="%Y_%m_%d__%H_%M_%S")
 
 
-def setup_logger(log_file: Path | None = None, level: int = logging.INFO, name: str = "logger"):
-    """Set up a simple structured logger."""
+class JsonFormatter(logging.Formatter):
+    """
+    Format each log record as one line of JSON, with the structured fields the record carries. Records that come
+    through a QueueHandler carry the traceback of an exception in their message.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            if getattr(record, field, None) is not None:
+                entry[field] = getattr(record, field)
+        return json.dumps(entry, default=str)
+
+
+class RunIdFilter(logging.Filter):
+    """Add the id of the current run to every record that does not carry one."""
+
+    def __init__(self, run_id: str):
+        super().__init__()
+        self.run_id = run_id
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "run_id", None) is None:
+            record.run_id = self.run_id
+        return True
+
+
+def setup_logger(
+    log_file: Path | None = None, level: int = logging.INFO, name: str = "logger", structured: bool = False, run_id: str | None = None
+):
+    """
+    Set up a simple structured logger.
+
+    With `structured`, records are put on a queue and written by a listener thread, so logging never waits for the
+    console or the log file, and the lines of different threads are never interleaved. The log file then holds one
+    JSON object per record with its time, level, thread and message, the run id and, for the records of pipeline
+    stages, the stage, rows and duration. The console keeps the plain text format. Call `flush_logger` to wait for
+    the queued records to be written.
+    """
     logger: logging.Logger = logging.getLogger(name)
     logger.setLevel(level)
 
-    # Avoid duplicate handlers in re-runs
-    if logger.handlers:
-        return logger
-
     formatter = logging.Formatter(
         fmt="%(asctime)s | %(levelname)-8s | %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
 
-    console = logging.StreamHandler()
-    console.setFormatter(formatter)
-    logger.addHandler(console)
+    # A logger switches between queued and direct handlers as a whole
+    _stop_listener(logger)
+    if structured:
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+            handler.close()
+        console = logging.StreamHandler()
+        console.setFormatter(formatter)
+        handlers: list[logging.Handler] = [console]
+        if log_file:
+            Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+            file_handler = logging.FileHandler(log_file)
+            file_handler.setFormatter(JsonFormatter(datefmt="%Y-%m-%d %H:%M:%S"))
+            handlers.append(file_handler)
+
+        records: queue.Queue = queue.Queue()
+        queue_handler = QueueHandler(records)
+        if run_id is not None:
+            queue_handler.addFilter(RunIdFilter(run_id))
+        logger.addHandler(queue_handler)
+        _listeners[name] = QueueListener(records, *handlers, respect_handler_level=True)
+        _listeners[name].start()
+        return logger
+
+    # Avoid duplicate handlers in re-runs
+    if logger.handlers:
+        # A process that runs several pipelines moves the logger on to the log file of the current one
+        file_handlers = [handler for handler in logger.handlers if isinstance(handler, logging.FileHandler)]
+        if not log_file or any(handler.baseFilename == str(Path(log_file).resolve()) for handler in file_handlers):
+            return logger
+        for handler in file_handlers:
+            logger.removeHandler(handler)
+            handler.close()
+    else:
+        console = logging.StreamHandler()
+        console.setFormatter(formatter)
+        logger.addHandler(console)
 
     if log_file:
         Path(log_file).parent.mkdir(parents=True, exist_ok=True)
@@ -47,3 +130,31 @@ def setup_logger(log_file: Path | None = None, level: int = logging.INFO, name:
         logger.addHandler(file_handler)
 
     return logger
+
+
+def flush_logger(logger: logging.Logger) -> None:
+    """Wait until the queued records of a logger set up with `structured` have been written."""
+    listener = _listeners.get(logger.name)
+    if listener is not None:
+        listener.queue.join()
+        for handler in listener.handlers:
+            handler.flush()
+
+
+def _stop_listener(logger: logging.Logger) -> None:
+    """Write the queued records of a logger, stop its listener and close the handlers it wrote to."""
+    listener = _listeners.pop(logger.name, None)
+    if listener is None:
+        return
+    listener.stop()
+    for handler in list(logger.handlers):
+        if isinstance(handler, QueueHandler):
+            logger.removeHandler(handler)
+    for handler in listener.handlers:
+        handler.close()
+
+
+@atexit.register
+def _stop_listeners() -> None:
+    for name in list(_listeners):
+        _stop_listener(logging.getLogger(name))
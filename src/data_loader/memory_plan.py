@@ -0,0 +1,226 @@
+from data_loader.file_type_readers import DetectionCache, decompress_sample, detect_file, parquet_dataset, read_table_batches
+from data_loader.models.file_detection_model import FileDetection
+from data_loader.stage_metrics import path_size
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dataclasses import dataclass
+from pathlib import Path
+from pandera.pandas import DataFrameSchema
+
+MEMORY_FALLBACKS = ["stream", "refuse"]
+# Rows parsed from the start of each file to measure the size of a row in memory
+SAMPLE_ROWS = 1_000
+# Bytes read from the start of a delimited text file to measure the length of a line
+SAMPLE_BYTES = 1024**2
+# Validation returns a coerced copy of each frame and the transformer builds its output from its inputs, so a run
+# holds about twice the size of its input frames at its peak
+WORKING_SET_FACTOR = 2
+# Smallest batch a run falls back to; smaller batches spend most of their time in per-batch overhead
+MIN_CHUNKSIZE = 1_000
+
+
+class MemoryBudgetError(Exception):
+    """Raised when a pipeline is estimated to need more memory than its budget allows."""
+
+
+@dataclass
+class ExtractEstimate:
+    label: str
+    data_file: str
+    file_type: str
+    file_bytes: int
+    rows: int
+    row_bytes: float
+
+    @property
+    def frame_bytes(self) -> int:
+        """Estimated size of the whole file as a DataFrame."""
+        return int(self.rows * self.row_bytes)
+
+
+@dataclass
+class MemoryPlan:
+    extracts: list[ExtractEstimate]
+    memory_limit_bytes: int | None
+    chunksize: int | None
+    peak_bytes: int
+    fits: bool
+    streamed_files: int = 1
+    reason: str | None = None
+
+    def format_table(self) -> str:
+        """Format the estimate of each extract file, the peak of the run and the decision as lines of text."""
+        width = max([len(extract.label) for extract in self.extracts] + [len("Extract")])
+        lines = [f"{'Extract':<{width}}  {'Format':>7}  {'File MB':>9}  {'Rows':>12}  {'Bytes/row':>9}  {'Frame MB':>9}"]
+        for extract in self.extracts:
+            lines.append(
+                f"{extract.label:<{width}}  {extract.file_type:>7}  {extract.file_bytes / 1024**2:>9.1f}  {extract.rows:>12}"
+                f"  {extract.row_bytes:>9.0f}  {extract.frame_bytes / 1024**2:>9.1f}"
+            )
+        limit = "none" if self.memory_limit_bytes is None else f"{self.memory_limit_bytes / 1024**2:.0f} MB"
+        lines.append(f"Estimated peak: {self.peak_bytes / 1024**2:.1f} MB, memory limit: {limit}")
+        if not self.fits:
+            lines.append(f"Decision: refuse to run, {self.reason or 'the pipeline does not fit the memory limit'}")
+        elif self.chunksize:
+            streamed = ", ".join(f"'{extract.label}'" for extract in self.extracts[: self.streamed_files])
+            lines.append(f"Decision: stream {streamed} in batches of {self.chunksize} rows")
+        else:
+            lines.append("Decision: read whole files")
+        return "\n".join(lines)
+
+
+def estimate_extract(
+    label: str, data_file: Path | str, schema: DataFrameSchema, read_options: dict, detection_cache: DetectionCache | None = None
+) -> ExtractEstimate:
+    """
+    Estimate the size of an extract file once it is read into a DataFrame, without reading the whole file
+
+    The number of rows comes from the metadata of Parquet, Feather and Excel files, and from the length of the lines
+    at the start of delimited text files, scaled up to the file size and to its compression ratio. The size of a row
+    is measured on the first `SAMPLE_ROWS` rows, parsed with the same reader options as the run: columns the schema
+    declares with a fixed-width type count their item size, and other columns, such as strings, their measured size.
+
+    :param label: Label of the extract file
+    :type label: str
+    :param data_file: Path to the data file
+    :type data_file: Path | str
+    :param schema: Schema of the extract file
+    :type schema: DataFrameSchema
+    :param read_options: Reader options of the run, as built from the schema
+    :type read_options: dict
+    :param detection_cache: Cache of file detection results to look the file up in
+    :type detection_cache: DetectionCache | None
+    :return: Estimated rows and bytes of the file
+    :rtype: ExtractEstimate
+    """
+    path = Path(data_file)
+    detection = detect_file(path, cache=detection_cache)
+    if detection.file_type == "excel":
+        # The batch reader loads Excel files whole
+        sample = pd.read_excel(path, nrows=SAMPLE_ROWS, usecols=read_options.get("usecols"), dtype=read_options.get("dtype"))
+    else:
+        batches = read_table_batches(path, chunksize=SAMPLE_ROWS, detection=detection, **read_options)
+        sample = next(iter(batches), pd.DataFrame())
+    return ExtractEstimate(
+        label=label,
+        data_file=str(data_file),
+        file_type=detection.file_type,
+        file_bytes=path_size(path),
+        rows=estimate_rows(path, detection=detection),
+        row_bytes=estimate_row_bytes(sample, schema=schema),
+    )
+
+
+def estimate_rows(path: Path, detection: FileDetection) -> int:
+    """Return the number of data rows of a file, exact for Parquet, Feather and Excel and estimated for text files."""
+    if detection.file_type == "parquet":
+        return parquet_dataset(path).count_rows() if path.is_dir() else pq.ParquetFile(path).metadata.num_rows
+    if detection.file_type == "feather":
+        with pa.memory_map(str(path)) as source:
+            reader = pa.ipc.open_file(source)
+            return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+    if detection.file_type == "excel":
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(path, read_only=True)
+        try:
+            return max((workbook.worksheets[0].max_row or 1) - 1, 0)
+        finally:
+            workbook.close()
+
+    with open(path, "rb") as f:
+        raw = f.read(SAMPLE_BYTES)
+    complete = len(raw) < SAMPLE_BYTES
+    text = decompress_sample(raw, detection.compression) if detection.compression else raw
+    lines = text.count(b"\n") + (not text.endswith(b"\n") and bool(text))
+    if complete:
+        return max(lines - 1, 0)
+    # Scale the line density of the sample, decompressed, to the whole file
+    total_bytes = path.stat().st_size * len(text) / len(raw)
+    return max(round(total_bytes * text.count(b"\n") / max(len(text), 1)) - 1, 0)
+
+
+def estimate_row_bytes(sample: pd.DataFrame, schema: DataFrameSchema) -> float:
+    """Return the size in memory of an average row of a sample, with the fixed-width types the schema declares."""
+    if sample.empty:
+        return 0.0
+    measured = sample.memory_usage(deep=True, index=False) / len(sample)
+    row_bytes = 0.0
+    for name in sample.columns:
+        column = schema.columns.get(name)
+        dtype = getattr(column.dtype, "type", None) if column is not None and column.dtype is not None else None
+        if isinstance(dtype, np.dtype) and dtype.kind in "iufbmM":
+            row_bytes += dtype.itemsize
+        else:
+            row_bytes += measured[name]
+    return row_bytes
+
+
+def plan_memory(
+    extracts: list[ExtractEstimate],
+    memory_limit_bytes: int | None,
+    chunksize: int | None,
+    fallback_chunksize: int,
+    streamed_files: int = 1,
+    can_stream: bool = True,
+) -> MemoryPlan:
+    """
+    Decide how a run reads its extract files to stay within a memory limit
+
+    A run holds every extract file read whole at once, and only a batch of each streamed file when it streams: the
+    first file, or every file for a streaming transformer. The peak is estimated as `WORKING_SET_FACTOR` times the
+    frames held. If the run does not fit, it falls back to streaming in batches of `fallback_chunksize` rows, or fewer
+    if needed. It does not fit at all if it cannot stream, if the files read whole alone exceed the limit, if batches
+    would have fewer than `MIN_CHUNKSIZE` rows, or if a streamed file is an Excel file, which cannot be read in
+    batches.
+
+    :param extracts: Estimates of the extract files, in config order
+    :type extracts: list[ExtractEstimate]
+    :param memory_limit_bytes: Memory budget of the run, or None for no limit
+    :type memory_limit_bytes: int | None
+    :param chunksize: Rows per batch if the run already streams, or None if it reads whole files
+    :type chunksize: int | None
+    :param fallback_chunksize: Largest batch to fall back to, such as the `chunksize` of the config
+    :type fallback_chunksize: int
+    :param streamed_files: Number of extract files, from the first, that the run reads in batches when it streams
+    :type streamed_files: int
+    :param can_stream: Whether a run that reads whole files may fall back to streaming, which is only the case if its
+        transformer gives the same output on batches
+    :type can_stream: bool
+    :return: The plan, with the chunksize the run should use
+    :rtype: MemoryPlan
+    """
+    streamed, whole = extracts[:streamed_files], extracts[streamed_files:]
+
+    def peak(batch_rows: int | None) -> int:
+        if batch_rows is None:
+            held = sum(extract.frame_bytes for extract in extracts)
+        else:
+            held = sum(min(batch_rows, extract.rows) * extract.row_bytes for extract in streamed)
+            held += sum(extract.frame_bytes for extract in whole)
+        return int(WORKING_SET_FACTOR * held)
+
+    def refuse(reason: str) -> MemoryPlan:
+        return MemoryPlan(extracts, memory_limit_bytes, chunksize, peak_bytes=peak(chunksize), fits=False, reason=reason)
+
+    if memory_limit_bytes is None or peak(chunksize) <= memory_limit_bytes:
+        return MemoryPlan(
+            extracts, memory_limit_bytes, chunksize=chunksize, peak_bytes=peak(chunksize), fits=True, streamed_files=streamed_files
+        )
+
+    if chunksize is None and not can_stream:
+        return refuse("the transformer cannot run on batches. Declare ROW_LOCAL = True in it or define transform_batches")
+    excel = [extract.label for extract in streamed if extract.file_type == "excel"]
+    if excel:
+        return refuse(f"'{excel[0]}' is an Excel file, which cannot be read in batches")
+    row_bytes = sum(extract.row_bytes for extract in streamed)
+    batch_rows = int((memory_limit_bytes / WORKING_SET_FACTOR - sum(extract.frame_bytes for extract in whole)) // max(row_bytes, 1))
+    batch_rows = min(batch_rows, chunksize or fallback_chunksize)
+    if batch_rows < MIN_CHUNKSIZE:
+        return refuse(f"batches that fit would have fewer than {MIN_CHUNKSIZE} rows")
+    return MemoryPlan(
+        extracts, memory_limit_bytes, chunksize=batch_rows, peak_bytes=peak(batch_rows), fits=True, streamed_files=streamed_files
+    )
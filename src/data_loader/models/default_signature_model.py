@@ -1,3 +1,5 @@
 from pandas import DataFrame
+from typing import Iterator
 
 def transform(*dfs: DataFrame, **kwargs) -> DataFrame: ...
+def transform_batches(*batches: Iterator[DataFrame], **kwargs) -> Iterator[DataFrame]: ...
@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class FileDetection:
+    file_type: str
+    delimiter: str | None = None
+    encoding: str | None = None
+    compression: str | None = None
+    header: list[str] | None = None
+    temporal_columns: list[str] | None = None
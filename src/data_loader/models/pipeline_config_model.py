@@ -7,6 +7,24 @@ class PipelineDetails:
     name: str
     description: str
     transformer_pipeline: str
+    streaming: bool = False
+    chunksize: int = 100_000
+    engine: str = "pandas-c"
+    schema_pushdown: bool = False
+    detection_cache: bool = False
+    extract_cache: bool = False
+    extract_cache_max_mb: int = 1024
+    max_workers: int = 1
+    validation_engine: str = "pandera"
+    validation_workers: int | None = None
+    validation_cache: bool = False
+    skip_unchanged: bool = False
+    checkpoints: bool = False
+    memory_limit_mb: int | None = None
+    memory_fallback: str = "stream"
+    transform_workers: int = 1
+    copy_on_write: bool = False
+    structured_logging: bool = False
 
 
 @dataclass
@@ -14,6 +32,9 @@ class InputFile:
     data_file: str
     schema_file: str
     label: str
+    engine: str | None = None
+    prune_unknown_columns: bool = False
+    depends_on: str | None = None
 
 
 @dataclass
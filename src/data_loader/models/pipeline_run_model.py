@@ -0,0 +1,7 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class PipelineRun:
+    status: str
+    rows: int
@@ -1,10 +1,32 @@
 import importlib.util
 import os
+import threading
 from types import ModuleType
 from typing import Any
 from pathlib import Path
 
 
+# Modules loaded by load_object_from_file, by resolved path, with the mtime and size of the file they were loaded from
+_module_cache: dict[Path, tuple[int, int, ModuleType]] = {}
+_module_cache_lock = threading.RLock()
+
+
+def clear_module_cache(file_path: Path | None = None) -> None:
+    """
+    Drop modules cached by `load_object_from_file`, so that the next call executes their files again.
+    Parameters
+    ----------
+    file_path : Path | None
+        Python file whose module to drop. All cached modules are dropped if None.
+    """
+
+    with _module_cache_lock:
+        if file_path is None:
+            _module_cache.clear()
+        else:
+            _module_cache.pop(Path(file_path).resolve(), None)
+
+
 def load_object_from_file(folder_name: Path, file_name: str, object_name: str) -> Any:
     """
     Load and return an attribute (e.g., class, function, variable) from a Python source file.
@@ -35,6 +57,9 @@ def load_object_from_file(folder_name: Path, file_name: str, object_name: str) -
       and the spec's loader; executing the module will run any module-level side effects.
     - A new module object is created and executed; it is not guaranteed to be automatically inserted into sys.modules
       under the derived module name.
+    - Modules are cached for the life of the process by resolved path. A file is executed again only when its
+      modification time or size changes, or after `clear_module_cache`. Objects returned by repeated calls are
+      therefore shared and should not be mutated.
     - Use caution when loading and executing untrusted code, as this may introduce security risks.
     """
 
@@ -43,15 +68,31 @@ def load_object_from_file(folder_name: Path, file_name: str, object_name: str) -
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    module_name: str = os.path.splitext(os.path.basename(file_path))[0]
-    spec = importlib.util.spec_from_file_location(module_name, file_path)
-    if spec is None or spec.loader is None:
-        raise ImportError(f"Cannot import from {file_path}")
-
-    module: ModuleType = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)  # type: ignore
+    module: ModuleType = _load_module(file_path)
 
     if not hasattr(module, object_name):
         raise AttributeError(f"Object '{object_name}' not found in {file_path}")
 
     return getattr(module, object_name)
+
+
+def _load_module(file_path: Path) -> ModuleType:
+    """Return the module of a Python file from the cache, executing the file if it is new or has changed."""
+
+    resolved_path: Path = Path(file_path).resolve()
+    with _module_cache_lock:
+        stat = os.stat(resolved_path)
+        cached = _module_cache.get(resolved_path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        module_name: str = os.path.splitext(os.path.basename(file_path))[0]
+        spec = importlib.util.spec_from_file_location(module_name, file_path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Cannot import from {file_path}")
+
+        module: ModuleType = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)  # type: ignore
+
+        _module_cache[resolved_path] = (stat.st_mtime_ns, stat.st_size, module)
+        return module
@@ -0,0 +1,146 @@
+from data_loader.object_loader import load_object_from_file
+from data_loader.transformer_loader import load_transformer_function
+from data_loader.validation_engines import MIN_PARTITION_ROWS, concat_partitions
+
+import multiprocessing
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pandas import DataFrame
+from pandera.pandas import DataFrameSchema
+from pathlib import Path
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class Partitioning:
+    partition_by: str | None = None
+
+    def describe(self) -> str:
+        """Describe the partitioning for the log."""
+        return f"partitioned by '{self.partition_by}'" if self.partition_by else "row-local"
+
+
+def transformer_partitioning(func: Callable) -> Partitioning | None:
+    """
+    Return how the module of a transformer function says its input can be split, or None if it does not say
+
+    A module declares `PARTITION_BY = "<column>"` if rows with different values of the column never affect each
+    other's output, such as a transformer that joins its inputs on that column. It declares `ROW_LOCAL = True` if
+    each row of its first input is transformed on its own, such as a transformer that only renames, maps and
+    reformats columns.
+
+    :param func: The transformer function, as loaded by `load_transformer_function`
+    :type func: Callable
+    :return: The partitioning its module declares
+    :rtype: Partitioning | None
+    """
+    module_globals = getattr(func, "__globals__", {})
+    if module_globals.get("PARTITION_BY"):
+        return Partitioning(partition_by=module_globals["PARTITION_BY"])
+    if module_globals.get("ROW_LOCAL"):
+        return Partitioning()
+    return None
+
+
+def split_inputs(dfs: tuple[DataFrame, ...], partitioning: Partitioning, partitions: int) -> list[tuple[DataFrame, ...]]:
+    """
+    Split the inputs of a transformer into the inputs of `partitions` independent calls
+
+    With a partition key, every input that has the key column is split by a hash of the key, so rows with the same
+    key land in the same partition in every input. Keys are hashed by value, so the column needs the same type in
+    each input. Row-local transformers get contiguous row ranges of their first input. Inputs that are not split,
+    such as lookup tables without the key column, are passed whole to every partition.
+
+    :raises ValueError: If the first input does not have the partition key
+    """
+    first = dfs[0]
+    if partitioning.partition_by is None:
+        size = -(-len(first) // partitions)
+        return [(first.iloc[start : start + size], *dfs[1:]) for start in range(0, len(first), size)]
+
+    if partitioning.partition_by not in first.columns:
+        raise ValueError(f"The transformer is partitioned by '{partitioning.partition_by}', which is not a column of its first input")
+
+    split = []
+    for df in dfs:
+        if partitioning.partition_by not in df.columns:
+            split.append([df] * partitions)
+            continue
+        buckets = pd.util.hash_pandas_object(df[partitioning.partition_by], index=False).to_numpy() % partitions
+        split.append([df.iloc[np.flatnonzero(buckets == bucket)] for bucket in range(partitions)])
+    return list(zip(*split))
+
+
+_worker_transform: Callable | None = None
+_worker_output_schema: DataFrameSchema | None = None
+
+
+def _init_worker(transformer_file: str, template_file: str, output_schema_file: str) -> None:
+    """Load the transformer and output schema once per worker process. Both may hold lambdas, which cannot be pickled."""
+    global _worker_transform, _worker_output_schema
+    _worker_transform = load_transformer_function(transformer_file=Path(transformer_file), template_file=Path(template_file))
+    _worker_output_schema = load_object_from_file(
+        folder_name=Path(output_schema_file).parent, file_name=Path(output_schema_file).name, object_name="schema"
+    )
+
+
+def _transform_partition(dfs: tuple[DataFrame, ...]) -> DataFrame:
+    return _worker_transform(*dfs, output_schema=_worker_output_schema)
+
+
+def transform_partitioned(
+    func: Callable,
+    *dfs: DataFrame,
+    output_schema: DataFrameSchema,
+    partitioning: Partitioning,
+    transformer_file: Path,
+    template_file: Path,
+    output_schema_file: Path,
+    max_workers: int | None = None,
+    min_partition_rows: int = MIN_PARTITION_ROWS,
+) -> DataFrame:
+    """
+    Run a partitionable transformer on partitions of its inputs in parallel worker processes
+
+    The inputs are split with `split_inputs` and every worker loads the transformer and the output schema from their
+    files. The outputs of the partitions are concatenated in partition order; with a partition key, rows therefore
+    come back grouped by partition rather than in input order. Inputs too small to give each worker
+    `min_partition_rows` rows of the first input are transformed with `func` in the current process.
+
+    :param func: The loaded transformer, used for small inputs
+    :type func: Callable
+    :param dfs: The validated extract files, in config order
+    :type dfs: DataFrame
+    :param output_schema: The output schema, passed to the transformer
+    :type output_schema: DataFrameSchema
+    :param partitioning: How the transformer module says its input can be split
+    :type partitioning: Partitioning
+    :param transformer_file: Path to the transformer module
+    :type transformer_file: Path
+    :param template_file: Path to the signature template the transformer is checked against
+    :type template_file: Path
+    :param output_schema_file: Path to the module defining the output schema
+    :type output_schema_file: Path
+    :param max_workers: Maximum number of worker processes. Defaults to None, which uses one per CPU, as does 0
+    :type max_workers: int | None
+    :param min_partition_rows: Smallest number of rows of the first input worth a worker
+    :type min_partition_rows: int
+    :return: The concatenated output of the partitions
+    :rtype: DataFrame
+    """
+    max_workers = max_workers or multiprocessing.cpu_count()
+    partitions = min(max_workers, len(dfs[0]) // max(min_partition_rows, 1))
+    if partitions <= 1:
+        return func(*dfs, output_schema=output_schema)
+
+    with ProcessPoolExecutor(
+        max_workers=partitions,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(str(Path(transformer_file).resolve()), str(Path(template_file).resolve()), str(Path(output_schema_file).resolve())),
+    ) as executor:
+        outputs = list(executor.map(_transform_partition, split_inputs(dfs, partitioning=partitioning, partitions=partitions)))
+
+    return concat_partitions(outputs)
@@ -0,0 +1,745 @@
+from data_loader.logging_utilties import flush_logger, setup_logger, get_timestamp
+from data_loader.pipeline_config_io import load_pipeline_config  # , #load_config
+from data_loader.file_type_readers import read_input_data, read_input_batches, DetectionCache
+from data_loader.object_loader import load_object_from_file
+from data_loader.transformer_loader import is_streaming_transformer, load_transformer_function
+from data_loader.schema_pushdown import schema_read_options
+from data_loader.extract_cache import ExtractCache
+from data_loader.validation_engines import validate_dataframe
+from data_loader.validation_cache import ValidationCache, is_cacheable
+from data_loader.data_writer import ConnectionPool, DataFrameWriter, static_partition_path
+from data_loader.run_manifest import RunManifest, target_path
+from data_loader.checkpoints import RunCheckpoints
+from data_loader.stage_metrics import StageRecorder, WrittenFiles, bytes_copied, path_size
+from data_loader.transformer_profiler import TransformerProfiler, format_hot_spots
+from data_loader.partitioned_transform import transform_partitioned, transformer_partitioning
+from data_loader.memory_plan import MEMORY_FALLBACKS, MemoryBudgetError, MemoryPlan, estimate_extract, plan_memory
+from data_loader.models.extract_pipeline_data_model import ExtractPipelineData
+from data_loader.models.pipeline_config_model import PipelineConfig, InputFile
+from data_loader.models.pipeline_run_model import PipelineRun
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from logging import Logger
+from pathlib import Path
+from pandas import DataFrame, option_context
+from typing import Iterator
+from pandera.pandas import DataFrameSchema
+
+
+DEFAULT_PATHS = {
+    "signature_model": "src/data_loader/models/default_signature_model.py",
+    "cache_dir": ".data_loader_cache",
+}
+
+
+def run_pipeline(
+    config: str,
+    mode: str = "append",
+    dry_run: bool = False,
+    save_method: str = "parquet",
+    chunksize: int | None = None,
+    connections: ConnectionPool | None = None,
+    force: bool = False,
+    resume: str | None = None,
+    profile: bool = False,
+    memory_limit_mb: int | None = None,
+) -> PipelineRun:
+    """Execute the ETL pipeline based on provided configuration.
+    This function orchestrates the Extract, Transform, Load (ETL) pipeline by:
+    1. Loading and validating the pipeline configuration
+    2. Setting up logging
+    3. Extracting and validating input data files
+    4. Transforming data using provided transformation logic
+    5. Loading data to the specified destination
+    Optional behaviour, such as caches, checkpoints and parallel validation, is switched on in the details of the
+    config and described by the module that implements it.
+    Args:
+        config (str): Path to the pipeline configuration file
+        mode (str, optional): Write mode for output data. Defaults to "append"
+        dry_run (bool, optional): If True, runs pipeline without writing data. Defaults to False
+        save_method (str, optional): Method to save output data. Defaults to "parquet"
+        chunksize (int | None, optional): Number of rows per batch in streaming mode, where the first extract file
+            is read, transformed and written batch by batch and the other files are read whole. Defaults to None,
+            which uses the `chunksize` from the config when `streaming = true` and reads whole files otherwise
+        connections (ConnectionPool | None, optional): Pool of open DuckDB and SQLite connections to write with.
+            Defaults to None, which opens and closes a connection for the write
+        force (bool, optional): Run the pipeline even if it is unchanged since its last write. Defaults to False
+        resume (str | None, optional): Id of a failed run to resume from its checkpoints. Defaults to None
+        profile (bool, optional): Profile the transformer and save its hot spots next to the log file. Defaults to
+            False
+        memory_limit_mb (int | None, optional): Memory budget of the run in MB, checked against an estimate before
+            anything is read. Defaults to None, which uses the `memory_limit_mb` from the config, if any
+    Raises:
+        ValueError: If there's an error loading the pipeline configuration, a streaming run is resumed, or a
+            pipeline with several extract files streams with a transformer that is not row-local
+        FileNotFoundError: If there are no checkpoints for the resumed run
+        MemoryBudgetError: If the run is estimated to exceed its memory limit and cannot fall back to streaming,
+            because of memory_fallback = "refuse" or a transformer that is not row-local
+    Returns:
+        PipelineRun: Status of the run, "ok", or "skipped" if it is unchanged since its last write, and the number
+            of rows in the validated output, whether or not it was written
+    Example:
+        >>> run_pipeline(
+        ...     config="pipeline_config.yaml",
+        ...     mode="overwrite",
+        ...     dry_run=True,
+        ...     save_method="csv"
+        ... )
+    """
+
+    metrics = StageRecorder()
+    try:
+        with metrics.stage("config load"):
+            config_dict = load_pipeline_config(path=Path(config))
+    except Exception as e:
+        print(e)
+        raise ValueError("Error trying to import configuration. Check format and try again.")
+
+    timestamp = get_timestamp()
+    log_dir = Path(config_dict.details.project_path).resolve() / "logs"
+    logger = setup_logger(
+        log_file=log_dir / f"log_file__{timestamp}", name="Logger", structured=config_dict.details.structured_logging, run_id=timestamp
+    )
+    if config_dict.details.structured_logging:
+        metrics.logger = logger
+    logger.info("Logging started")
+
+    run = None
+    # pandas options are global to the process; pipelines that run side by side run in separate processes
+    copy_on_write = option_context("mode.copy_on_write", True) if config_dict.details.copy_on_write else nullcontext()
+    try:
+        with copy_on_write:
+            run = _run_pipeline(
+                config=config,
+                config_dict=config_dict,
+                metrics=metrics,
+                logger=logger,
+                profile_file=log_dir / f"profile__{timestamp}",
+                mode=mode,
+                dry_run=dry_run,
+                save_method=save_method,
+                chunksize=chunksize,
+                connections=connections,
+                force=force,
+                resume=resume,
+                profile=profile,
+                memory_limit_mb=memory_limit_mb,
+            )
+        return run
+    finally:
+        # Failed runs report the stages they completed
+        _report_metrics(
+            metrics=metrics,
+            report_file=log_dir / f"metrics__{timestamp}.json",
+            config=config,
+            logger=logger,
+            status="failed" if run is None else run.status,
+        )
+
+
+def _run_pipeline(
+    config: str,
+    config_dict: PipelineConfig,
+    metrics: StageRecorder,
+    logger: Logger,
+    profile_file: Path,
+    mode: str,
+    dry_run: bool,
+    save_method: str,
+    chunksize: int | None,
+    connections: ConnectionPool | None,
+    force: bool,
+    resume: str | None,
+    profile: bool,
+    memory_limit_mb: int | None,
+) -> PipelineRun:
+    """Run a pipeline whose config has been loaded. See `run_pipeline`."""
+
+    if chunksize is None and config_dict.details.streaming:
+        chunksize = config_dict.details.chunksize
+
+    logger.info(f"Pipeline name: {config_dict.details.name}")
+    logger.info(f"Pipeline description: {config_dict.details.description}")
+    logger.info(f"Dry-run mode: {dry_run}")
+    logger.info(f"Copy-on-write mode: {config_dict.details.copy_on_write}")
+    logger.info(f"Streaming mode: {f'{chunksize} rows per batch' if chunksize else False}")
+
+    manifest = None
+    inputs = None
+    if config_dict.details.skip_unchanged and not dry_run:
+        output_table = config_dict.output_table
+        manifest = RunManifest(output_path=output_table.output_path, db=output_table.db)
+        manifest_target = RunManifest.target(config_dict=config_dict, save_method=save_method)
+        inputs = RunManifest.inputs(config_file=config, config_dict=config_dict)
+        fingerprint = RunManifest.fingerprint(config_file=config, config_dict=config_dict, save_method=save_method, inputs=inputs)
+        record = manifest.unchanged(target=manifest_target, fingerprint=fingerprint)
+        output_exists = target_path(output_table.output_path, output_table.db, output_table.table_name, save_method).exists()
+        if record is not None and output_exists and not force:
+            logger.info(f"Inputs, code and config are unchanged since the last write of {record['rows']} rows. Pipeline skipped")
+            return PipelineRun(status="skipped", rows=record["rows"])
+
+    with metrics.stage("schema load: output"):
+        output_schema = load_object_from_file(
+            folder_name=Path(config_dict.output_table.schema_file).parent.resolve(),
+            file_name=config_dict.output_table.schema_file,
+            object_name="schema",
+        )
+
+    transformer_file = Path(config_dict.details.project_path) / (config_dict.details.transformer_pipeline)
+    with metrics.stage("transformer load"):
+        func = load_transformer_function(
+            transformer_file=transformer_file,
+            template_file=Path(DEFAULT_PATHS.get("signature_model")).resolve(),
+        )
+    streaming_transformer = is_streaming_transformer(func)
+
+    partitioning = None if streaming_transformer else transformer_partitioning(func)
+    # Only these transformers give the same output on batches of the first file as on the whole file
+    row_local = streaming_transformer or (partitioning is not None and partitioning.partition_by is None)
+
+    if streaming_transformer and not chunksize:
+        chunksize = config_dict.details.chunksize
+        logger.info(f"Streaming mode: {chunksize} rows per batch, for the streaming transformer")
+
+    if memory_limit_mb is None:
+        memory_limit_mb = config_dict.details.memory_limit_mb
+    if memory_limit_mb is not None:
+        with metrics.stage("memory plan"):
+            plan = _plan_memory(
+                config_dict=config_dict,
+                memory_limit_mb=memory_limit_mb,
+                chunksize=chunksize,
+                streaming_transformer=streaming_transformer,
+                row_local=row_local,
+            )
+        for line in plan.format_table().splitlines():
+            logger.info(line)
+        if not plan.fits:
+            raise MemoryBudgetError(
+                f"Pipeline needs about {plan.peak_bytes / 1024**2:.0f} MB, more than its limit of {memory_limit_mb} MB: {plan.reason}"
+            )
+        if plan.chunksize != chunksize:
+            if config_dict.details.memory_fallback == "refuse" or resume is not None:
+                raise MemoryBudgetError(
+                    f"Pipeline needs about {plan.peak_bytes / 1024**2:.0f} MB with whole files, more than its limit of {memory_limit_mb} MB"
+                )
+            chunksize = plan.chunksize
+            logger.info(f"Streaming mode: {chunksize} rows per batch, to stay within the memory limit")
+
+    if chunksize and not row_local:
+        if len(config_dict.extract_files) > 1:
+            raise ValueError(
+                f"The transformer cannot run on batches of '{config_dict.extract_files[0].label}', because each batch would be "
+                "joined against the whole of the other extract files. Declare ROW_LOCAL = True in the transformer if it "
+                "transforms each row of its first input on its own, or define transform_batches to stream every file."
+            )
+        logger.warning(
+            "The transformer does not declare ROW_LOCAL = True. Each batch is transformed and validated on its own, so rows "
+            "that depend on other rows, such as aggregates and duplicates, and checks such as unique=True only see one batch"
+        )
+
+    if partitioning is not None and config_dict.details.transform_workers != 1:
+        if profile:
+            logger.info(f"Transformer is {partitioning.describe()} but runs in one process to be profiled")
+        elif chunksize:
+            # Starting a pool of workers for every batch costs more than it saves
+            logger.info(f"Transformer is {partitioning.describe()} but runs in one process on each batch")
+        else:
+            func = partial(
+                transform_partitioned,
+                func,
+                partitioning=partitioning,
+                transformer_file=transformer_file,
+                template_file=Path(DEFAULT_PATHS.get("signature_model")).resolve(),
+                output_schema_file=Path(config_dict.output_table.schema_file).resolve(),
+                max_workers=config_dict.details.transform_workers,
+            )
+            logger.info(f"Transformer is {partitioning.describe()} and runs on partitions of its input in worker processes")
+
+    profiler = None
+    if profile:
+        profiler = TransformerProfiler()
+        if not streaming_transformer:
+            # The batches of a streaming transformer are profiled as they are produced
+            func = profiler.wrap(func)
+
+    checkpoints = None
+    runs_dir = Path(config_dict.details.project_path).resolve() / DEFAULT_PATHS["cache_dir"] / "runs"
+    if resume is not None:
+        if chunksize:
+            raise ValueError("Streaming runs are not checkpointed and cannot be resumed.")
+        inputs = inputs or RunManifest.inputs(config_file=config, config_dict=config_dict)
+        checkpoints = RunCheckpoints.resume(runs_dir=runs_dir, run_id=resume, config_file=config, inputs=inputs)
+        logger.info(f"Resuming run {checkpoints.run_id}")
+        if checkpoints.discarded:
+            logger.info(f"Input files changed since the run started. Checkpoints discarded: {', '.join(checkpoints.discarded)}")
+    elif config_dict.details.checkpoints and not chunksize:
+        inputs = inputs or RunManifest.inputs(config_file=config, config_dict=config_dict)
+        checkpoints = RunCheckpoints.create(runs_dir=runs_dir, config_file=config, inputs=inputs)
+        logger.info(f"Checkpoints are saved in {checkpoints.run_dir}. Resume a failed run with --resume {checkpoints.run_id}")
+
+    # Extract
+    detection_cache = None
+    if config_dict.details.detection_cache:
+        detection_cache = DetectionCache(
+            Path(config_dict.details.project_path).resolve() / DEFAULT_PATHS["cache_dir"] / "file_detection.json"
+        )
+
+    extract_cache = None
+    if config_dict.details.extract_cache:
+        extract_cache = ExtractCache(
+            cache_dir=Path(config_dict.details.project_path).resolve() / DEFAULT_PATHS["cache_dir"] / "extracts",
+            max_bytes=config_dict.details.extract_cache_max_mb * 1024**2,
+        )
+
+    validation_cache = None
+    if config_dict.details.validation_cache:
+        validation_cache = ValidationCache(
+            Path(config_dict.details.project_path).resolve() / DEFAULT_PATHS["cache_dir"] / "validation.json"
+        )
+
+    pending_files = list(enumerate(config_dict.extract_files))
+    if checkpoints is not None and (checkpoints.has("transform") or checkpoints.has("output")):
+        # A later stage completed, so the extract files are not needed
+        pending_files = []
+
+    streamed_files = []
+    if chunksize and pending_files:
+        # The first file drives the pipeline and is read batch by batch in the load step, and every batch is passed to
+        # the transformer with the other files read whole. A streaming transformer reads every file batch by batch
+        streamed_count = len(pending_files) if streaming_transformer else 1
+        for file_number, streamed_input in pending_files[:streamed_count]:
+            with metrics.stage(f"schema load: {streamed_input.label}"):
+                streamed_schema, streamed_read_options = _load_extract_schema(extract_file=streamed_input, config_dict=config_dict)
+            logger.info(f"Schema {file_number}: {streamed_input.schema_file} has been loaded")
+            streamed_files.append((streamed_input, streamed_schema, streamed_read_options))
+        pending_files = pending_files[streamed_count:]
+
+    # Files are read and validated concurrently; map() returns them in config order for the transformer
+    extract = partial(
+        _extract_file,
+        config_dict=config_dict,
+        logger=logger,
+        detection_cache=detection_cache,
+        extract_cache=extract_cache,
+        validation_cache=validation_cache,
+        checkpoints=checkpoints,
+        metrics=metrics,
+    )
+    executor = ThreadPoolExecutor(max_workers=config_dict.details.max_workers, thread_name_prefix="extract")
+    try:
+        extract_files = list(executor.map(lambda pending: extract(*pending), pending_files))
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+    # Load
+    logger.info(f"Saving data to disk with method: {save_method}")
+    logger.info(f"Output location: {config_dict.output_table.output_path}")
+    logger.info(f"Database: {config_dict.output_table.db}")
+    logger.info(f"Table name: {config_dict.output_table.table_name}")
+
+    validated_batches = partial(
+        _validated_batches,
+        chunksize=chunksize,
+        config_dict=config_dict,
+        logger=logger,
+        detection_cache=detection_cache,
+        validation_cache=validation_cache,
+        metrics=metrics,
+    )
+    validate_output = partial(
+        _validate,
+        schema=output_schema,
+        schema_file=Path(config_dict.output_table.schema_file),
+        label="output",
+        config_dict=config_dict,
+        logger=logger,
+        validation_cache=validation_cache,
+        # Starting a pool of workers for every batch costs more than it saves
+        max_workers=1 if chunksize else config_dict.details.validation_workers,
+    )
+    write_output = partial(
+        _write_output,
+        config_dict=config_dict,
+        save_method=save_method,
+        connections=connections,
+        metrics=metrics,
+        written_files=None if dry_run else WrittenFiles(_written_path(config_dict=config_dict, save_method=save_method)),
+    )
+
+    if streaming_transformer:
+        inputs = [
+            validated_batches(extract_file=streamed_input, schema=streamed_schema, read_options=streamed_read_options)
+            for streamed_input, streamed_schema, streamed_read_options in streamed_files
+        ]
+        batch_number = -1
+        rows = 0
+        outputs = func(*inputs, output_schema=output_schema)
+        if profiler is not None:
+            outputs = profiler.iterate(outputs)
+        # The transform stage includes the reads and validations of the input batches the transformer pulls
+        for batch_number, transformed_df in enumerate(metrics.iterate("transform", outputs)):
+            with metrics.stage("validate: output", rows_in=len(transformed_df)) as stage:
+                validated_df = validate_output(transformed_df)
+                stage.rows_out = len(validated_df)
+                stage.bytes_copied = bytes_copied(validated_df, sources=[transformed_df])
+            transformed_df = validated_df
+            logger.info(f"Batch {batch_number}: {len(transformed_df)} rows out")
+            rows += len(transformed_df)
+
+            if not dry_run:
+                write_output(df=transformed_df, mode=mode if batch_number == 0 else "append")
+        logger.info(f"The streaming transformer has yielded {batch_number + 1} batches")
+    elif streamed_files:
+        streamed_input, streamed_schema, streamed_read_options = streamed_files[0]
+        other_data = [extract_file.data for extract_file in extract_files]
+        batch_number = -1
+        rows = 0
+        batches = validated_batches(extract_file=streamed_input, schema=streamed_schema, read_options=streamed_read_options)
+        for batch_number, validated_batch in enumerate(batches):
+            with metrics.stage("transform", rows_in=len(validated_batch) + sum(len(data) for data in other_data)) as stage:
+                transformed_df = func(
+                    *_transformer_inputs([validated_batch, *other_data], config_dict=config_dict), output_schema=output_schema
+                )
+                stage.rows_out = len(transformed_df)
+                stage.bytes_copied = bytes_copied(transformed_df, sources=[validated_batch, *other_data])
+            with metrics.stage("validate: output", rows_in=len(transformed_df)) as stage:
+                validated_df = validate_output(transformed_df)
+                stage.rows_out = len(validated_df)
+                stage.bytes_copied = bytes_copied(validated_df, sources=[transformed_df])
+            transformed_df = validated_df
+            logger.info(f"Batch {batch_number}: {len(validated_batch)} rows in, {len(transformed_df)} rows out")
+            rows += len(transformed_df)
+
+            if not dry_run:
+                # Only the first batch honours the requested mode; later batches add to what it wrote
+                write_output(df=transformed_df, mode=mode if batch_number == 0 else "append")
+        logger.info(f"Data '{streamed_input.label}' has been streamed in {batch_number + 1} batches")
+    elif checkpoints is not None and checkpoints.has("output"):
+        transformed_df = checkpoints.load("output")
+        logger.info("Validated output has been loaded from the checkpoint")
+        rows = len(transformed_df)
+
+        if not dry_run:
+            write_output(df=transformed_df, mode=mode)
+    else:
+        if checkpoints is not None and checkpoints.has("transform"):
+            transformed_df = checkpoints.load("transform")
+            logger.info("Transformed data has been loaded from the checkpoint")
+        else:
+            input_data = [extract_file.data for extract_file in extract_files]
+            with metrics.stage("transform", rows_in=sum(len(data) for data in input_data)) as stage:
+                transformed_df = func(*_transformer_inputs(input_data, config_dict=config_dict), output_schema=output_schema)
+                stage.rows_out = len(transformed_df)
+                stage.bytes_copied = bytes_copied(transformed_df, sources=input_data)
+            _save_checkpoint(checkpoints=checkpoints, stage="transform", df=transformed_df, logger=logger)
+
+        with metrics.stage("validate: output", rows_in=len(transformed_df)) as stage:
+            validated_df = validate_output(transformed_df)
+            stage.rows_out = len(validated_df)
+            stage.bytes_copied = bytes_copied(validated_df, sources=[transformed_df])
+        transformed_df = validated_df
+        _save_checkpoint(checkpoints=checkpoints, stage="output", df=transformed_df, logger=logger)
+        rows = len(transformed_df)
+
+        if not dry_run:
+            write_output(df=transformed_df, mode=mode)
+
+    if detection_cache is not None:
+        detection_cache.save()
+    if validation_cache is not None:
+        validation_cache.save()
+
+    if manifest is not None:
+        manifest.record(target=manifest_target, fingerprint=fingerprint, rows=rows, config_file=config)
+
+    if checkpoints is not None:
+        checkpoints.delete()
+        logger.info(f"Checkpoints of run {checkpoints.run_id} have been removed")
+
+    if profiler is not None and profiler.calls:
+        for line in format_hot_spots(profiler.hot_spots(transformer_file)).splitlines():
+            logger.info(line)
+        stats_file, stacks_file = profiler.save(profile_file)
+        logger.info(f"Transformer profile has been saved to {stats_file} and {stacks_file}")
+
+    if dry_run:
+        logger.info("Dry-run selected. No data written.")
+    logger.info("Pipeline execution complete!")
+
+    return PipelineRun(status="ok", rows=rows)
+
+
+def plan_pipeline(config: str, memory_limit_mb: int | None = None, chunksize: int | None = None) -> MemoryPlan:
+    """Estimate the memory a pipeline needs and decide how it reads its extract files, without reading them.
+    Each extract file is measured on its first rows and its row count is taken from its metadata, or estimated
+    from its size for delimited text files. See `data_loader.memory_plan.estimate_extract`. The transformer is
+    loaded to decide whether the run can fall back to streaming.
+    Args:
+        config (str): Path to the pipeline configuration file
+        memory_limit_mb (int | None, optional): Memory budget in MB. Defaults to None, which uses the
+            `memory_limit_mb` from the config, if any
+        chunksize (int | None, optional): Number of rows per batch in streaming mode. Defaults to None, which uses
+            the `chunksize` from the config when `streaming = true` and reads whole files otherwise
+    Returns:
+        MemoryPlan: The estimate of each extract file, the estimated peak and the chunksize the run would use
+    """
+
+    config_dict = load_pipeline_config(path=Path(config))
+    if memory_limit_mb is None:
+        memory_limit_mb = config_dict.details.memory_limit_mb
+    if chunksize is None and config_dict.details.streaming:
+        chunksize = config_dict.details.chunksize
+
+    func = load_transformer_function(
+        transformer_file=Path(config_dict.details.project_path) / config_dict.details.transformer_pipeline,
+        template_file=Path(DEFAULT_PATHS.get("signature_model")).resolve(),
+    )
+    streaming_transformer = is_streaming_transformer(func)
+    if streaming_transformer and not chunksize:
+        chunksize = config_dict.details.chunksize
+    partitioning = None if streaming_transformer else transformer_partitioning(func)
+    return _plan_memory(
+        config_dict=config_dict,
+        memory_limit_mb=memory_limit_mb,
+        chunksize=chunksize,
+        streaming_transformer=streaming_transformer,
+        row_local=streaming_transformer or (partitioning is not None and partitioning.partition_by is None),
+    )
+
+
+def _plan_memory(
+    config_dict: PipelineConfig, memory_limit_mb: int | None, chunksize: int | None, streaming_transformer: bool, row_local: bool
+) -> MemoryPlan:
+    """
+    Estimate the extract files of a pipeline and plan its reads within a memory limit. A streaming transformer streams
+    every file. Other transformers stream the first file, and a run only falls back to streaming if its transformer
+    is row-local, since a transformer that deduplicates or groups rows would give a different output on each batch.
+    """
+    if config_dict.details.memory_fallback not in MEMORY_FALLBACKS:
+        raise ValueError(f"Unknown memory_fallback '{config_dict.details.memory_fallback}'. Expected one of: {', '.join(MEMORY_FALLBACKS)}")
+    extracts = []
+    for extract_file in config_dict.extract_files:
+        schema, read_options = _load_extract_schema(extract_file=extract_file, config_dict=config_dict)
+        extracts.append(
+            estimate_extract(label=extract_file.label, data_file=extract_file.data_file, schema=schema, read_options=read_options)
+        )
+    return plan_memory(
+        extracts,
+        memory_limit_bytes=None if memory_limit_mb is None else memory_limit_mb * 1024**2,
+        chunksize=chunksize,
+        fallback_chunksize=config_dict.details.chunksize,
+        streamed_files=len(extracts) if streaming_transformer else 1,
+        can_stream=row_local,
+    )
+
+
+def _validated_batches(
+    extract_file: InputFile,
+    schema: DataFrameSchema,
+    read_options: dict,
+    chunksize: int,
+    config_dict: PipelineConfig,
+    logger: Logger,
+    detection_cache: DetectionCache | None,
+    validation_cache: ValidationCache | None,
+    metrics: StageRecorder,
+) -> Iterator[DataFrame]:
+    """
+    Read a streamed extract file batch by batch and yield each batch once it passes its schema, validated with the
+    configured engine and validation cache like a whole file, but in the current process.
+    """
+    batches = read_input_batches(path=extract_file.data_file, chunksize=chunksize, detection_cache=detection_cache, **read_options)
+    batches = metrics.iterate(f"read: {extract_file.label}", batches, bytes_read=path_size(extract_file.data_file))
+    for batch in batches:
+        with metrics.stage(f"validate: {extract_file.label}", rows_in=len(batch)) as stage:
+            validated_batch = _validate(
+                df=batch,
+                schema=schema,
+                schema_file=Path(config_dict.details.project_path).resolve() / extract_file.schema_file,
+                label=extract_file.label,
+                config_dict=config_dict,
+                logger=logger,
+                validation_cache=validation_cache,
+                max_workers=1,
+            )
+            stage.rows_out = len(validated_batch)
+            stage.bytes_copied = bytes_copied(validated_batch, sources=[batch])
+        yield validated_batch
+
+
+def _load_extract_schema(extract_file: InputFile, config_dict: PipelineConfig) -> tuple[DataFrameSchema, dict]:
+    """Load the schema of an extract file and build the reader options that parse the file into its types."""
+    schema = load_object_from_file(
+        folder_name=Path(config_dict.details.project_path).resolve(), file_name=extract_file.schema_file, object_name="schema"
+    )
+
+    # Parse the file straight into the types the schema declares
+    read_options = {"engine": extract_file.engine or config_dict.details.engine}
+    if config_dict.details.schema_pushdown:
+        read_options.update(schema_read_options(schema, prune_unknown_columns=extract_file.prune_unknown_columns))
+
+    return schema, read_options
+
+
+def _extract_file(
+    file_number: int,
+    extract_file: InputFile,
+    config_dict: PipelineConfig,
+    logger: Logger,
+    detection_cache: DetectionCache | None,
+    extract_cache: ExtractCache | None,
+    validation_cache: ValidationCache | None,
+    checkpoints: RunCheckpoints | None,
+    metrics: StageRecorder,
+) -> ExtractPipelineData:
+    """
+    Read and validate one extract file, or load it from the checkpoints of a resumed run or the extract cache.
+    Safe to run in worker threads.
+    """
+    with metrics.stage(f"schema load: {extract_file.label}"):
+        schema, read_options = _load_extract_schema(extract_file=extract_file, config_dict=config_dict)
+    logger.info(f"Schema {file_number}: {extract_file.schema_file} has been loaded")
+
+    if checkpoints is not None and checkpoints.has(f"extract_{file_number}"):
+        logger.info(f"Data '{extract_file.label}' has been loaded from the checkpoint")
+        return ExtractPipelineData(label=extract_file.label, schema=schema, data=checkpoints.load(f"extract_{file_number}"))
+
+    cache_key = None
+    if extract_cache is not None:
+        cache_key = extract_cache.key(
+            data_file=extract_file.data_file,
+            schema_file=Path(config_dict.details.project_path).resolve() / extract_file.schema_file,
+            read_options=read_options,
+        )
+        validated_data = extract_cache.get(cache_key)
+        if validated_data is not None:
+            logger.info(f"Data '{extract_file.label}' has been loaded from the extract cache")
+            return ExtractPipelineData(label=extract_file.label, schema=schema, data=validated_data)
+
+    with metrics.stage(f"read: {extract_file.label}", bytes_read=path_size(extract_file.data_file)) as stage:
+        data = read_input_data(path=extract_file.data_file, detection_cache=detection_cache, **read_options)
+        stage.rows_out = len(data)
+    logger.info(f"File {file_number}: {extract_file.data_file} has been loaded with engine '{read_options['engine']}'")
+
+    with metrics.stage(f"validate: {extract_file.label}", rows_in=len(data)) as stage:
+        validated_data = _validate(
+            df=data,
+            schema=schema,
+            schema_file=Path(config_dict.details.project_path).resolve() / extract_file.schema_file,
+            label=extract_file.label,
+            config_dict=config_dict,
+            logger=logger,
+            validation_cache=validation_cache,
+            max_workers=config_dict.details.validation_workers,
+        )
+        stage.rows_out = len(validated_data)
+        stage.bytes_copied = bytes_copied(validated_data, sources=[data])
+    logger.info(f"Data '{extract_file.label}' has been validated")
+
+    if extract_cache is not None and not extract_cache.put(cache_key, validated_data):
+        logger.info(f"Data '{extract_file.label}' cannot be stored as Arrow and was not cached")
+    _save_checkpoint(checkpoints=checkpoints, stage=f"extract_{file_number}", df=validated_data, logger=logger)
+
+    return ExtractPipelineData(label=extract_file.label, schema=schema, data=validated_data)
+
+
+def _validate(
+    df: DataFrame,
+    schema: DataFrameSchema,
+    schema_file: Path,
+    label: str,
+    config_dict: PipelineConfig,
+    logger: Logger,
+    validation_cache: ValidationCache | None,
+    max_workers: int | None,
+) -> DataFrame:
+    """
+    Validate a dataframe with the configured engine, unless the validation cache has seen the same frame pass. Engines
+    that validate in worker processes use at most `max_workers`.
+    """
+    cache_key = None
+    if validation_cache is not None and is_cacheable(schema, df):
+        try:
+            cache_key = validation_cache.key(df=df, schema_file=schema_file)
+        except TypeError as e:
+            logger.info(f"Data '{label}' holds unhashable values and is validated without the validation cache: {e}")
+    if cache_key is not None:
+        if validation_cache.contains(cache_key):
+            logger.info(f"Validation cache hit for '{label}': checks skipped")
+            return validation_cache.coerce(df, schema)
+        logger.info(f"Validation cache miss for '{label}'")
+
+    validated = validate_dataframe(
+        df=df,
+        schema=schema,
+        schema_file=schema_file,
+        engine=config_dict.details.validation_engine,
+        max_workers=max_workers,
+    )
+
+    if cache_key is not None:
+        validation_cache.record(cache_key)
+    return validated
+
+
+def _transformer_inputs(dfs: list[DataFrame], config_dict: PipelineConfig) -> list[DataFrame]:
+    """
+    Return the frames to pass to the transformer. In copy-on-write mode each frame is a lazy copy, which shares the
+    memory of the pipeline's frame until the transformer modifies it, so the pipeline's frames cannot be changed.
+    """
+    if not config_dict.details.copy_on_write:
+        return dfs
+    return [df.copy(deep=False) for df in dfs]
+
+
+def _save_checkpoint(checkpoints: RunCheckpoints | None, stage: str, df: DataFrame, logger: Logger) -> None:
+    """Save the output of a completed stage if the run is checkpointed."""
+    if checkpoints is not None and not checkpoints.save(stage, df):
+        logger.info(f"Stage '{stage}' cannot be stored as Arrow and was not checkpointed")
+
+
+def _write_output(
+    df: DataFrame,
+    config_dict: PipelineConfig,
+    save_method: str,
+    mode: str,
+    connections: ConnectionPool | None,
+    metrics: StageRecorder,
+    written_files: WrittenFiles,
+) -> None:
+    """Write a transformed dataframe to the output table of the pipeline, labelled with its data label."""
+    output_table = config_dict.output_table
+    with metrics.stage("write", rows_in=len(df)) as stage:
+        # The writer adds the label column itself, so the output is not copied to label it
+        DataFrameWriter(
+            df=df,
+            output_path=Path(output_table.output_path).resolve(),
+            write_method=save_method,
+            table_name=output_table.table_name,
+            db=output_table.db,
+            mode=mode,
+            static_partitions={"data_label": output_table.data_label},
+            connections=connections,
+        ).write()
+        stage.bytes_written = written_files.bytes_written()
+
+
+def _written_path(config_dict: PipelineConfig, save_method: str) -> Path:
+    """Return the file or folder the output of the pipeline is written to: the folder of its data label for Parquet."""
+    output_table = config_dict.output_table
+    target = target_path(output_table.output_path, output_table.db, output_table.table_name, save_method)
+    if save_method == "parquet":
+        return static_partition_path(target, {"data_label": output_table.data_label})
+    return target
+
+
+def _report_metrics(metrics: StageRecorder, report_file: Path, config: str, logger: Logger, status: str) -> None:
+    """Log the stage metrics of a run as a table and save them as JSON next to the log file."""
+    for line in metrics.format_table().splitlines():
+        logger.info(line)
+    metrics.write_report(report_file, config=str(Path(config).resolve()), status=status)
+    logger.info(f"Stage metrics have been saved to {report_file}")
+    flush_logger(logger)
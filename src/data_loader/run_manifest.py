@@ -0,0 +1,107 @@
+from data_loader.extract_cache import hash_file
+from data_loader.models.pipeline_config_model import PipelineConfig
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+
+def target_path(output_path: Path | str, db: str, table_name: str, save_method: str) -> Path:
+    """Return the file or folder the writer of `save_method` writes an output table to."""
+    output_path = Path(output_path)
+    if save_method in ("duckdb", "sqlite"):
+        return output_path / f"{db}.{save_method}"
+    if save_method in ("csv", "tsv"):
+        return output_path / db / f"{table_name}.{save_method}"
+    return output_path / db / table_name
+
+
+class RunManifest:
+    """
+    Record of the last successful write of each pipeline output, stored next to the output.
+
+    A record holds a fingerprint of everything the output was made from: the content of the data files, the schema
+    files, the transformer, the output schema and the TOML config, and the target it was written to. A pipeline whose
+    fingerprint matches the record of its target would write the same data again, so it can be skipped. Modules that
+    the transformer imports are not part of the fingerprint. There is one manifest file per output folder and
+    database, so pipelines that write to other databases never update the same file.
+    """
+
+    def __init__(self, output_path: Path | str, db: str):
+        self.manifest_file: Path = Path(output_path) / ".data_loader_cache" / f"manifest__{db}.json"
+
+    def _load(self) -> dict:
+        try:
+            return json.loads(self.manifest_file.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def target(config_dict: PipelineConfig, save_method: str) -> str:
+        """Identify the data a pipeline writes: the table, its location and its data label."""
+        output_table = config_dict.output_table
+        return json.dumps(
+            [save_method, str(Path(output_table.output_path).resolve()), output_table.db, output_table.table_name, output_table.data_label]
+        )
+
+    @staticmethod
+    def inputs(config_file: Path | str, config_dict: PipelineConfig) -> dict:
+        """
+        Hash the content of every file a pipeline run reads.
+
+        :param config_file: Path to the TOML config of the pipeline
+        :type config_file: Path | str
+        :param config_dict: The loaded config
+        :type config_dict: PipelineConfig
+        :return: Hashes of the config, of the data and schema file of each extract file, of the transformer and of the
+            output schema
+        :rtype: dict
+        """
+        project_path = Path(config_dict.details.project_path).resolve()
+        return {
+            "config": hash_file(config_file),
+            "data_files": [hash_file(extract_file.data_file) for extract_file in config_dict.extract_files],
+            "schema_files": [hash_file(project_path / extract_file.schema_file) for extract_file in config_dict.extract_files],
+            "transformer": hash_file(Path(config_dict.details.project_path) / config_dict.details.transformer_pipeline),
+            "output_schema": hash_file(config_dict.output_table.schema_file),
+        }
+
+    @staticmethod
+    def fingerprint(config_file: Path | str, config_dict: PipelineConfig, save_method: str, inputs: dict | None = None) -> str:
+        """
+        Build the fingerprint of a pipeline run from the content of every file it reads and the target it writes to.
+
+        :param config_file: Path to the TOML config of the pipeline
+        :type config_file: Path | str
+        :param config_dict: The loaded config
+        :type config_dict: PipelineConfig
+        :param save_method: Method the output is saved with
+        :type save_method: str
+        :param inputs: Hashes of the files the run reads, from `inputs`. They are computed if not given
+        :type inputs: dict | None
+        :return: Hex digest of the inputs, code and config of the run
+        :rtype: str
+        """
+        if inputs is None:
+            inputs = RunManifest.inputs(config_file=config_file, config_dict=config_dict)
+        parts = {**inputs, "target": RunManifest.target(config_dict, save_method)}
+        return hashlib.blake2b(json.dumps(parts, sort_keys=True).encode(), digest_size=20).hexdigest()
+
+    def unchanged(self, target: str, fingerprint: str) -> dict | None:
+        """Return the record of the last write to a target if it was made with the same fingerprint, or None."""
+        record = self._load().get(target)
+        if record is None or record["fingerprint"] != fingerprint:
+            return None
+        return record
+
+    def record(self, target: str, fingerprint: str, rows: int, config_file: Path | str) -> None:
+        """Record a successful write to a target, replacing its previous record."""
+        entries = self._load()
+        entries[target] = {"fingerprint": fingerprint, "rows": rows, "config": str(config_file), "written_at": time.time()}
+
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.manifest_file.with_name(f"{self.manifest_file.name}.{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(entries))
+        os.replace(tmp_file, self.manifest_file)
@@ -0,0 +1,148 @@
+from data_loader.batch_runner import PipelineRunResult, find_configs, run_group, writer_target
+from data_loader.pipeline_config_io import load_pipeline_config
+
+import graphlib
+import multiprocessing
+import toml
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+
+
+def build_dag(configs: list[Path]) -> dict[Path, set[Path]]:
+    """
+    Map every pipeline configuration to the configurations it depends on
+
+    An extract file depends on another pipeline when its `depends_on` key holds the `name` from the details of that
+    pipeline. Its `data_file` should point at the output the other pipeline writes, such as the Parquet folder
+    `<output_path>/<db>/<table_name>`.
+
+    A configuration that cannot be loaded depends on nothing, so it runs and reports its error like any other
+    pipeline, and the pipelines that depend on it are skipped. They find it by the `name` in its details, or, if the
+    file is not valid TOML, depend on every such file.
+
+    :param configs: Paths to the TOML configuration files
+    :type configs: list[Path]
+    :return: The configurations each configuration depends on
+    :rtype: dict[Path, set[Path]]
+    :raises ValueError: If two configurations share a pipeline name, or an extract file depends on an unknown pipeline
+    """
+    loaded = {}
+    names = {}
+    for config in configs:
+        try:
+            loaded[config] = load_pipeline_config(path=config)
+            names[config] = loaded[config].details.name
+        except Exception:
+            names[config] = _pipeline_name(config)
+    unnamed = {config for config, name in names.items() if name is None}
+
+    configs_by_name: dict[str, Path] = {}
+    for config, name in names.items():
+        if name is None:
+            continue
+        if name in configs_by_name:
+            raise ValueError(f"Pipeline name '{name}' is used by both {configs_by_name[name]} and {config}")
+        configs_by_name[name] = config
+
+    dag = {config: set() for config in configs}
+    for config, config_dict in loaded.items():
+        for extract_file in config_dict.extract_files:
+            if extract_file.depends_on is None:
+                continue
+            if extract_file.depends_on in configs_by_name:
+                dag[config].add(configs_by_name[extract_file.depends_on])
+            elif unnamed:
+                # The pipeline may be one of the files that could not be read
+                dag[config].update(unnamed)
+            else:
+                raise ValueError(f"Extract file '{extract_file.label}' in {config} depends on unknown pipeline '{extract_file.depends_on}'")
+    return dag
+
+
+def _pipeline_name(config: Path) -> str | None:
+    """Return the pipeline name of a configuration that cannot be loaded, or None if it has none or is not valid TOML."""
+    try:
+        return toml.load(config)["details"]["name"]
+    except Exception:
+        return None
+
+
+def _executor(workers: int) -> Executor:
+    """Return a pool of worker processes, or a single thread that runs pipelines one at a time in this process."""
+    if workers <= 1:
+        return ThreadPoolExecutor(max_workers=1)
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def run_dag(
+    config_dir: Path | str,
+    workers: int = 1,
+    mode: str = "append",
+    dry_run: bool = False,
+    save_method: str = "parquet",
+    force: bool = False,
+) -> list[PipelineRunResult]:
+    """
+    Run every pipeline configuration in a directory in dependency order, on a pool of worker processes
+
+    A pipeline starts as soon as every pipeline it depends on has finished, so independent branches of the graph run
+    at the same time. Pipelines that write to the same output folder and database never run at the same time,
+    because a DuckDB file can only be opened by one process. When a pipeline fails, the pipelines that depend on it,
+    directly or not, are skipped and the rest of the graph still runs.
+
+    :param config_dir: Directory holding the TOML configuration files
+    :type config_dir: Path | str
+    :param workers: Number of worker processes. With one worker the pipelines run one at a time in this process
+    :type workers: int
+    :param mode: Write mode for the output of every pipeline
+    :type mode: str
+    :param dry_run: Run validation and transformation only, skip loading
+    :type dry_run: bool
+    :param save_method: Method to save the output of every pipeline
+    :type save_method: str
+    :param force: Run pipelines even if they are unchanged since their last write
+    :type force: bool
+    :return: The result of every pipeline, in the order of the configuration files
+    :rtype: list[PipelineRunResult]
+    :raises graphlib.CycleError: If the dependencies form a cycle
+    """
+    configs = find_configs(config_dir)
+    dag = build_dag(configs)
+    sorter = graphlib.TopologicalSorter(dag)
+    sorter.prepare()
+
+    targets = {config: writer_target(config, save_method) for config in configs}
+    options = {"mode": mode, "dry_run": dry_run, "save_method": save_method, "force": force}
+    results: dict[Path, PipelineRunResult] = {}
+    ready: list[Path] = []
+    running: dict[Future, Path] = {}
+
+    with _executor(workers) as executor:
+        while sorter.is_active():
+            ready.extend(sorter.get_ready())
+            busy = {targets[config] for config in running.values()}
+            for config in list(ready):
+                if targets[config] not in busy:
+                    ready.remove(config)
+                    busy.add(targets[config])
+                    running[executor.submit(run_group, [config], **options)] = config
+
+            # Nothing left to run: the remaining pipelines depend on one that failed
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                config = running.pop(future)
+                [results[config]] = future.result()
+                if results[config].succeeded:
+                    sorter.done(config)
+
+    for config in graphlib.TopologicalSorter(dag).static_order():
+        if config not in results:
+            upstream = sorted(Path(dependency).name for dependency in dag[config] if not results[dependency].succeeded)
+            results[config] = PipelineRunResult(
+                config=str(config), status="skipped", error=f"Upstream pipeline did not succeed: {', '.join(upstream)}"
+            )
+
+    return [results[config] for config in configs]
@@ -0,0 +1,60 @@
+from pandera.pandas import DataFrameSchema, Column
+from typing import Any
+
+
+def column_read_dtype(column: Column, coerce: bool) -> Any | None:
+    """
+    Return the dtype a reader should parse a schema column into, or None to leave it to type inference.
+    Only columns that pandera would coerce are pushed down, so validation returns the same types either way.
+    Text columns are read as `str`. Integer, float and boolean columns are read as their numpy dtype, except
+    integer columns that allow nulls, which cannot be held by a numpy integer dtype. Dates, categories and
+    other types are left to pandera.
+
+    Args:
+        column (Column): The pandera column definition.
+        coerce (bool): Whether the schema coerces all of its columns.
+
+    Returns:
+        Any | None: `str`, a numpy dtype, or None if the column should be inferred by the reader.
+    """
+
+    if column.regex or not (coerce or column.coerce) or column.dtype is None:
+        return None
+
+    if str(column.dtype) == "str":
+        return str
+
+    numpy_dtype = getattr(column.dtype, "type", None)
+    kind = getattr(numpy_dtype, "kind", None)
+    if kind in ("f", "b") or (kind in ("i", "u") and not column.nullable):
+        return numpy_dtype
+
+    return None
+
+
+def schema_read_options(schema: DataFrameSchema, prune_unknown_columns: bool = False) -> dict:
+    """Build reader arguments that parse a file straight into the types declared by a pandera schema.
+    The returned `dtype` maps each declared column to the type it will be coerced to on validation, so that
+    `schema.validate` does not have to convert the column a second time. When `prune_unknown_columns` is set
+    and the schema does not reject unknown columns (`strict=False` or `strict="filter"`), `usecols` lists the
+    declared columns and every other column in the file is skipped by the reader.
+    Args:
+        schema (DataFrameSchema): The input schema the data will be validated against.
+        prune_unknown_columns (bool, optional): Skip columns the schema does not declare. Defaults to False.
+    Returns:
+        dict: Keyword arguments `usecols` (list[str] | None) and `dtype` (dict) for `read_input_data`.
+    Example:
+        >>> schema_read_options(schema, prune_unknown_columns=True)
+        {'usecols': ['person_id', 'zip_code'], 'dtype': {'person_id': <class 'str'>, 'zip_code': <class 'str'>}}
+    """
+
+    dtype: dict = {}
+    for name, column in schema.columns.items():
+        read_dtype = column_read_dtype(column, coerce=schema.coerce)
+        if read_dtype is not None:
+            dtype[name] = read_dtype
+
+    prune = prune_unknown_columns and schema.strict is not True and not any(column.regex for column in schema.columns.values())
+    usecols = list(schema.columns.keys()) if prune else None
+
+    return {"usecols": usecols, "dtype": dtype}
@@ -0,0 +1,263 @@
+import bisect
+import json
+import logging
+import sys
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+
+import numpy as np
+from pandas import DataFrame
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+@dataclass
+class StageMetrics:
+    stage: str
+    calls: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_delta_bytes: int | None = None
+    rows_in: int | None = None
+    rows_out: int | None = None
+    bytes_read: int | None = None
+    bytes_written: int | None = None
+    bytes_copied: int | None = None
+
+    def add(self, other: "StageMetrics") -> None:
+        """Add the measurements of another call of the same stage."""
+        for field in fields(self):
+            if field.name == "stage":
+                continue
+            value, other_value = getattr(self, field.name), getattr(other, field.name)
+            if other_value is not None:
+                setattr(self, field.name, other_value if value is None else value + other_value)
+
+
+def peak_rss() -> int | None:
+    """Return the peak resident set size of the process in bytes, or None where the `resource` module is missing."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes and macOS bytes
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def path_size(path: Path | str) -> int:
+    """Return the size of a file, or the total size of the files in a folder. A missing path has a size of 0."""
+    path = Path(path)
+    if path.is_dir():
+        return sum(file_path.stat().st_size for file_path in path.rglob("*") if file_path.is_file())
+    return path.stat().st_size if path.exists() else 0
+
+
+def snapshot_files(path: Path | str) -> dict[Path, tuple[int, int]]:
+    """Return the size and modification time of a file, or of every file in a folder."""
+    path = Path(path)
+    file_paths = [file_path for file_path in path.rglob("*") if file_path.is_file()] if path.is_dir() else [path]
+    snapshot = {}
+    for file_path in file_paths:
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            continue
+        snapshot[file_path] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+class WrittenFiles:
+    """
+    The files at the path an output is written to, to measure the bytes each write creates or modifies. The path is
+    scanned when the tracker is created and after each write, so a run that writes many batches scans it once per
+    batch.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path: Path = Path(path)
+        self.snapshot: dict[Path, tuple[int, int]] = snapshot_files(self.path)
+
+    def bytes_written(self) -> int:
+        """
+        Return the size of the files at the path created or modified since the previous call, or since the tracker
+        was created. A database file counts in full when it changes.
+        """
+        snapshot = snapshot_files(self.path)
+        written = sum(size for file_path, (size, mtime) in snapshot.items() if self.snapshot.get(file_path) != (size, mtime))
+        self.snapshot = snapshot
+        return written
+
+
+def frame_buffers(df: DataFrame) -> list[tuple[int, int]]:
+    """
+    Return the address and size of the memory blocks that hold the values of each column of a DataFrame.
+
+    NumPy-backed columns report their array, nullable columns their values and mask, and Arrow-backed columns the
+    buffers of their chunks. Object columns report their array of pointers, not the Python objects it points to.
+    """
+    buffers = []
+    for _, column in df.items():
+        values = column.array
+        if hasattr(values, "_pa_array"):
+            for chunk in values._pa_array.chunks:
+                buffers.extend((buffer.address, buffer.size) for buffer in chunk.buffers() if buffer is not None and buffer.size)
+            continue
+        for name in ("_ndarray", "_data", "_mask"):
+            array = getattr(values, name, None)
+            if isinstance(array, np.ndarray) and array.nbytes:
+                buffers.append((array.__array_interface__["data"][0], array.nbytes))
+    return buffers
+
+
+def bytes_copied(df: DataFrame, sources: Iterable[DataFrame]) -> int:
+    """
+    Return the bytes of the columns of a DataFrame held in memory that it does not share with any source frame.
+
+    Columns that are views of a source, such as the unchanged columns of a frame under copy-on-write, count for
+    nothing. Columns that were copied or computed count in full.
+
+    :param df: Output of a stage
+    :type df: DataFrame
+    :param sources: Inputs of the stage
+    :type sources: Iterable[DataFrame]
+    :return: Number of bytes of new memory the output holds. Objects other than DataFrames count for 0
+    :rtype: int
+    """
+    if not isinstance(df, DataFrame):
+        return 0
+    # Merge the memory of the sources into sorted, disjoint ranges
+    shared: list[list[int]] = []
+    for start, size in sorted(buffer for source in sources if isinstance(source, DataFrame) for buffer in frame_buffers(source)):
+        if shared and start <= shared[-1][1]:
+            shared[-1][1] = max(shared[-1][1], start + size)
+        else:
+            shared.append([start, start + size])
+    starts = [start for start, _ in shared]
+
+    copied = 0
+    for start, size in frame_buffers(df):
+        index = bisect.bisect_right(starts, start + size - 1) - 1
+        if index < 0 or shared[index][1] <= start:
+            copied += size
+    return copied
+
+
+class StageRecorder:
+    """
+    Wall time, CPU time, peak memory growth, rows and bytes of the stages of a pipeline run.
+
+    Calls of a stage with the same name are added up, so a streamed file reports one read stage covering every
+    batch. CPU time and peak memory are measured for the whole process: stages that run at the same time on the
+    extract threads are each charged for the work of the others while they overlap.
+
+    With a `logger`, every call of a stage is also logged as it completes, with its stage, rows and duration as
+    structured fields of the record.
+    """
+
+    def __init__(self, logger: logging.Logger | None = None):
+        self.stages: dict[str, StageMetrics] = {}
+        self.logger = logger
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int | None = None, bytes_read: int | None = None) -> Iterator[StageMetrics]:
+        """
+        Measure a block of code as one call of a stage. The block can set the rows and bytes of the yielded metrics.
+
+        :param name: Name of the stage
+        :type name: str
+        :param rows_in: Number of rows the stage receives
+        :type rows_in: int | None
+        :param bytes_read: Number of bytes the stage reads from disk
+        :type bytes_read: int | None
+        :return: The metrics of this call, recorded when the block exits, even if it raises
+        :rtype: Iterator[StageMetrics]
+        """
+        metrics = StageMetrics(stage=name, calls=1, rows_in=rows_in, bytes_read=bytes_read)
+        rss_start = peak_rss()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield metrics
+        finally:
+            metrics.wall_seconds = time.perf_counter() - wall_start
+            metrics.cpu_seconds = time.process_time() - cpu_start
+            if rss_start is not None:
+                metrics.peak_rss_delta_bytes = peak_rss() - rss_start
+            with self._lock:
+                if name in self.stages:
+                    self.stages[name].add(metrics)
+                else:
+                    self.stages[name] = metrics
+            if self.logger is not None and metrics.calls:
+                rows = metrics.rows_out if metrics.rows_out is not None else metrics.rows_in
+                self.logger.info(
+                    f"Stage '{name}' completed in {metrics.wall_seconds:.3f}s",
+                    extra={"stage": name, "rows": rows, "duration": round(metrics.wall_seconds, 6)},
+                )
+
+    def iterate(self, name: str, batches: Iterable, bytes_read: int | None = None) -> Iterator:
+        """
+        Yield the batches of an iterable, measuring the production of each one as a call of a stage.
+
+        :param name: Name of the stage
+        :type name: str
+        :param batches: Batches to yield, such as the batches of a streamed file
+        :type batches: Iterable
+        :param bytes_read: Number of bytes read from disk to produce all the batches
+        :type bytes_read: int | None
+        :return: The batches
+        :rtype: Iterator
+        """
+        iterator = iter(batches)
+        while True:
+            with self.stage(name, bytes_read=bytes_read) as metrics:
+                bytes_read = None
+                try:
+                    batch = next(iterator)
+                except StopIteration:
+                    # The time spent finding the end of the data counts, but not as a call
+                    metrics.calls = 0
+                    return
+                metrics.rows_out = len(batch)
+            yield batch
+
+    def report(self, **info) -> dict:
+        """Return the metrics of every stage, in the order the stages first started, with extra run information."""
+        with self._lock:
+            stages = [asdict(metrics) for metrics in self.stages.values()]
+        return {**info, "stages": stages}
+
+    def write_report(self, path: Path | str, **info) -> None:
+        """Write the metrics of every stage, with extra run information, to a JSON file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(**info), indent=2))
+
+    def format_table(self) -> str:
+        """Format the metrics as a table with one line per stage."""
+        with self._lock:
+            stages = list(self.stages.values())
+
+        def optional(value: int | None, scale: int = 1) -> str:
+            return "-" if value is None else f"{value / scale:.1f}" if scale > 1 else str(value)
+
+        width = max([len(metrics.stage) for metrics in stages] + [len("Stage")])
+        lines = [
+            f"{'Stage':<{width}}  {'Calls':>5}  {'Wall s':>8}  {'CPU s':>8}  {'Peak RSS +MB':>12}"
+            f"  {'Rows in':>10}  {'Rows out':>10}  {'MB read':>9}  {'MB written':>10}  {'MB copied':>9}"
+        ]
+        for metrics in stages:
+            lines.append(
+                f"{metrics.stage:<{width}}  {metrics.calls:>5}  {metrics.wall_seconds:>8.3f}  {metrics.cpu_seconds:>8.3f}"
+                f"  {optional(metrics.peak_rss_delta_bytes, 1024**2):>12}  {optional(metrics.rows_in):>10}"
+                f"  {optional(metrics.rows_out):>10}  {optional(metrics.bytes_read, 1024**2):>9}"
+                f"  {optional(metrics.bytes_written, 1024**2):>10}  {optional(metrics.bytes_copied, 1024**2):>9}"
+            )
+        return "\n".join(lines)
@@ -2,7 +2,7 @@ from data_loader.object_loader import load_object_from_file
 from pathlib import Path
 from inspect import Signature, Parameter, signature
 from pandas import DataFrame
-from typing import Any, Callable
+from typing import Any, Callable, Dict
 
 
 class ParameterMismatchError(Exception):
@@ -17,6 +17,39 @@ class ReturnAnnotationMismatchError(Exception):
     pass
 
 
+class TransformerSignatureRegistry:
+    """
+    Registry of the function names a transformer file may define, in the order they are looked up. Each name is
+    checked against the function of the same name in the signature template. Streaming transformers receive one
+    iterator of DataFrames per extract file and yield the output in batches.
+    """
+
+    _signatures: Dict[str, bool] = {}
+
+    @classmethod
+    def register(cls, name: str, streaming: bool = False) -> None:
+        """Register a transformer function name, and whether it is called with iterators of batches."""
+        cls._signatures[name] = streaming
+
+    @classmethod
+    def is_streaming(cls, name: str) -> bool:
+        """Return True if transformer functions with this name are called with iterators of batches."""
+        return cls._signatures.get(name, False)
+
+    @classmethod
+    def available_signatures(cls):
+        return list(cls._signatures.keys())
+
+
+TransformerSignatureRegistry.register("transform")
+TransformerSignatureRegistry.register("transform_batches", streaming=True)
+
+
+def is_streaming_transformer(func: Callable) -> bool:
+    """Return True if a loaded transformer function takes iterators of batches and yields its output in batches."""
+    return TransformerSignatureRegistry.is_streaming(getattr(func, "__name__", ""))
+
+
 def get_signature(obj: Any) -> Signature:
     """
     Retrieves the signature of a callable object.
@@ -94,14 +127,16 @@ def compare_signatures(test_signature: Signature, template_signature: Signature)
 def load_transformer_function(transformer_file: Path, template_file: Path) -> Callable:
     """Load and validate a transformer function from a file against a template.
     This function loads a transformer function from a specified file and validates its signature
-    against a template function signature. Both functions must be named 'transform'.
+    against the template function of the same name. The names registered in the TransformerSignatureRegistry are
+    looked up in order: a file defining `transform` takes whole DataFrames and returns one, and a file defining
+    `transform_batches` takes an iterator of batches per extract file and yields its output in batches.
     Args:
         transformer_file (Path): Path to the file containing the transformer function.
-        template_file (Path): Path to the file containing the template function.
+        template_file (Path): Path to the file containing the template functions.
     Returns:
         Callable: The loaded transformer function if signature validation passes.
     Raises:
-        ValueError: If either the template or transformer function cannot be loaded.
+        ValueError: If the template or transformer function cannot be loaded, or the file defines none of the names.
         ParameterMismatchError: If the transformer function's signature doesn't match the template.
     Example:
         >>> transformer = load_transformer_function(
@@ -111,20 +146,27 @@ def load_transformer_function(transformer_file: Path, template_file: Path) -> Ca
         >>> result = transformer(data)
     """
 
+    for name in TransformerSignatureRegistry.available_signatures():
+        try:
+            transformer_function = load_object_from_file(
+                folder_name=transformer_file.parent, file_name=transformer_file.name, object_name=name
+            )
+        except AttributeError:
+            continue
+        except ValueError:
+            raise ValueError("Unable to load the transformer function. Check the file and try again.")
+        break
+    else:
+        names = ", ".join(TransformerSignatureRegistry.available_signatures())
+        raise ValueError(f"Unable to load the transformer function. The file defines none of: {names}")
+
     try:
         template_signature = get_signature(
-            obj=load_object_from_file(folder_name=template_file.parent, file_name=template_file.name, object_name="transform")
+            obj=load_object_from_file(folder_name=template_file.parent, file_name=template_file.name, object_name=name)
         )
-    except ValueError:
+    except (ValueError, AttributeError):
         raise ValueError("Unable to load the signature template. Check the file and try again.")
 
-    try:
-        transformer_function = load_object_from_file(
-            folder_name=transformer_file.parent, file_name=transformer_file.name, object_name="transform"
-        )
-    except ValueError:
-        raise ValueError("Unable to load the transformer function. Check the file and try again.")
-
     transformer_signature = get_signature(transformer_function)
 
     if compare_signatures(test_signature=transformer_signature, template_signature=template_signature):
@@ -0,0 +1,150 @@
+import cProfile
+import functools
+import pstats
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from types import FrameType
+
+
+class TransformerProfiler:
+    """
+    Profile calls of a transformer function with cProfile and a CPU time sampler.
+
+    cProfile counts every call and its own and cumulative time, which `hot_spots` narrows down to the functions and
+    lambdas defined in the transformer file. The sampler records the call stack every `interval` seconds of CPU time
+    as a collapsed stack, the input format of flamegraph.pl, speedscope and similar viewers, weighted by the
+    microseconds of CPU time since the previous sample. Several calls, such as the batches of a streaming run, add up
+    in the same profile.
+
+    The sampler runs on a SIGPROF timer rather than a thread, because cProfile records the calls of every thread. It
+    only runs where Python handles signals: on the main thread of platforms with `signal.setitimer`. Elsewhere the
+    collapsed stacks are empty.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.profile = cProfile.Profile()
+        self.stacks: Counter[str] = Counter()
+        self.calls = 0
+
+    @contextmanager
+    def running(self, root: FrameType | None = None) -> Iterator[None]:
+        """
+        Profile the code run in this thread inside the block.
+
+        :param root: Frame whose callers are left out of the sampled stacks. Defaults to None, which keeps whole stacks
+        :type root: FrameType | None
+        """
+        sampling = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+        if sampling:
+            last_sample = time.process_time()
+
+            def sample(signum: int, frame: FrameType | None) -> None:
+                nonlocal last_sample
+                now = time.process_time()
+                if frame is not None and frame is not root:
+                    self.stacks[_collapse(frame, root=root)] += max(round((now - last_sample) * 1_000_000), 1)
+                last_sample = now
+
+            previous_handler = signal.signal(signal.SIGPROF, sample)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        try:
+            # Raises ValueError if another profiler is active
+            self.profile.enable()
+            self.calls += 1
+            try:
+                yield
+            finally:
+                self.profile.disable()
+        finally:
+            if sampling:
+                signal.setitimer(signal.ITIMER_PROF, 0)
+                signal.signal(signal.SIGPROF, previous_handler)
+
+    def wrap(self, func: Callable) -> Callable:
+        """Return a function that profiles every call of `func`."""
+
+        @functools.wraps(func)
+        def profiled(*args, **kwargs):
+            with self.running(root=sys._getframe()):
+                return func(*args, **kwargs)
+
+        return profiled
+
+    def iterate(self, batches: Iterable) -> Iterator:
+        """Yield the items of an iterable, profiling the production of each one, such as the batches of a generator."""
+        iterator = iter(batches)
+        while True:
+            with self.running(root=sys._getframe()):
+                try:
+                    batch = next(iterator)
+                except StopIteration:
+                    return
+            yield batch
+
+    def hot_spots(self, source_file: Path | str, limit: int = 10) -> list[tuple[str, int, int, float, float]]:
+        """
+        Return the functions of a source file that took the most time, with the time spent in the functions they call.
+
+        :param source_file: Path to the file whose functions to report, such as the transformer file
+        :type source_file: Path | str
+        :param limit: Maximum number of functions to return
+        :type limit: int
+        :return: Function name, line, number of calls, own time and cumulative time in seconds, by cumulative time
+        :rtype: list[tuple[str, int, int, float, float]]
+        """
+        source_file = Path(source_file).resolve()
+        stats = pstats.Stats(self.profile).stats
+        # Modules keep the path they were loaded from, which may be relative
+        file_names = {file_name for file_name, _, _ in stats if Path(file_name).name == source_file.name}
+        matching = {file_name for file_name in file_names if Path(file_name).resolve() == source_file}
+        spots = [
+            (function, line, calls, own_time, cumulative_time)
+            for (file_name, line, function), (_, calls, own_time, cumulative_time, _) in stats.items()
+            if file_name in matching
+        ]
+        return sorted(spots, key=lambda spot: spot[4], reverse=True)[:limit]
+
+    def save(self, path: Path | str) -> tuple[Path, Path]:
+        """
+        Write the profile as a pstats file and the samples as a collapsed stack file.
+
+        :param path: Path of the output files without their suffix
+        :type path: Path | str
+        :return: Paths to the `.pstats` and `.collapsed` files
+        :rtype: tuple[Path, Path]
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        stats_file, stacks_file = path.with_name(f"{path.name}.pstats"), path.with_name(f"{path.name}.collapsed")
+        self.profile.dump_stats(stats_file)
+        stacks_file.write_text("".join(f"{stack} {weight}\n" for stack, weight in self.stacks.most_common()))
+        return stats_file, stacks_file
+
+
+def _collapse(frame: FrameType | None, root: FrameType | None = None) -> str:
+    """
+    Return the stack of a frame from its outermost call below `root`, as `function (file:line)` entries joined by
+    semicolons.
+    """
+    entries = []
+    while frame is not None and frame is not root:
+        code = frame.f_code
+        entries.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(entries))
+
+
+def format_hot_spots(spots: list[tuple[str, int, int, float, float]]) -> str:
+    """Format the hot spots of a source file as a table with one line per function."""
+    width = max([len(function) for function, *_ in spots] + [len("Function")])
+    lines = [f"{'Function':<{width}}  {'Line':>5}  {'Calls':>9}  {'Own s':>8}  {'Cumulative s':>12}"]
+    for function, line, calls, own_time, cumulative_time in spots:
+        lines.append(f"{function:<{width}}  {line:>5}  {calls:>9}  {own_time:>8.3f}  {cumulative_time:>12.3f}")
+    return "\n".join(lines)
@@ -0,0 +1,110 @@
+from data_loader.extract_cache import hash_file
+
+import hashlib
+import json
+import os
+import pandas as pd
+import pandera
+import threading
+import time
+from pandas import DataFrame
+from pandera.pandas import DataFrameSchema
+from pathlib import Path
+
+
+MAX_ENTRIES = 10_000
+
+
+def frame_fingerprint(df: DataFrame) -> str:
+    """
+    Return a digest of the content of a dataframe: its values, index, column names and dtypes.
+
+    Values are hashed row by row with the vectorised `pd.util.hash_pandas_object`, which raises a TypeError for
+    object columns holding unhashable values such as lists or dicts.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(json.dumps([[str(name), str(dtype)] for name, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def is_cacheable(schema: DataFrameSchema, df: DataFrame) -> bool:
+    """
+    Return True if validating the dataframe against the schema changes it only by coercing its dtypes.
+
+    Schemas that filter columns, add columns the frame is missing, drop invalid rows, fill defaults or run parsers
+    always have to be validated, because a cache hit could not reproduce their output.
+    """
+    adds_columns = schema.add_missing_columns and not set(schema.columns).issubset(df.columns)
+    return (
+        schema.strict != "filter"
+        and not adds_columns
+        and not schema.drop_invalid_rows
+        and not schema.parsers
+        and all(not column.parsers and column.default is None for column in schema.columns.values())
+    )
+
+
+class ValidationCache:
+    """
+    On-disk record of dataframes that passed validation, keyed by a fingerprint of the frame and a hash of the
+    schema file. Only successes are recorded, so a frame that failed is always validated again. New records are
+    held in memory until `save` is called, and only the `MAX_ENTRIES` most recently used are kept. The cache can
+    be shared between threads.
+    """
+
+    def __init__(self, cache_file: Path | str):
+        self.cache_file: Path = Path(cache_file)
+        self._entries: dict = {}
+        self._changed: bool = False
+        self._lock = threading.Lock()
+
+        if self.cache_file.exists():
+            try:
+                self._entries = json.loads(self.cache_file.read_text())
+            except (OSError, ValueError):
+                self._entries = {}
+
+    def key(self, df: DataFrame, schema_file: Path | str) -> str:
+        """
+        Build the cache key of a dataframe validated against the schema in `schema_file`. Only that file is hashed, so
+        changes to check helpers it imports from other modules do not invalidate the cache; clear it after such changes.
+
+        :raises TypeError: If the frame holds unhashable values, such as lists or dicts
+        """
+        parts = [frame_fingerprint(df), hash_file(schema_file), pandera.__version__]
+        return hashlib.blake2b("|".join(parts).encode(), digest_size=20).hexdigest()
+
+    def contains(self, key: str) -> bool:
+        """Return True if a frame with this key passed validation before, and mark the record as used."""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._entries[key] = time.time()
+            self._changed = True
+            return True
+
+    def record(self, key: str) -> None:
+        """Record that the frame with this key passed validation."""
+        with self._lock:
+            self._entries[key] = time.time()
+            self._changed = True
+
+    @staticmethod
+    def coerce(df: DataFrame, schema: DataFrameSchema) -> DataFrame:
+        """Return the frame the schema would have returned from validation, without running its checks."""
+        # coerce_dtype works in place, while validate returns a new frame
+        return schema.coerce_dtype(df.copy())
+
+    def save(self) -> None:
+        """Write the cache to disk if it has changed."""
+        with self._lock:
+            if not self._changed:
+                return
+            entries = dict(sorted(self._entries.items(), key=lambda entry: entry[1])[-MAX_ENTRIES:])
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+            tmp_file.write_text(json.dumps(entries))
+            os.replace(tmp_file, self.cache_file)
+            self._entries = entries
+            self._changed = False
@@ -0,0 +1,289 @@
+from data_loader.check_compiler import compile_schema
+from data_loader.object_loader import load_object_from_file
+
+import copy
+import math
+import multiprocessing
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pandas import DataFrame
+from pandera.errors import SchemaError, SchemaErrors
+from pandera.pandas import Check, Column, DataFrameSchema
+from pathlib import Path
+from typing import Callable, Dict
+
+
+VALIDATION_ENGINES = ["pandera", "parallel", "compiled"]
+MIN_PARTITION_ROWS = 50_000
+
+# Built-in pandera checks that compare each value on its own, so they give the same result on any row partition
+ROW_LOCAL_CHECKS = {
+    "equal_to",
+    "not_equal_to",
+    "greater_than",
+    "greater_than_or_equal_to",
+    "less_than",
+    "less_than_or_equal_to",
+    "in_range",
+    "isin",
+    "notin",
+    "str_matches",
+    "str_contains",
+    "str_startswith",
+    "str_endswith",
+    "str_length",
+}
+
+
+class ValidationEngineRegistry:
+    """
+    Registry for managing and retrieving DataFrame validation engines
+    """
+
+    _engines: Dict[str, Callable] = {}
+
+    @classmethod
+    def register(cls, name: str):
+        """Decorator to register a new validation engine."""
+
+        def decorator(func):
+            cls._engines[name.lower()] = func
+            return func
+
+        return decorator
+
+    @classmethod
+    def get_engine(cls, name: str):
+        """
+        Retrieve a registered validation engine by name
+
+        :param cls: The registry class containing validation engines
+        :param name: Name of the validation engine to retrieve
+        :type name: str
+        :return: The validation engine callable associated with the given name
+        :rtype: Callable[..., DataFrame]
+        """
+        if name.lower() not in cls._engines:
+            raise ValueError(f"No validation engine registered for '{name}'.")
+        return cls._engines[name.lower()]
+
+    @classmethod
+    def available_engines(cls):
+        return list(cls._engines.keys())
+
+
+def validate_dataframe(df: DataFrame, schema: DataFrameSchema, schema_file: Path, engine: str = "pandera", **options) -> DataFrame:
+    """
+    Validate a dataframe against a pandera schema with a registered validation engine
+
+    :param df: The dataframe to validate
+    :type df: DataFrame
+    :param schema: The schema to validate against
+    :type schema: DataFrameSchema
+    :param schema_file: Path to the file the schema was loaded from, for engines that reload it in worker processes
+    :type schema_file: Path
+    :param engine: Name of the validation engine
+    :type engine: str
+    :param options: Engine specific options, such as `max_workers`
+    :return: The validated, coerced dataframe
+    :rtype: DataFrame
+    :raises SchemaErrors: If the frame fails validation, with every failure found, whatever the engine
+    """
+    return ValidationEngineRegistry.get_engine(engine)(df=df, schema=schema, schema_file=schema_file, **options)
+
+
+def is_row_local(check: Check) -> bool:
+    """Return True if a check gives the same result whether it runs on the whole frame or on row partitions."""
+    return check.element_wise or check.name in ROW_LOCAL_CHECKS
+
+
+def split_schema(schema: DataFrameSchema) -> tuple[DataFrameSchema, DataFrameSchema | None]:
+    """
+    Split a schema into the part that can validate row partitions independently and the part that needs the whole frame
+
+    The partition schema keeps dtypes, coercion, nullability and all row-local column checks. The global schema holds
+    column and schema uniqueness, schema-wide checks and custom vectorised column checks, which may aggregate over
+    rows. It has no dtypes and runs on the merged, already coerced frame.
+
+    :param schema: The schema to split
+    :type schema: DataFrameSchema
+    :return: The partition schema, and the global schema or None if every check is row-local
+    :rtype: tuple[DataFrameSchema, DataFrameSchema | None]
+    """
+    partition_schema = copy.deepcopy(schema)
+    global_columns = {}
+    for name, column in partition_schema.columns.items():
+        global_checks = [check for check in column.checks if not is_row_local(check)]
+        if global_checks or column.unique:
+            global_columns[name] = Column(
+                checks=global_checks,
+                nullable=True,
+                unique=column.unique,
+                report_duplicates=column.report_duplicates,
+                required=False,
+                regex=column.regex,
+                name=name,
+            )
+        column.checks = [check for check in column.checks if is_row_local(check)]
+        column.unique = False
+
+    global_schema = None
+    if global_columns or schema.checks or schema.unique:
+        global_schema = DataFrameSchema(
+            columns=global_columns,
+            checks=schema.checks,
+            unique=schema.unique,
+            report_duplicates=schema.report_duplicates,
+            name=schema.name,
+        )
+    partition_schema.checks = []
+    partition_schema.unique = None
+
+    return partition_schema, global_schema
+
+
+def _check_identifier(check) -> str | None:
+    """Name of a failed check, as pandera reports it in failure cases."""
+    if check is None or isinstance(check, str):
+        return check
+    return check.error or check.name or str(check)
+
+
+def _export_errors(errors: SchemaErrors) -> list[dict]:
+    """Strip schema errors down to picklable fields, so they can leave a worker process."""
+    return [
+        {
+            "component": type(error.schema).__name__,
+            "name": error.schema.name,
+            "message": str(error),
+            "failure_cases": error.failure_cases,
+            "check": _check_identifier(error.check),
+            "check_index": error.check_index,
+            "reason_code": error.reason_code,
+            "column_name": error.column_name,
+        }
+        for error in errors.schema_errors
+    ]
+
+
+def _import_error(schema: DataFrameSchema, exported: dict) -> SchemaError:
+    """Rebuild a schema error exported by a worker against the full schema."""
+    component = schema
+    if exported["component"] == "Column":
+        component = schema.columns.get(exported["name"], schema)
+    elif exported["component"] in ("Index", "MultiIndex") and schema.index is not None:
+        component = schema.index
+
+    return SchemaError(
+        schema=component,
+        data=None,
+        message=exported["message"],
+        failure_cases=exported["failure_cases"],
+        check=exported["check"],
+        check_index=exported["check_index"],
+        reason_code=exported["reason_code"],
+        column_name=exported["column_name"],
+    )
+
+
+def concat_partitions(partitions: list[DataFrame]) -> DataFrame:
+    """Concatenate the partitions of a frame, keeping categorical columns whose categories differ between partitions."""
+    df = pd.concat(partitions)
+    for name, dtype in partitions[0].dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype) and not isinstance(df[name].dtype, pd.CategoricalDtype):
+            categories = pd.api.types.union_categoricals([partition[name] for partition in partitions])
+            df[name] = pd.Categorical(df[name], categories=categories.categories, ordered=dtype.ordered)
+    return df
+
+
+_worker_schema: DataFrameSchema | None = None
+
+
+def _init_worker(schema_file: str) -> None:
+    """Load the partition schema once per worker process. Schemas hold lambdas, so they cannot be pickled to workers."""
+    global _worker_schema
+    schema = load_object_from_file(folder_name=Path(schema_file).parent, file_name=Path(schema_file).name, object_name="schema")
+    _worker_schema, _ = split_schema(schema)
+
+
+def _validate_partition(df: DataFrame) -> tuple[DataFrame | None, list[dict]]:
+    """Validate one row partition in a worker process. Returns the coerced partition or the exported errors."""
+    try:
+        return _worker_schema.validate(df, lazy=True), []
+    except SchemaErrors as errors:
+        return None, _export_errors(errors)
+
+
+@ValidationEngineRegistry.register("pandera")
+def validate_pandera(df: DataFrame, schema: DataFrameSchema, schema_file: Path | None = None, **options) -> DataFrame:
+    """
+    Validate the whole frame in the current process with pandera
+
+    :raises SchemaErrors: If the frame fails validation
+    """
+    return schema.validate(df, lazy=True)
+
+
+@ValidationEngineRegistry.register("parallel")
+def validate_parallel(
+    df: DataFrame,
+    schema: DataFrameSchema,
+    schema_file: Path,
+    max_workers: int | None = None,
+    min_partition_rows: int = MIN_PARTITION_ROWS,
+    **options,
+) -> DataFrame:
+    """
+    Validate row partitions of the frame in parallel worker processes
+
+    Every worker loads the schema from `schema_file` and validates its partitions against the row-local part of the
+    schema. Uniqueness, schema-wide checks and custom vectorised checks then run once over the merged frame. Failures
+    from all partitions and from the global pass are reported together in one `SchemaErrors`, with failure case
+    indexes that refer to the original frame. Frames too small to give each worker `min_partition_rows` rows, and
+    schemas with a unique index, are validated in the current process.
+
+    :raises SchemaErrors: If any partition or the global pass fails validation
+    """
+    max_workers = max_workers or multiprocessing.cpu_count()
+    partitions = min(max_workers, len(df) // max(min_partition_rows, 1))
+    if partitions <= 1 or getattr(schema.index, "unique", False):
+        return validate_pandera(df=df, schema=schema)
+
+    partition_size = math.ceil(len(df) / partitions)
+    chunks = [df.iloc[start : start + partition_size] for start in range(0, len(df), partition_size)]
+    with ProcessPoolExecutor(
+        max_workers=len(chunks),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(str(Path(schema_file).resolve()),),
+    ) as executor:
+        results = list(executor.map(_validate_partition, chunks))
+
+    errors = [_import_error(schema, exported) for _, exported_errors in results for exported in exported_errors]
+
+    # Partitions that failed take part in the global pass with their values as read
+    validated = concat_partitions([chunk if partition is None else partition for chunk, (partition, _) in zip(chunks, results)])
+
+    _, global_schema = split_schema(schema)
+    if global_schema is not None:
+        try:
+            global_schema.validate(validated, lazy=True)
+        except SchemaErrors as global_errors:
+            errors.extend(global_errors.schema_errors)
+
+    if errors:
+        raise SchemaErrors(schema=schema, schema_errors=errors, data=df)
+
+    return validated
+
+
+@ValidationEngineRegistry.register("compiled")
+def validate_compiled(df: DataFrame, schema: DataFrameSchema, schema_file: Path | None = None, **options) -> DataFrame:
+    """
+    Run the common checks of the schema as vectorised kernels and the rest with pandera, in the current process
+
+    Failures of both are reported together in one `SchemaErrors`.
+
+    :raises SchemaErrors: If the frame fails validation
+    """
+    return compile_schema(schema).validate(df)
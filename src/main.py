@@ -1,20 +1,17 @@
-from data_loader.logging_utilties import setup_logger, get_timestamp
-from data_loader.pipeline_config_io import load_pipeline_config  # , #load_config
-from data_loader.file_type_readers import read_input_data
-from data_loader.object_loader import load_object_from_file
-from data_loader.transformer_loader import load_transformer_function
-from data_loader.data_writer import DataFrameWriter
-from data_loader.models.extract_pipeline_data_model import ExtractPipelineData
+from data_loader.pipeline_config_io import load_pipeline_config
 
 import argparse
+import sys
+import time
 from pathlib import Path
 
 
+# The choices are listed here rather than read from the writer registry and the readers, which import pandas,
+# pandera, pyarrow and duckdb; only the subcommands that need those modules import them
 SAVE_METHODS = ["parquet", "duckdb", "sqlite", "tsv", "csv"]
 MODES = ["append", "overwrite"]
-DEFAULT_PATHS = {
-    "signature_model": "src/data_loader/models/default_signature_model.py",
-}
+READER_ENGINES = ["pandas-c", "pyarrow"]
+GENERATED_FILE_FORMATS = ["csv", "tsv", "parquet", "feather", "excel"]
 
 
 def run_pipeline(
@@ -22,98 +19,43 @@ def run_pipeline(
     mode: str = "append",
     dry_run: bool = False,
     save_method: str = "parquet",
+    chunksize: int | None = None,
+    force: bool = False,
+    resume: str | None = None,
+    profile: bool = False,
+    memory_limit_mb: int | None = None,
 ) -> None:
     """Execute the ETL pipeline based on provided configuration.
-    This function orchestrates the Extract, Transform, Load (ETL) pipeline by:
-    1. Loading and validating the pipeline configuration
-    2. Setting up logging
-    3. Extracting and validating input data files
-    4. Transforming data using provided transformation logic
-    5. Loading data to the specified destination
+    Imports `data_loader.pipeline` on first use, so that the CLI starts without loading pandas, pandera, pyarrow
+    or duckdb. See `data_loader.pipeline.run_pipeline` for the full description.
     Args:
         config (str): Path to the pipeline configuration file
         mode (str, optional): Write mode for output data. Defaults to "append"
         dry_run (bool, optional): If True, runs pipeline without writing data. Defaults to False
         save_method (str, optional): Method to save output data. Defaults to "parquet"
-    Raises:
-        ValueError: If there's an error loading the pipeline configuration
+        chunksize (int | None, optional): Number of rows per batch in streaming mode. Defaults to None
+        force (bool, optional): Run the pipeline even if it is unchanged since its last write. Defaults to False
+        resume (str | None, optional): Id of a failed run to resume from its checkpoints. Defaults to None
+        profile (bool, optional): Profile the transformer and save its hot spots. Defaults to False
+        memory_limit_mb (int | None, optional): Memory budget of the run in MB. Defaults to None
     Returns:
         None
-    Example:
-        >>> run_pipeline(
-        ...     config="pipeline_config.yaml",
-        ...     mode="overwrite",
-        ...     dry_run=True,
-        ...     save_method="csv"
-        ... )
     """
 
-    try:
-        config_dict = load_pipeline_config(path=Path(config))
-    except Exception as e:
-        print(e)
-        raise ValueError("Error trying to import configuration. Check format and try again.")
-
-    logger = setup_logger(
-        log_file=Path(config_dict.details.project_path).resolve() / "logs" / f"log_file__{get_timestamp()}", name="Logger"
-    )
-    logger.info("Logging started")
-
-    logger.info(f"Pipeline name: {config_dict.details.name}")
-    logger.info(f"Pipeline description: {config_dict.details.description}")
-    logger.info(f"Dry-run mode: {dry_run}")
-
-    # Extract
-    extract_files: list = []
-    for file_number, extract_file in enumerate(config_dict.extract_files):
-        data = read_input_data(path=extract_file.data_file)
-        logger.info(f"File {file_number}: {extract_file.data_file} has been loaded")
-
-        schema = load_object_from_file(
-            folder_name=Path(config_dict.details.project_path).resolve(), file_name=extract_file.schema_file, object_name="schema"
-        )
-        logger.info(f"Schema {file_number}: {extract_file.schema_file} has been loaded")
-
-        validated_data = schema.validate(data)
-        logger.info(f"Data '{extract_file.label}' has been validated")
-
-        extract_files.append(ExtractPipelineData(label=extract_file.label, schema=schema, data=validated_data))
-
-    # Transform
-    output_schema = load_object_from_file(
-        folder_name=Path(config_dict.output_table.schema_file).parent.resolve(),
-        file_name=config_dict.output_table.schema_file,
-        object_name="schema",
-    )
+    from data_loader.pipeline import run_pipeline as run
 
-    func = load_transformer_function(
-        transformer_file=Path(config_dict.details.project_path) / (config_dict.details.transformer_pipeline),
-        template_file=Path(DEFAULT_PATHS.get("signature_model")).resolve(),
+    run(
+        config=config,
+        mode=mode,
+        dry_run=dry_run,
+        save_method=save_method,
+        chunksize=chunksize,
+        force=force,
+        resume=resume,
+        profile=profile,
+        memory_limit_mb=memory_limit_mb,
     )
 
-    transformed_df = func(*[extract_file.data for extract_file in extract_files], output_schema=output_schema)
-    transformed_df = output_schema.validate(transformed_df)
-
-    # Load
-    logger.info(f"Saving data to disk with method: {save_method}")
-    logger.info(f"Output location: {config_dict.output_table.output_path}")
-    logger.info(f"Database: {config_dict.output_table.db}")
-    logger.info(f"Table name: {config_dict.output_table.table_name}")
-
-    if not dry_run:
-        DataFrameWriter(
-            df=transformed_df.assign(data_label=config_dict.output_table.data_label),
-            output_path=Path(config_dict.output_table.output_path).resolve(),
-            write_method=save_method,
-            table_name=config_dict.output_table.table_name,
-            db=config_dict.output_table.db,
-            mode=mode,
-            partition_cols=["data_label"],
-        ).write()
-    else:
-        logger.info("Dry-run selected. No data written.")
-    logger.info("Pipeline execution complete!")
-
 
 def cli():
     """Command Line Interface for the Data Pipeline.
@@ -125,23 +67,63 @@ def cli():
             --save_method: Method for saving data (default: parquet)
             --mode: Save mode (default: append)
             --dry-run: Run validation and transformation only
+            --chunksize: Stream the first input file in batches of this many rows
+            --force: Run even if inputs, code and config are unchanged since the last write (skip_unchanged = true)
+            --resume: Id of a failed run to restart from its last completed stage (checkpoints = true)
+            --profile: Profile the transformer and save pstats and collapsed stack files next to the log
+            --memory-limit: Memory budget in MB; larger runs stream their first input or refuse to start
+        run-batch: Execute every pipeline configuration in a directory on a pool of worker processes
+            --dir: Directory holding the TOML configs
+            --workers: Number of worker processes (default: 1)
+            --save_method: Method for saving data (default: parquet)
+            --mode: Save mode (default: append)
+            --dry-run: Run validation and transformation only
+            --force: Run pipelines even if they are unchanged since their last write
+        run-dag: Execute every pipeline configuration in a directory in dependency order
+            --dir, --workers, --save_method, --mode, --dry-run, --force: As for run-batch
+        plan: Print the estimated memory of each input of a pipeline and how it would be read
+            --config: Path to TOML config file
+            --memory-limit: Memory budget in MB (default: memory_limit_mb of the config)
+            --chunksize: Rows per batch if the pipeline streams
         list: Display available TOML configuration files
             --dir: Directory to search for TOML files (optional)
         validate: Check the structure of a configuration file
             --config: Path to configuration file to validate
         read: Test reading a data file
             --file: Path to data file to read
+            --engine: Parsing engine for CSV and TSV files (default: pandas-c)
+        cache clear: Remove the cached extracts of a project
+            --config: Path to a TOML config of the project
+            --dir: Path to the cache directory (alternative to --config)
+        generate: Write synthetic rows that pass a pandera schema
+            --schema: Path to the Python file defining `schema`
+            --rows: Number of rows to generate
+            --format: Output file format (default: parquet)
+            --output: Output file (default: <schema file name>.<format> in the current folder)
+            --seed: Seed of the random generator, for repeatable data
+            --null-fraction: Fraction of nulls in nullable columns (default: 0)
+            --chunksize: Number of rows generated and written at a time (default: 1000000)
     Returns:
         None. Output is printed to console.
     Example:
         # Run a pipeline
         python main.py run --config pipeline.toml --save_method csv --mode overwrite
+        # Run every pipeline in a folder on four processes
+        python main.py run-batch --dir configs/ --workers 4
+        # Run a folder of pipelines that depend on each other, with independent branches in parallel
+        python main.py run-dag --dir configs/ --workers 4
+        # Check that a pipeline fits in 2 GB before running it
+        python main.py plan --config pipeline.toml --memory-limit 2048
         # List available configs
         python main.py list
         # Validate a config file
         python main.py validate --config pipeline.toml
         # Test reading a file
         python main.py read --file data.csv
+        # Clear the extract cache of a project
+        python main.py cache clear --config pipeline.toml
+        # Generate ten million rows of test data for a schema
+        python main.py generate --schema models/customer_model.py --rows 10000000 --format parquet
     """
 
     parser = argparse.ArgumentParser(description="Data Pipeline CLI - Run ETL pipelines using TOML configs")
@@ -158,16 +140,95 @@ def cli():
         action="store_true",
         help="Run validation and transformation only, skip loading",
     )
+    run_parser.add_argument(
+        "--chunksize",
+        required=False,
+        default=None,
+        type=int,
+        help="Stream the first input file in batches of this many rows instead of loading it whole",
+    )
+    run_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Run even if inputs, code and config are unchanged since the last write",
+    )
+    run_parser.add_argument(
+        "--resume",
+        required=False,
+        default=None,
+        metavar="RUN_ID",
+        help="Restart a failed run from its last completed stage",
+    )
+    run_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the transformer and save its hot spots next to the log file",
+    )
+    run_parser.add_argument(
+        "--memory-limit",
+        required=False,
+        default=None,
+        type=int,
+        metavar="MB",
+        help="Stream the first input file, or refuse to run, if the pipeline is estimated to need more memory",
+    )
+
+    # plan command
+    plan_parser = subparsers.add_parser("plan", help="Estimate the memory a pipeline needs")
+    plan_parser.add_argument("--config", required=True, help="Path to the TOML config")
+    plan_parser.add_argument("--memory-limit", required=False, default=None, type=int, metavar="MB", help="Memory budget in MB")
+    plan_parser.add_argument("--chunksize", required=False, default=None, type=int, help="Rows per batch if the pipeline streams")
+
+    # run-batch and run-dag commands
+    for command, help in [
+        ("run-batch", "Run every pipeline config in a directory"),
+        ("run-dag", "Run every pipeline config in a directory in dependency order"),
+    ]:
+        batch_parser = subparsers.add_parser(command, help=help)
+        batch_parser.add_argument("--dir", required=True, help="Directory to search for .toml files")
+        batch_parser.add_argument("--workers", required=False, default=1, type=int, help="Number of worker processes")
+        batch_parser.add_argument("--save_method", required=False, default="parquet", choices=SAVE_METHODS, help="Method for saving data")
+        batch_parser.add_argument("--mode", required=False, default="append", choices=MODES, help="Method for saving data")
+        batch_parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Run validation and transformation only, skip loading",
+        )
+        batch_parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Run even if inputs, code and config are unchanged since the last write",
+        )
 
     # list command
     list_parser = subparsers.add_parser("list", help="List available TOML configs")
-    list_parser.add_argument("--dir", required=False, default=DEFAULT_PATHS.get("configs"), help="Directory to search for .toml files")
+    list_parser.add_argument("--dir", required=False, default=None, help="Directory to search for .toml files")
 
     list_parser = subparsers.add_parser("validate", help="Validate the structure of a config file")
     list_parser.add_argument("--config", required=False, default="", help="Configuration file to validate")
 
     list_parser = subparsers.add_parser("read", help="Test the reading of a data file")
     list_parser.add_argument("--file", required=False, default="", help="Data file to read")
+    list_parser.add_argument(
+        "--engine", required=False, default="pandas-c", choices=READER_ENGINES, help="Parsing engine for CSV and TSV files"
+    )
+
+    # cache command
+    cache_parser = subparsers.add_parser("cache", help="Manage the extract cache")
+    cache_subparsers = cache_parser.add_subparsers(dest="cache_command", help="Cache subcommands")
+    clear_parser = cache_subparsers.add_parser("clear", help="Remove all cached extracts")
+    clear_parser.add_argument("--config", required=False, default="", help="TOML config of the project whose cache to clear")
+    clear_parser.add_argument("--dir", required=False, default="", help="Cache directory to clear")
+
+    # generate command
+    generate_parser = subparsers.add_parser("generate", help="Generate synthetic rows that pass a schema")
+    generate_parser.add_argument("--schema", required=True, help="Python file defining a pandera `schema`")
+    generate_parser.add_argument("--rows", required=True, type=int, help="Number of rows to generate")
+    generate_parser.add_argument("--format", required=False, default="parquet", choices=GENERATED_FILE_FORMATS, help="Output file format")
+    generate_parser.add_argument("--output", required=False, default=None, help="Output file")
+    generate_parser.add_argument("--seed", required=False, default=None, type=int, help="Seed of the random generator")
+    generate_parser.add_argument("--null-fraction", required=False, default=0.0, type=float, help="Fraction of nulls in nullable columns")
+    generate_parser.add_argument("--chunksize", required=False, default=1_000_000, type=int, help="Rows generated and written at a time")
 
     args = parser.parse_args()
 
@@ -177,7 +238,31 @@ def cli():
             save_method=args.save_method,
             mode=args.mode,
             dry_run=args.dry_run,
+            chunksize=args.chunksize,
+            force=args.force,
+            resume=args.resume,
+            profile=args.profile,
+            memory_limit_mb=args.memory_limit,
+        )
+    elif args.command == "plan":
+        from data_loader.pipeline import plan_pipeline
+
+        plan = plan_pipeline(config=args.config, memory_limit_mb=args.memory_limit, chunksize=args.chunksize)
+        print(plan.format_table())
+        if not plan.fits:
+            sys.exit(1)
+    elif args.command in ("run-batch", "run-dag"):
+        from data_loader.batch_runner import format_summary, run_batch
+        from data_loader.scheduler import run_dag
+
+        runner = run_batch if args.command == "run-batch" else run_dag
+        start = time.perf_counter()
+        results = runner(
+            config_dir=args.dir, workers=args.workers, mode=args.mode, dry_run=args.dry_run, save_method=args.save_method, force=args.force
         )
+        print(format_summary(results, seconds=time.perf_counter() - start))
+        if not all(result.succeeded for result in results):
+            sys.exit(1)
     elif args.command == "list":
         if not args.dir:
             print("No configuration folder. use --dir to provide a path to configuration files.")
@@ -194,8 +279,36 @@ def cli():
         load_pipeline_config(path=Path(args.config))
         print(f"Successfully validated config file: {args.config}")
     elif args.command == "read":
-        print(read_input_data(path=Path(args.file)).head())
+        from data_loader.file_type_readers import read_input_data
+
+        print(read_input_data(path=Path(args.file), engine=args.engine).head())
         print(f"Successfully loaded file: {Path(args.file)}")
+    elif args.command == "cache" and args.cache_command == "clear":
+        from data_loader.extract_cache import ExtractCache
+        from data_loader.pipeline import DEFAULT_PATHS
+
+        if args.dir:
+            cache_dir = Path(args.dir).resolve()
+        elif args.config:
+            config_dict = load_pipeline_config(path=Path(args.config))
+            cache_dir = Path(config_dict.details.project_path).resolve() / DEFAULT_PATHS["cache_dir"] / "extracts"
+        else:
+            print("No cache to clear. Use --config or --dir to select a cache.")
+            return
+        removed = ExtractCache(cache_dir=cache_dir).clear()
+        print(f"Removed {removed} cached extracts from {cache_dir}")
+    elif args.command == "generate":
+        from data_loader.data_generator import GENERATED_FILE_FORMATS as SUFFIXES
+        from data_loader.data_generator import generate_batches, write_batches
+        from data_loader.object_loader import load_object_from_file
+
+        schema_file = Path(args.schema).resolve()
+        schema = load_object_from_file(folder_name=schema_file.parent, file_name=schema_file.name, object_name="schema")
+        output = Path(args.output) if args.output else Path(schema_file.stem).with_suffix(SUFFIXES[args.format])
+        start = time.perf_counter()
+        batches = generate_batches(schema, rows=args.rows, chunksize=args.chunksize, seed=args.seed, null_fraction=args.null_fraction)
+        rows = write_batches(batches, path=output, file_format=args.format)
+        print(f"Generated {rows} rows in {time.perf_counter() - start:.1f}s: {output.resolve()}")
     else:
         parser.print_help()
 
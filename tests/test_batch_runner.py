@@ -0,0 +1,100 @@
+from data_loader.batch_runner import PipelineRunResult, find_configs, format_summary, group_by_target, run_batch
+from data_loader.data_writer import ConnectionPool
+from data_loader.models.pipeline_run_model import PipelineRun
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+
+CONFIG = """
+[details]
+name = "{name}"
+description = "test"
+project_path = "./"
+transformer_pipeline = "transformer.py"
+
+[[extract_files]]
+data_file = "data.csv"
+schema_file = "schema.py"
+label = "data"
+
+[output]
+schema_file = "output_schema.py"
+output_path = "{output_path}"
+table_name = "{name}"
+db = "db"
+data_label = "test"
+"""
+
+
+def _write_config(config_dir: Path, name: str, output_path: str) -> Path:
+    path = config_dir / f"{name}.toml"
+    path.write_text(CONFIG.format(name=name, output_path=output_path))
+    return path
+
+
+def test_find_configs_sorted(tmp_path):
+    for name in ["b", "a", "c"]:
+        _write_config(tmp_path, name, "out")
+    (tmp_path / "notes.txt").write_text("")
+    assert [path.name for path in find_configs(tmp_path)] == ["a.toml", "b.toml", "c.toml"]
+
+
+def test_group_by_target_keeps_shared_outputs_together(tmp_path):
+    first = _write_config(tmp_path, "first", "out1")
+    second = _write_config(tmp_path, "second", "out2")
+    third = _write_config(tmp_path, "third", "out1")
+    broken = tmp_path / "broken.toml"
+    broken.write_text("not toml [")
+
+    groups = group_by_target([first, second, third, broken], save_method="duckdb")
+    assert groups == [[first, third], [second], [broken]]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch_reports_every_pipeline_in_config_order(tmp_path, workers):
+    for name, output_path in [("c", "out1"), ("a", "out2"), ("b", "out1"), ("d", "out3")]:
+        _write_config(tmp_path, name, output_path)
+
+    pools = {}
+
+    def fake_run_pipeline(config, connections, **kwargs):
+        pools[Path(config).name] = connections
+        if Path(config).name == "a.toml":
+            raise ValueError("bad data\nmore detail")
+        return PipelineRun(status="skipped" if Path(config).name == "d.toml" else "ok", rows=10)
+
+    with (
+        patch("data_loader.batch_runner.run_pipeline", side_effect=fake_run_pipeline),
+        patch("data_loader.batch_runner.ProcessPoolExecutor", lambda max_workers, mp_context: ThreadPoolExecutor(max_workers)),
+    ):
+        results = run_batch(config_dir=tmp_path, workers=workers, save_method="duckdb")
+
+    assert [(Path(result.config).name, result.status, result.rows) for result in results] == [
+        ("a.toml", "failed", 0),
+        ("b.toml", "ok", 10),
+        ("c.toml", "ok", 10),
+        ("d.toml", "skipped", 10),
+    ]
+    assert results[0].error.startswith("ValueError: bad data")
+    # Pipelines writing to the same output share a connection pool
+    assert pools["b.toml"] is pools["c.toml"]
+    assert pools["a.toml"] is not pools["b.toml"]
+    assert all(isinstance(pool, ConnectionPool) for pool in pools.values())
+
+
+def test_format_summary():
+    results = [
+        PipelineRunResult(config="/configs/first.toml", status="ok", rows=1200, seconds=1.5),
+        PipelineRunResult(config="/configs/second.toml", status="failed", seconds=0.25, error="ValueError: bad data\nmore detail"),
+        PipelineRunResult(config="/configs/third.toml", status="skipped", rows=300, seconds=0.05),
+    ]
+    lines = format_summary(results, seconds=2.0).splitlines()
+
+    assert lines[0].split() == ["Pipeline", "Status", "Rows", "Seconds"]
+    assert lines[1].split() == ["first.toml", "ok", "1200", "1.50"]
+    assert lines[2].split() == ["second.toml", "failed", "0", "0.25", "ValueError:", "bad", "data"]
+    assert lines[3].split() == ["third.toml", "skipped", "300", "0.05"]
+    assert lines[4] == "3 pipelines: 1 ok, 1 failed, 1 skipped, 1500 rows in 2.00 s"
@@ -0,0 +1,179 @@
+from data_loader.check_compiler import compile_check, compile_lambda, compile_schema, lambda_node
+from data_loader.validation_engines import validate_dataframe
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal, assert_series_equal
+from pandera.errors import SchemaErrors, SchemaWarning
+from pandera.pandas import Check, Column, DataFrameSchema
+
+STATES = ["CA", "NY"]
+LENGTHS = [5, 9]
+
+
+@pytest.mark.parametrize(
+    "fn",
+    [
+        lambda s: len(s) == 5,
+        lambda s: 5 == len(s),
+        lambda s: len(s) in LENGTHS,
+        lambda s: len(s) not in (1, 2),
+        lambda s: s in STATES,
+        lambda s: s.isdigit(),
+        lambda s: s.isdigit() and len(s) >= 5,
+        lambda s: not s.isdigit() or len(s) < 3,
+    ],
+)
+def test_compile_lambda_matches_python(fn):
+    series = pd.Series(["12345", "CA", "123456789", "abc", "", "1"])
+    kernel = compile_lambda(fn)
+    assert kernel is not None
+    assert_series_equal(kernel(series), series.map(fn), check_names=False)
+
+
+@pytest.mark.parametrize("fn", [lambda x: x > -1.5, lambda x: 3 <= x, lambda x: x != 2])
+def test_compile_numeric_lambda(fn):
+    series = pd.Series([-2.0, 1.0, 2.0, 3.0, 4.5])
+    assert_series_equal(compile_lambda(fn)(series), series.map(fn), check_names=False)
+
+
+@pytest.mark.parametrize(
+    "fn",
+    [
+        lambda s: s.startswith("a"),
+        lambda s: len(s.strip()) == 5,
+        lambda s, t=1: len(s) == t,
+        lambda s: len(s) == len(STATES[0]),
+        abs,
+    ],
+)
+def test_compile_lambda_unsupported(fn):
+    assert compile_lambda(fn) is None
+
+
+def test_lambda_node_picks_the_right_lambda_on_a_line():
+    first, second = (lambda s: len(s) == 1), (lambda s: len(s) == 2)
+    assert compile_lambda(second)(pd.Series(["a", "ab"])).tolist() == [False, True]
+    assert lambda_node(first).body.comparators[0].value == 1
+
+
+@pytest.mark.parametrize(
+    "check",
+    [
+        Check.isin([1, 2]),
+        Check.notin([1]),
+        Check.ge(2),
+        Check.gt(2),
+        Check.le(2),
+        Check.lt(2),
+        Check.eq(2),
+        Check.ne(2),
+        Check.in_range(1, 3),
+        Check.in_range(1, 3, include_min=False, include_max=False),
+    ],
+)
+def test_compile_builtin_checks(check):
+    series = pd.Series([0, 1, 2, 3, 4])
+    assert failed_indexes(compile_check(check), series) == pandera_failed_indexes(check, series)
+
+
+def test_compile_str_length():
+    series = pd.Series(["a", "abc", "abcdef"])
+    check = Check.str_length(2, 5)
+    assert failed_indexes(compile_check(check), series) == pandera_failed_indexes(check, series)
+
+
+def failed_indexes(kernel, series):
+    return series.index[~kernel(series)].tolist()
+
+
+def pandera_failed_indexes(check, series):
+    try:
+        DataFrameSchema({"a": Column(checks=check)}).validate(series.to_frame("a"), lazy=True)
+    except SchemaErrors as errors:
+        return sorted(errors.failure_cases["index"].tolist())
+    return []
+
+
+def test_uncompiled_checks_stay_in_residual_schema():
+    schema = DataFrameSchema(
+        {
+            "a": Column(int, checks=[Check.ge(0), Check(lambda s: s.mean() > 0), Check.str_matches("x")]),
+            "b": Column(str, checks=Check(lambda v: v.startswith("x"), element_wise=True), unique=True, nullable=False),
+        }
+    )
+    compiled = compile_schema(schema)
+
+    assert [check.name for check in compiled.residual_schema.columns["a"].checks] == ["<lambda>", "str_matches"]
+    assert len(compiled.residual_schema.columns["b"].checks) == 1
+    assert compiled.residual_schema.columns["b"].nullable and not compiled.residual_schema.columns["b"].unique
+    assert compiled.residual_schema.columns["b"].dtype is None
+    # The original schema is left untouched
+    assert len(schema.columns["a"].checks) == 3 and schema.columns["b"].unique and str(schema.columns["b"].dtype) == "str"
+
+
+@pytest.fixture
+def schema():
+    return DataFrameSchema(
+        columns={
+            "id": Column(dtype=str, unique=True, nullable=False, coerce=True),
+            "code": Column(dtype=str, checks=[Check(lambda s: len(s) == 5, element_wise=True, name="five_digits")], nullable=True),
+            "state": Column(dtype=str, checks=Check.isin(STATES), nullable=True),
+            "amount": Column(dtype=float, checks=[Check.ge(0), Check(lambda s: s.sum() > 0)], coerce=True),
+        },
+        coerce=True,
+        strict=True,
+        report_duplicates="all",
+    )
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame(
+        {
+            "id": [1, 2, 3, 4, 5],
+            "code": ["12345", "54321", None, "11111", "22222"],
+            "state": ["CA", "NY", "CA", np.nan, "NY"],
+            "amount": ["1.5", "2", "0", "3", "4"],
+        }
+    )
+
+
+def test_compiled_engine_matches_pandera(schema, df):
+    assert_frame_equal(validate_dataframe(df, schema, None, engine="compiled"), schema.validate(df))
+
+
+def test_compiled_engine_reports_the_same_failures_as_pandera(schema, df):
+    df.loc[1, "id"] = 1
+    df.loc[2, "code"] = "1"
+    df.loc[3, "state"] = "TX"
+    df.loc[4, "amount"] = "-1"
+    df.loc[0, "id"] = None
+    df["extra"] = 1
+
+    with pytest.raises(SchemaErrors) as compiled_errors:
+        validate_dataframe(df, schema, None, engine="compiled")
+    with pytest.raises(SchemaErrors) as pandera_errors:
+        schema.validate(df, lazy=True)
+
+    def failures(errors):
+        return errors.value.failure_cases.sort_values(["column", "check", "index"]).reset_index(drop=True)
+
+    assert_frame_equal(failures(compiled_errors), failures(pandera_errors))
+    assert dict(compiled_errors.value.error_counts) == dict(pandera_errors.value.error_counts)
+
+
+def test_compiled_engine_wrong_string_type():
+    schema = DataFrameSchema({"a": Column(str, nullable=True)})
+    df = pd.DataFrame({"a": ["x", 1, None, 2.5]})
+    with pytest.raises(SchemaErrors) as errors:
+        validate_dataframe(df, schema, None, engine="compiled")
+    assert errors.value.failure_cases["check"].tolist() == ["dtype('str')", "dtype('str')"]
+    assert errors.value.failure_cases["index"].tolist() == [1, 3]
+
+
+def test_compiled_engine_raise_warning():
+    schema = DataFrameSchema({"a": Column(int, checks=Check.le(10, raise_warning=True))})
+    with pytest.warns(SchemaWarning, match="less_than_or_equal_to"):
+        validate_dataframe(pd.DataFrame({"a": [1, 20]}), schema, None, engine="compiled")
@@ -0,0 +1,107 @@
+from data_loader.checkpoints import RunCheckpoints
+
+import json
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "pipeline.toml"
+    path.write_text("[details]\n")
+    return path
+
+
+def test_create_and_resume(tmp_path, config_file):
+    checkpoints = RunCheckpoints.create(runs_dir=tmp_path / "runs", config_file=config_file)
+    state = json.loads((checkpoints.run_dir / "state.json").read_text())
+    assert state["config"] == str(config_file.resolve())
+
+    resumed = RunCheckpoints.resume(runs_dir=tmp_path / "runs", run_id=checkpoints.run_id, config_file=config_file)
+    assert resumed.run_dir == checkpoints.run_dir
+
+
+def test_run_ids_are_unique(tmp_path, config_file):
+    run_ids = {RunCheckpoints.create(runs_dir=tmp_path, config_file=config_file).run_id for _ in range(5)}
+    assert len(run_ids) == 5
+
+
+def test_save_and_load_stage(tmp_path, config_file):
+    df = pd.DataFrame(
+        {"a": [1, 2], "b": ["x", None], "c": pd.Series(["u", "v"], dtype="category")},
+        index=pd.RangeIndex(5, 7),
+    )
+    checkpoints = RunCheckpoints.create(runs_dir=tmp_path, config_file=config_file)
+    assert not checkpoints.has("transform")
+
+    assert checkpoints.save("transform", df)
+    assert checkpoints.has("transform")
+    assert_frame_equal(checkpoints.load("transform"), df)
+
+
+def test_save_unsupported_data(tmp_path, config_file):
+    checkpoints = RunCheckpoints.create(runs_dir=tmp_path, config_file=config_file)
+    assert not checkpoints.save("transform", pd.DataFrame({"a": [1, "x"]}))
+    assert not checkpoints.has("transform")
+
+
+def test_resume_unknown_run(tmp_path, config_file):
+    with pytest.raises(FileNotFoundError, match="No checkpoints found for run 'missing'"):
+        RunCheckpoints.resume(runs_dir=tmp_path, run_id="missing", config_file=config_file)
+
+
+def test_resume_with_changed_config(tmp_path, config_file):
+    checkpoints = RunCheckpoints.create(runs_dir=tmp_path, config_file=config_file)
+    config_file.write_text("[details]\nname = 'changed'\n")
+    with pytest.raises(ValueError, match="cannot be resumed"):
+        RunCheckpoints.resume(runs_dir=tmp_path, run_id=checkpoints.run_id, config_file=config_file)
+
+
+INPUTS = {
+    "config": "c",
+    "data_files": ["d0", "d1"],
+    "schema_files": ["s0", "s1"],
+    "transformer": "t",
+    "output_schema": "o",
+}
+
+
+@pytest.mark.parametrize(
+    "changed, discarded",
+    [
+        ({}, []),
+        ({"data_files": ["d0", "new"]}, ["extract_1", "transform", "output"]),
+        ({"schema_files": ["new", "s1"]}, ["extract_0", "transform", "output"]),
+        ({"transformer": "new"}, ["transform", "output"]),
+        ({"output_schema": "new"}, ["output"]),
+    ],
+)
+def test_resume_discards_stages_of_changed_files(tmp_path, config_file, changed, discarded):
+    checkpoints = RunCheckpoints.create(runs_dir=tmp_path, config_file=config_file, inputs=INPUTS)
+    for stage in ["extract_0", "extract_1", "transform", "output"]:
+        checkpoints.save(stage, pd.DataFrame({"a": [1]}))
+
+    inputs = {**INPUTS, **changed}
+    resumed = RunCheckpoints.resume(runs_dir=tmp_path, run_id=checkpoints.run_id, config_file=config_file, inputs=inputs)
+    assert resumed.discarded == discarded
+    assert [stage for stage in ["extract_0", "extract_1", "transform", "output"] if not resumed.has(stage)] == discarded
+
+    # The state now holds the current files, so resuming again keeps the stages saved since
+    assert RunCheckpoints.resume(runs_dir=tmp_path, run_id=checkpoints.run_id, config_file=config_file, inputs=inputs).discarded == []
+
+
+def test_resume_discards_every_stage_of_a_run_without_input_hashes(tmp_path, config_file):
+    checkpoints = RunCheckpoints.create(runs_dir=tmp_path, config_file=config_file)
+    checkpoints.save("extract_0", pd.DataFrame({"a": [1]}))
+
+    resumed = RunCheckpoints.resume(runs_dir=tmp_path, run_id=checkpoints.run_id, config_file=config_file, inputs=INPUTS)
+    assert resumed.discarded == ["extract_0"]
+    assert not resumed.has("extract_0")
+
+
+def test_delete(tmp_path, config_file):
+    checkpoints = RunCheckpoints.create(runs_dir=tmp_path, config_file=config_file)
+    checkpoints.save("output", pd.DataFrame({"a": [1]}))
+    checkpoints.delete()
+    assert not checkpoints.run_dir.exists()
@@ -0,0 +1,76 @@
+import json
+import pytest
+import subprocess
+import sys
+from pathlib import Path
+
+MAIN = Path(__file__).resolve().parents[1] / "src" / "main.py"
+HEAVY_MODULES = ["pandas", "pandera", "pyarrow", "duckdb", "numpy"]
+# Runs main.py as a script and writes the names of the imported modules to the file given as its first argument
+PROBE = """
+import json, os, runpy, sys
+modules_file, main = sys.argv[1:3]
+sys.argv = sys.argv[2:]
+sys.path.insert(0, os.path.dirname(main))
+try:
+    runpy.run_path(main, run_name="__main__")
+finally:
+    with open(modules_file, "w") as f:
+        json.dump(sorted(sys.modules), f)
+"""
+
+CONFIG = """
+[details]
+project_path = "./"
+name = "startup"
+description = "Startup benchmark"
+transformer_pipeline = "transformer.py"
+
+[[extract_files]]
+data_file = "data.csv"
+schema_file = "schema.py"
+label = "data"
+
+[output]
+schema_file = "schema.py"
+output_path = "./"
+table_name = "table"
+db = "db"
+data_label = "label"
+"""
+
+
+def imported_modules(args: list[str], cwd: Path, check: bool = True) -> set[str]:
+    """Run the CLI in a fresh interpreter. Returns the names of all modules in `sys.modules` when it exits."""
+    modules_file = cwd / "modules.json"
+    subprocess.run([sys.executable, "-c", PROBE, str(modules_file), str(MAIN), *args], capture_output=True, check=check, cwd=cwd)
+    return set(json.loads(modules_file.read_text()))
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text(CONFIG)
+    return path
+
+
+def test_run_subcommand_imports_the_pipeline(tmp_path, config_file):
+    # Sanity check that the probe sees heavy imports: a dry run that fails on the missing schema still loads the pipeline
+    modules = imported_modules(["run", "--config", str(config_file), "--dry-run"], cwd=tmp_path, check=False)
+    assert "data_loader.pipeline" in modules
+    assert "pandas" in modules
+
+
+@pytest.mark.parametrize(
+    "subcommand",
+    [
+        pytest.param(lambda tmp_path, config_file: ["list", "--dir", str(tmp_path)], id="list"),
+        pytest.param(lambda tmp_path, config_file: ["validate", "--config", str(config_file)], id="validate"),
+        pytest.param(lambda tmp_path, config_file: [], id="help"),
+    ],
+)
+def test_light_subcommands_start_without_heavy_imports(subcommand, tmp_path, config_file):
+    modules = imported_modules(subcommand(tmp_path, config_file), cwd=tmp_path)
+
+    loaded = [module for module in HEAVY_MODULES if any(name == module or name.startswith(f"{module}.") for name in modules)]
+    assert loaded == []
@@ -0,0 +1,97 @@
+from data_loader.data_generator import column_spec, generate_batches, write_batches
+from data_loader.file_type_readers import read_table
+from data_loader.object_loader import load_object_from_file
+
+import pandas as pd
+import pytest
+from pathlib import Path
+from pandas.testing import assert_frame_equal
+from pandera.pandas import Check, Column, DataFrameSchema
+
+SAMPLE_SCHEMAS = sorted(Path("sample_projects").glob("**/models/*_model.py"))
+STATES = ["CA", "NY", "TX"]
+
+
+def load_schema(path: Path) -> DataFrameSchema:
+    return load_object_from_file(folder_name=path.parent.resolve(), file_name=path.name, object_name="schema")
+
+
+@pytest.mark.parametrize("schema_file", SAMPLE_SCHEMAS, ids=lambda path: path.stem)
+def test_generated_rows_pass_sample_schemas(schema_file):
+    schema = load_schema(schema_file)
+    df = pd.concat(generate_batches(schema, rows=5_000, chunksize=2_000, seed=0, null_fraction=0.1), ignore_index=True)
+    assert len(df) == 5_000
+    assert list(df.columns) == list(schema.columns)
+    schema.validate(df, lazy=True)
+    for name, column in schema.columns.items():
+        if not column.nullable:
+            assert df[name].notna().all()
+
+
+def test_column_spec_reads_checks_and_lambdas():
+    column = Column(
+        str,
+        checks=[
+            Check.isin(STATES),
+            Check.str_length(2, 2),
+            Check(lambda s: len(s) == 2 and s.isupper(), element_wise=True),
+        ],
+    )
+    spec = column_spec(column)
+    assert spec.choices == STATES
+    assert (spec.min_length, spec.max_length) == (2, 2)
+    assert spec.alphabet == "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+    spec = column_spec(Column(int, checks=[Check.in_range(10, 20), Check(lambda x: x != 15, element_wise=True)]))
+    assert (spec.min_value, spec.max_value, spec.excluded) == (10, 20, [15])
+
+
+def test_generated_rows_honor_checks_uniqueness_and_nullability():
+    schema = DataFrameSchema(
+        {
+            "id": Column(int, Check.in_range(0, 2_999), unique=True),
+            "code": Column(str, Check(lambda s: len(s) == 4 and s.isdigit(), element_wise=True), unique=True),
+            "state": Column(str, Check.isin(STATES), nullable=True),
+            "score": Column(float, [Check.gt(0), Check.le(1)], nullable=True),
+            "odd": Column(int, Check(lambda x: x % 2 == 1, element_wise=True)),
+            "joined": Column("datetime64[ns]", Check.ge(pd.Timestamp("2020-01-01"))),
+            "flag": Column(bool),
+        }
+    )
+    df = pd.concat(generate_batches(schema, rows=3_000, chunksize=1_000, seed=1, null_fraction=0.2), ignore_index=True)
+    schema.validate(df, lazy=True)
+    assert sorted(df["id"]) == list(range(3_000))
+    assert df["code"].is_unique
+    assert df["state"].isna().any() and df["score"].isna().any()
+    assert not df["odd"].isna().any()
+
+
+def test_generation_is_repeatable_with_a_seed():
+    schema = load_schema(Path("sample_projects/models/customer_model.py"))
+    first, second = (next(generate_batches(schema, rows=100, seed=3)) for _ in range(2))
+    assert_frame_equal(first, second)
+
+
+def test_unique_column_with_too_few_values_raises():
+    schema = DataFrameSchema({"state": Column(str, Check.isin(STATES), unique=True)})
+    with pytest.raises(ValueError, match="only 3 values"):
+        next(generate_batches(schema, rows=4))
+
+
+def test_impossible_checks_raise():
+    schema = DataFrameSchema({"x": Column(int, Check(lambda x: x < 0 and x > 0, element_wise=True))})
+    with pytest.raises(ValueError, match="Could not generate values for column 'x'"):
+        next(generate_batches(schema, rows=10))
+
+
+@pytest.mark.parametrize(
+    "file_format,suffix", [("csv", ".csv"), ("tsv", ".tsv"), ("parquet", ".parquet"), ("feather", ".feather"), ("excel", ".xlsx")]
+)
+def test_write_batches(tmp_path, file_format, suffix):
+    schema = DataFrameSchema({"name": Column(str, nullable=True), "amount": Column(float)})
+    batches = list(generate_batches(schema, rows=250, chunksize=100, seed=2, null_fraction=0.5))
+    path = tmp_path / f"generated{suffix}"
+    assert write_batches(batches, path=path, file_format=file_format) == 250
+    df = read_table(path)
+    assert len(df) == 250
+    schema.validate(df)
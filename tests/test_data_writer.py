@@ -1,5 +1,11 @@
-from data_loader.data_writer import write_parquet, write_duckdb, write_sqlite, write_csv, write_tsv
-
+from data_loader.data_writer import ConnectionPool, DataFrameWriter, write_parquet, write_duckdb, write_sqlite, write_csv, write_tsv
+from data_loader.file_type_readers import read_table
+
+import duckdb
+import io
+import pandas as pd
+import sqlite3
+from contextlib import closing, redirect_stdout
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import Mock, patch
@@ -308,3 +314,92 @@ def test_write_csv_appends_without_header_when_file_exists(tmp_path: Path):
     df.to_csv.assert_called_once_with(expected_file, sep=",", mode="a", index=False, header=False)
     # file should still exist after write
     assert expected_file.exists()
+
+
+def test_write_duckdb_with_connection_pool_reuses_and_keeps_connection_open(tmp_path: Path):
+    df = Mock()
+    mock_conn = Mock()
+    pool = ConnectionPool()
+    writers = [
+        SimpleNamespace(df=df, output_path=tmp_path, table_name=table_name, mode="overwrite", db="mydb", connections=pool)
+        for table_name in ["first", "second"]
+    ]
+
+    with patch("data_loader.data_writer.duckdb.connect", return_value=mock_conn) as mock_connect:
+        for writer in writers:
+            write_duckdb(writer)
+
+    mock_connect.assert_called_once_with(str(tmp_path / "mydb.duckdb"))
+    mock_conn.close.assert_not_called()
+
+    pool.close()
+    mock_conn.close.assert_called_once()
+
+
+def read_written(output_path: Path, write_method: str) -> pd.DataFrame:
+    if write_method == "duckdb":
+        with duckdb.connect(str(output_path / "db.duckdb")) as conn:
+            return conn.execute("SELECT * FROM tbl").df()
+    if write_method == "sqlite":
+        with closing(sqlite3.connect(output_path / "db.sqlite")) as conn:
+            return pd.read_sql("SELECT * FROM tbl", conn)
+    return read_table(output_path / "db" / ("tbl" if write_method == "parquet" else f"tbl.{write_method}"))
+
+
+@pytest.mark.parametrize("write_method", ["parquet", "duckdb", "sqlite", "csv", "tsv"])
+def test_static_partitions_match_an_assigned_column(tmp_path: Path, write_method: str):
+    df = pd.DataFrame({"a": [1, 2, 3], "s": ["x", "it's", None]})
+    label = "Set 1's"
+
+    def write(output_path: Path, **options):
+        output_path.mkdir()
+        for mode in ["overwrite", "append"]:
+            with redirect_stdout(io.StringIO()):
+                DataFrameWriter(output_path=output_path, write_method=write_method, db="db", table_name="tbl", mode=mode, **options).write()
+
+    write(tmp_path / "assigned", df=df.assign(data_label=label), partition_cols=["data_label"])
+    with patch("data_loader.data_writer.TEXT_CHUNK_ROWS", 2):
+        write(tmp_path / "static", df=df, static_partitions={"data_label": label})
+
+    if write_method == "parquet":
+        # Parquet rows go straight into the partition folder pyarrow would have made
+        assert [path.name for path in (tmp_path / "static" / "db" / "tbl").iterdir()] == ["data_label=Set%201%27s"]
+    assigned, static = (
+        read_written(tmp_path / folder, write_method).astype({"data_label": str}).sort_values("a", ignore_index=True)
+        for folder in ["assigned", "static"]
+    )
+    assert list(static.columns) == ["a", "s", "data_label"]
+    assert len(static) == 6
+    pd.testing.assert_frame_equal(assigned, static)
+
+
+# pyarrow writes no files for an empty partition, so a Parquet table has no columns to check until it has rows
+@pytest.mark.parametrize("write_method", ["duckdb", "sqlite", "csv", "tsv"])
+def test_static_partitions_of_an_empty_first_write(tmp_path: Path, write_method: str):
+    df = pd.DataFrame({"a": [1, 2, 3], "b": [0.5, 1.5, 2.5]})
+    for mode, data in [("overwrite", df.head(0)), ("append", df)]:
+        with redirect_stdout(io.StringIO()):
+            DataFrameWriter(
+                df=data,
+                output_path=tmp_path,
+                write_method=write_method,
+                db="db",
+                table_name="tbl",
+                mode=mode,
+                static_partitions={"data_label": "Set1"},
+            ).write()
+        written = read_written(tmp_path, write_method)
+        assert list(written.columns) == ["a", "b", "data_label"]
+
+    assert written["data_label"].astype(str).tolist() == ["Set1"] * 3
+
+
+def test_write_duckdb_adds_static_partitions_as_literals(tmp_path: Path):
+    mock_conn = Mock()
+    writer = SimpleNamespace(
+        df=Mock(), output_path=tmp_path, table_name="tbl", mode="append", db="mydb", static_partitions={"data_label": "Set1", "batch": 2}
+    )
+    with patch("data_loader.data_writer.duckdb.connect", return_value=mock_conn):
+        write_duckdb(writer)
+
+    mock_conn.execute.assert_any_call("""INSERT INTO tbl SELECT *, 'Set1' AS "data_label", 2 AS "batch" FROM tmp_df""")
@@ -0,0 +1,126 @@
+from data_loader.extract_cache import ExtractCache, hash_file
+
+import numpy as np
+import os
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+
+@pytest.fixture
+def extract_files(tmp_path):
+    data_file = tmp_path / "data.csv"
+    data_file.write_text("a,b\n1,x\n2,y\n")
+    schema_file = tmp_path / "schema.py"
+    schema_file.write_text("schema = None\n")
+    return data_file, schema_file
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame(
+        {
+            "a": pd.Series([1, 2], dtype="int64"),
+            "b": ["x", None],
+            "c": pd.to_datetime(["2024-01-01", "2024-01-02"]),
+            "d": pd.Series(["u", "v"], dtype="category"),
+        },
+        index=pd.RangeIndex(10, 12),
+    )
+
+
+def test_hash_file(extract_files):
+    data_file, _ = extract_files
+    digest = hash_file(data_file)
+    assert digest == hash_file(data_file)
+    data_file.write_text("a,b\n1,x\n")
+    assert digest != hash_file(data_file)
+
+
+def test_hash_directory(tmp_path):
+    dataset = tmp_path / "table"
+    (dataset / "data_label=Set1").mkdir(parents=True)
+    part = dataset / "data_label=Set1" / "part.parquet"
+    part.write_bytes(b"one")
+    digest = hash_file(dataset)
+    assert digest == hash_file(dataset)
+
+    part.write_bytes(b"two")
+    changed = hash_file(dataset)
+    assert changed != digest
+
+    # Moving a file to another partition changes the data even if no bytes change
+    (dataset / "data_label=Set2").mkdir()
+    part.rename(dataset / "data_label=Set2" / "part.parquet")
+    assert hash_file(dataset) != changed
+
+
+def test_key_changes_with_inputs(tmp_path, extract_files):
+    data_file, schema_file = extract_files
+    cache = ExtractCache(tmp_path / "cache")
+    key = cache.key(data_file=data_file, schema_file=schema_file, read_options={"engine": "pandas-c"})
+
+    assert key == cache.key(data_file=data_file, schema_file=schema_file, read_options={"engine": "pandas-c"})
+    assert key != cache.key(data_file=data_file, schema_file=schema_file, read_options={"engine": "pyarrow"})
+    assert key != cache.key(data_file=data_file, schema_file=schema_file, read_options={"engine": "pandas-c", "dtype": {"a": str}})
+
+    schema_file.write_text("schema = 1\n")
+    assert key != cache.key(data_file=data_file, schema_file=schema_file, read_options={"engine": "pandas-c"})
+
+
+def test_put_get_roundtrip(tmp_path, df):
+    cache = ExtractCache(tmp_path / "cache")
+    assert cache.get("key") is None
+
+    assert cache.put("key", df)
+    assert_frame_equal(cache.get("key"), df)
+
+
+def test_put_unsupported_data(tmp_path):
+    cache = ExtractCache(tmp_path / "cache")
+    assert not cache.put("key", pd.DataFrame({"a": [1, "x"]}))
+    assert cache.get("key") is None
+
+
+@pytest.mark.parametrize("missing", [np.nan, None, pd.NA, pd.NaT])
+def test_put_get_keeps_missing_values(tmp_path, missing):
+    cache = ExtractCache(tmp_path / "cache")
+    df = pd.DataFrame({"a": ["x", missing, "z"], "b": [missing] * 3, "c": [1.0, np.nan, 2.0]})
+
+    assert cache.put("key", df)
+    cached = cache.get("key")
+    assert_frame_equal(cached, df)
+    assert [str(value) for value in cached["a"]] == [str(value) for value in df["a"]]
+
+
+def test_put_mixed_missing_values(tmp_path):
+    cache = ExtractCache(tmp_path / "cache")
+    assert not cache.put("key", pd.DataFrame({"a": ["x", np.nan, None]}))
+    assert cache.get("key") is None
+
+
+def test_lru_eviction(tmp_path, df):
+    cache = ExtractCache(tmp_path / "cache")
+    for number, key in enumerate(["first", "second", "third"]):
+        cache.put(key, df)
+        path = cache.cache_dir / f"{key}.arrow"
+        os.utime(path, ns=(number * 10**9, number * 10**9))
+
+    # Reading the oldest entry makes it the most recently used
+    assert cache.get("first") is not None
+    entry_size = (cache.cache_dir / "first.arrow").stat().st_size
+    cache.max_bytes = 2 * entry_size
+
+    assert cache.evict() == 1
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+    assert cache.get("third") is not None
+
+
+def test_clear(tmp_path, df):
+    cache = ExtractCache(tmp_path / "cache")
+    assert cache.clear() == 0
+    cache.put("first", df)
+    cache.put("second", df)
+    assert cache.clear() == 2
+    assert cache.get("first") is None
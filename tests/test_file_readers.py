@@ -1,10 +1,19 @@
-from data_loader.file_type_readers import read_table, detect_file_type, UnsupportedFileTypeError
+from data_loader.file_type_readers import (
+    read_table,
+    read_table_batches,
+    detect_file,
+    detect_file_type,
+    DetectionCache,
+    UnsupportedFileTypeError,
+)
+from data_loader.models.file_detection_model import FileDetection
 
 import gzip
 
 import json
 import pandas as pd
 import pytest
+from unittest.mock import patch
 
 
 @pytest.fixture
@@ -31,6 +40,72 @@ def test_detect_file_type_excel(tmp_path):
     assert detect_file_type(file_path) == "excel"
 
 
+def test_detect_file_csv_dialect(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("a;b;c\n1;2;3\n")
+
+    assert detect_file(file_path) == FileDetection(
+        file_type="csv", delimiter=";", encoding="utf-8", header=["a", "b", "c"], temporal_columns=[]
+    )
+
+
+def test_detect_file_temporal_columns(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("id,purchase_date,note\n1,2025-02-12,x\n2,2025-01-29,y\n")
+    assert detect_file(file_path).temporal_columns == ["purchase_date"]
+
+    # A column without values in the sample may still hold dates further down
+    file_path.write_text("id,purchase_date\n1,\n")
+    assert detect_file(file_path).temporal_columns is None
+
+
+def test_detect_file_utf8_bom(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_bytes("\ufeffa,b\n1,2\n".encode("utf-8"))
+
+    detection = detect_file(file_path)
+
+    assert detection.encoding == "utf-8-sig"
+    assert detection.header == ["a", "b"]
+
+
+def test_detect_file_gzip_without_extension(tmp_path, sample_dataframe):
+    file_path = tmp_path / "data"
+    with gzip.open(file_path, "wt", encoding="utf-8") as f:
+        sample_dataframe.to_csv(f, index=False, sep="\t")
+
+    detection = detect_file(file_path)
+
+    assert (detection.file_type, detection.compression, detection.delimiter) == ("tsv", "gzip", "\t")
+    assert read_table(file_path).equals(sample_dataframe)
+
+
+def test_detect_file_feather_without_extension(tmp_path, sample_dataframe):
+    file_path = tmp_path / "data"
+    sample_dataframe.to_feather(file_path)
+
+    assert detect_file_type(file_path) == "feather"
+
+
+def test_detection_cache(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("a,b\n1,2\n")
+    cache_file = tmp_path / "cache" / "detection.json"
+
+    cache = DetectionCache(cache_file)
+    detection = detect_file(file_path, cache=cache)
+    cache.save()
+
+    # A new cache instance reads the saved results back from disk
+    reloaded = DetectionCache(cache_file)
+    assert reloaded.get(file_path) == detection
+
+    # Changing the file invalidates its entry
+    file_path.write_text("a\tb\tc\n1\t2\t3\n")
+    assert reloaded.get(file_path) is None
+    assert detect_file(file_path, cache=reloaded).header == ["a", "b", "c"]
+
+
 def test_load_csv(tmp_path, sample_dataframe):
     file_path = tmp_path / "data.csv"
     sample_dataframe.to_csv(file_path, index=False)
@@ -66,6 +141,20 @@ def test_load_parquet(tmp_path, sample_dataframe):
     assert df.equals(sample_dataframe)
 
 
+def test_load_partitioned_parquet_directory(tmp_path, sample_dataframe):
+    # The layout the Parquet writer gives an output table
+    dir_path = tmp_path / "table"
+    sample_dataframe.assign(data_label=["Set1", "Set1", "Set2"]).to_parquet(dir_path, partition_cols=["data_label"], index=False)
+
+    assert detect_file_type(dir_path) == "parquet"
+    df = read_table(dir_path, usecols=["id", "data_label"])
+    assert df["id"].tolist() == [1, 2, 3]
+    assert df["data_label"].astype(str).tolist() == ["Set1", "Set1", "Set2"]
+
+    batches = list(read_table_batches(dir_path, chunksize=2))
+    assert pd.concat(batches, ignore_index=True).equals(read_table(dir_path))
+
+
 def test_load_excel(tmp_path, sample_dataframe):
     file_path = tmp_path / "data.xlsx"
     sample_dataframe.to_excel(file_path, index=False)
@@ -111,3 +200,129 @@ def test_unsupported_file_type(tmp_path):
 def test_file_not_found():
     with pytest.raises(FileNotFoundError):
         _ = read_table("nonexistent.csv")
+
+
+@pytest.mark.parametrize(
+    "file_name,writer",
+    [
+        ("data.csv", lambda df, path: df.to_csv(path, index=False)),
+        ("data.tsv", lambda df, path: df.to_csv(path, index=False, sep="\t")),
+        ("data.parquet", lambda df, path: df.to_parquet(path, index=False)),
+        ("data.feather", lambda df, path: df.to_feather(path)),
+        ("data.xlsx", lambda df, path: df.to_excel(path, index=False)),
+    ],
+)
+def test_read_table_batches(tmp_path, file_name, writer):
+    df = pd.DataFrame({"id": range(25), "name": [f"name_{i}" for i in range(25)]})
+    file_path = tmp_path / file_name
+    writer(df, file_path)
+
+    batches = list(read_table_batches(file_path, chunksize=10))
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    combined = pd.concat(batches, ignore_index=True)
+    assert combined["id"].tolist() == list(range(25))
+    assert combined["name"].tolist() == df["name"].tolist()
+
+
+def test_read_table_batches_invalid_chunksize(tmp_path, sample_dataframe):
+    file_path = tmp_path / "data.csv"
+    sample_dataframe.to_csv(file_path, index=False)
+
+    with pytest.raises(ValueError):
+        list(read_table_batches(file_path, chunksize=0))
+
+
+@pytest.mark.parametrize("file_name,sep", [("data.csv", ","), ("data.tsv", "\t"), ("data.csv.gz", ",")])
+def test_read_table_pyarrow_engine_matches_pandas_engine(tmp_path, file_name, sep):
+    df = pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "name": ["Alice", None, "Charlie"],
+            "purchase_date": ["2025-02-12", "2025-01-29", None],
+            "value": [10.5, None, 30.1],
+        }
+    )
+    file_path = tmp_path / file_name
+    df.to_csv(file_path, index=False, sep=sep)
+
+    pandas_df = read_table(file_path, engine="pandas-c")
+    pyarrow_df = read_table(file_path, engine="pyarrow")
+
+    # Dates stay as text, as they do with the pandas engine
+    assert pyarrow_df["purchase_date"].tolist()[:2] == ["2025-02-12", "2025-01-29"]
+    pd.testing.assert_frame_equal(pyarrow_df.fillna(pd.NA), pandas_df.fillna(pd.NA))
+
+
+def test_read_table_pyarrow_engine_uses_the_detection_instead_of_reopening_the_file(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("id,purchase_date,extra\n1,2025-02-12,x\n2,2025-01-29,y\n")
+    detection = detect_file(file_path)
+
+    with patch("data_loader.file_type_readers.pa_csv.open_csv", side_effect=AssertionError("The file was opened for its schema")):
+        df = read_table(file_path, engine="pyarrow", usecols=["id", "purchase_date"], dtype={"id": "int64"}, detection=detection)
+    assert df.to_dict("list") == {"id": [1, 2], "purchase_date": ["2025-02-12", "2025-01-29"]}
+
+    # Without the columns from detection, such as for a cache entry of an older version, the schema is read from the file
+    detection = FileDetection(file_type="csv", delimiter=",", encoding="utf-8")
+    df = read_table(file_path, engine="pyarrow", usecols=["id", "purchase_date"], dtype={"id": "int64"}, detection=detection)
+    assert df.to_dict("list") == {"id": [1, 2], "purchase_date": ["2025-02-12", "2025-01-29"]}
+
+
+def test_read_table_batches_pyarrow_engine(tmp_path):
+    df = pd.DataFrame({"id": range(25), "name": [f"name_{i}" for i in range(25)]})
+    file_path = tmp_path / "data.csv"
+    df.to_csv(file_path, index=False)
+
+    batches = list(read_table_batches(file_path, chunksize=10, engine="pyarrow"))
+
+    assert all(len(batch) <= 10 for batch in batches)
+    pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True), df)
+
+
+def test_read_table_unknown_engine(tmp_path, sample_dataframe):
+    file_path = tmp_path / "data.csv"
+    sample_dataframe.to_csv(file_path, index=False)
+
+    with pytest.raises(ValueError, match="Unknown reader engine"):
+        read_table(file_path, engine="python")
+
+
+@pytest.mark.parametrize("engine", ["pandas-c", "pyarrow"])
+@pytest.mark.parametrize("file_name", ["data.csv", "data.tsv", "data.parquet", "data.feather", "data.xlsx"])
+def test_read_table_usecols_and_dtype(tmp_path, engine, file_name):
+    df = pd.DataFrame({"zip_code": ["01234", "98765"], "count": [1, 2], "extra": ["x", "y"]})
+    file_path = tmp_path / file_name
+    if file_name.endswith(".parquet"):
+        df.to_parquet(file_path, index=False)
+    elif file_name.endswith(".feather"):
+        df.to_feather(file_path)
+    elif file_name.endswith(".xlsx"):
+        df.to_excel(file_path, index=False)
+    else:
+        df.to_csv(file_path, index=False, sep="\t" if file_name.endswith(".tsv") else ",")
+
+    result = read_table(file_path, engine=engine, usecols=["zip_code", "count", "missing"], dtype={"zip_code": str, "missing": str})
+
+    assert list(result.columns) == ["zip_code", "count"]
+    assert result["zip_code"].tolist() == ["01234", "98765"]
+
+
+@pytest.mark.parametrize("engine", ["pandas-c", "pyarrow"])
+def test_read_table_dtype_falls_back_to_inferred_types(tmp_path, engine):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("id,count\na,1\nb,\n")
+
+    df = read_table(file_path, engine=engine, dtype={"count": "int64"})
+
+    assert df["count"].isna().sum() == 1
+
+
+@pytest.mark.parametrize("engine", ["pandas-c", "pyarrow"])
+def test_read_table_batches_dtype_falls_back_without_repeating_rows(tmp_path, engine):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("id,count\n" + "".join(f"{i},{i}\n" for i in range(30)) + "30,\n")
+
+    batches = list(read_table_batches(file_path, chunksize=10, engine=engine, dtype={"count": "int64"}))
+
+    assert pd.concat(batches)["id"].tolist() == list(range(31))
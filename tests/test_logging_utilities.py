@@ -0,0 +1,65 @@
+from data_loader.logging_utilties import _stop_listener, flush_logger, setup_logger
+
+import json
+import logging
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler
+
+
+@pytest.fixture
+def logger_name(request):
+    yield request.node.name
+    logger = logging.getLogger(request.node.name)
+    _stop_listener(logger)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def test_structured_logger_writes_json_lines_from_threads(tmp_path, logger_name):
+    log_file = tmp_path / "logs" / "log_file"
+    logger = setup_logger(log_file=log_file, name=logger_name, structured=True, run_id="run-1")
+    assert [type(handler) for handler in logger.handlers] == [QueueHandler]
+
+    def log(thread: int) -> None:
+        for row in range(50):
+            logger.info(f"Batch {row}", extra={"stage": f"read: {thread}", "rows": row, "duration": 0.5})
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(log, range(4)))
+    logger.info("Done")
+    flush_logger(logger)
+
+    records = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert len(records) == 201
+    assert {record["run_id"] for record in records} == {"run-1"}
+    assert {record["stage"] for record in records[:-1]} == {f"read: {thread}" for thread in range(4)}
+    assert records[0]["rows"] in range(50) and records[0]["duration"] == 0.5
+    assert records[-1]["message"] == "Done" and "stage" not in records[-1]
+
+
+def test_structured_logger_keeps_tracebacks(tmp_path, logger_name):
+    log_file = tmp_path / "log_file"
+    logger = setup_logger(log_file=log_file, name=logger_name, structured=True)
+    try:
+        raise ValueError("Bad batch")
+    except ValueError:
+        logger.exception("Read failed")
+    flush_logger(logger)
+
+    (record,) = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert record["level"] == "ERROR"
+    assert "Read failed" in record["message"] and "ValueError: Bad batch" in record["message"]
+
+
+def test_logger_switches_between_structured_and_plain(tmp_path, logger_name):
+    setup_logger(log_file=tmp_path / "first", name=logger_name, structured=True, run_id="run-1")
+    logger = setup_logger(log_file=tmp_path / "second", name=logger_name)
+    assert not any(isinstance(handler, QueueHandler) for handler in logger.handlers)
+
+    logger.info("Plain")
+    for handler in logger.handlers:
+        handler.flush()
+    assert (tmp_path / "first").read_text() == ""
+    assert "| INFO     | Plain" in (tmp_path / "second").read_text()
@@ -1,79 +1,149 @@
-from main import run_pipeline, cli
+from main import run_pipeline, cli, GENERATED_FILE_FORMATS, READER_ENGINES, SAVE_METHODS
 import pytest
-from unittest.mock import patch, Mock  # , MagicMock
+from unittest.mock import patch, Mock
 
+from data_loader.models.pipeline_run_model import PipelineRun
 
-@pytest.fixture
-def mock_config_dict():
-    mock = Mock()
-    mock.details = Mock()
-    mock.details.project_path = "/test/path"
-    mock.details.name = "Test Pipeline"
-    mock.details.description = "Test Description"
-    mock.details.transformer_pipeline = "transform.py"
 
-    mock.extract_files = [Mock()]
-    mock.extract_files[0].data_file = "test.csv"
-    mock.extract_files[0].schema_file = "schema.py"
-    mock.extract_files[0].label = "test_data"
+def test_run_pipeline_delegates_to_pipeline_module():
+    with patch("data_loader.pipeline.run_pipeline") as mock_run:
+        run_pipeline("test.toml", dry_run=True, chunksize=10)
+        mock_run.assert_called_once_with(
+            config="test.toml",
+            mode="append",
+            dry_run=True,
+            save_method="parquet",
+            chunksize=10,
+            force=False,
+            resume=None,
+            profile=False,
+            memory_limit_mb=None,
+        )
 
-    mock.output_table = Mock()
-    mock.output_table.schema_file = "output_schema.py"
-    mock.output_table.output_path = "/output/path"
-    mock.output_table.db = "test_db"
-    mock.output_table.table_name = "test_table"
-    mock.output_table.data_label = "test_label"
 
-    return mock
+def test_cli_choices_match_the_library():
+    from data_loader.data_generator import GENERATED_FILE_FORMATS as LIBRARY_FORMATS
+    from data_loader.data_writer import DataFrameWriterRegistry
+    from data_loader.file_type_readers import READER_ENGINES as LIBRARY_READER_ENGINES
 
+    assert READER_ENGINES == LIBRARY_READER_ENGINES
+    assert set(SAVE_METHODS) <= set(DataFrameWriterRegistry.available_writers())
+    assert GENERATED_FILE_FORMATS == list(LIBRARY_FORMATS)
 
-@pytest.mark.parametrize("dry_run", [True, False])
-def test_run_pipeline(mock_config_dict, dry_run):
+
+def test_cli_run_command(capsys):
+    with patch("sys.argv", ["main.py", "run", "--config", "test.toml"]), patch("main.run_pipeline") as mock_run:
+        cli()
+        mock_run.assert_called_once_with(
+            config="test.toml",
+            save_method="parquet",
+            mode="append",
+            dry_run=False,
+            chunksize=None,
+            force=False,
+            resume=None,
+            profile=False,
+            memory_limit_mb=None,
+        )
+
+
+def test_cli_run_command_chunksize():
+    with patch("sys.argv", ["main.py", "run", "--config", "test.toml", "--chunksize", "1000"]), patch("main.run_pipeline") as mock_run:
+        cli()
+        assert mock_run.call_args.kwargs["chunksize"] == 1000
+
+
+def test_cli_run_command_force():
+    with patch("sys.argv", ["main.py", "run", "--config", "test.toml", "--force"]), patch("main.run_pipeline") as mock_run:
+        cli()
+        assert mock_run.call_args.kwargs["force"] is True
+
+
+def test_cli_run_command_resume():
+    with (
+        patch("sys.argv", ["main.py", "run", "--config", "test.toml", "--resume", "2025_01_01__00_00_00__abc123"]),
+        patch("main.run_pipeline") as mock_run,
+    ):
+        cli()
+        assert mock_run.call_args.kwargs["resume"] == "2025_01_01__00_00_00__abc123"
+
+
+def test_cli_run_command_profile():
+    with (
+        patch("sys.argv", ["main.py", "run", "--config", "test.toml", "--profile"]),
+        patch("main.run_pipeline") as mock_run,
+    ):
+        cli()
+        assert mock_run.call_args.kwargs["profile"] is True
+
+
+def test_cli_run_command_memory_limit():
+    with patch("sys.argv", ["main.py", "run", "--config", "test.toml", "--memory-limit", "512"]), patch("main.run_pipeline") as mock_run:
+        cli()
+        assert mock_run.call_args.kwargs["memory_limit_mb"] == 512
+
+
+@pytest.mark.parametrize("fits", [True, False])
+def test_cli_plan_command(capsys, fits):
     with (
-        patch("main.load_pipeline_config") as mock_load_config,
-        patch("main.setup_logger") as mock_logger,
-        patch("main.read_input_data") as mock_read_data,
-        patch("main.load_object_from_file") as mock_load_object,
-        patch("main.load_transformer_function") as mock_load_transformer,
-        patch("main.DataFrameWriter") as mock_writer,
+        patch("sys.argv", ["main.py", "plan", "--config", "test.toml", "--memory-limit", "512"]),
+        patch("data_loader.pipeline.plan_pipeline") as mock_plan,
     ):
-        # Setup mocks
-        mock_load_config.return_value = mock_config_dict
-        mock_logger.return_value = Mock()
-        mock_read_data.return_value = Mock()
-        mock_load_object.return_value = Mock()
-        mock_load_transformer.return_value = lambda *args, **kwargs: Mock()
-        mock_writer.return_value = Mock()
-
-        # Run pipeline
-        run_pipeline("test_config.yaml", dry_run=dry_run)
-
-        # Verify calls
-        mock_load_config.assert_called_once()
-        mock_logger.assert_called_once()
-        mock_read_data.assert_called_once()
-        assert mock_load_object.call_count >= 2  # Called for schema and output schema
-        mock_load_transformer.assert_called_once()
-
-        if dry_run:
-            mock_writer.return_value.write.assert_not_called()
+        mock_plan.return_value.fits = fits
+        mock_plan.return_value.format_table.return_value = "Decision: read whole files"
+        if fits:
+            cli()
         else:
-            mock_writer.assert_called_once()
-            mock_writer.return_value.write.assert_called_once()
+            with pytest.raises(SystemExit):
+                cli()
+        mock_plan.assert_called_once_with(config="test.toml", memory_limit_mb=512, chunksize=None)
+        assert "Decision: read whole files" in capsys.readouterr().out
 
 
-def test_run_pipeline_config_error():
-    with patch("main.load_pipeline_config") as mock_load_config:
-        mock_load_config.side_effect = Exception("Config error")
+BATCH_CONFIG = """
+[details]
+name = "a"
+description = "test"
+project_path = "./"
+transformer_pipeline = "transformer.py"
 
-        with pytest.raises(ValueError, match="Error trying to import configuration"):
-            run_pipeline("invalid_config.yaml")
+[[extract_files]]
+data_file = "data.csv"
+schema_file = "schema.py"
+label = "data"
 
+[output]
+schema_file = "output_schema.py"
+output_path = "out"
+table_name = "a"
+db = "db"
+data_label = "test"
+"""
 
-def test_cli_run_command(capsys):
-    with patch("sys.argv", ["main.py", "run", "--config", "test.toml"]), patch("main.run_pipeline") as mock_run:
+
+@pytest.mark.parametrize("command", ["run-batch", "run-dag"])
+def test_cli_batch_command_exit_code(tmp_path, capsys, command):
+    (tmp_path / "a.toml").write_text(BATCH_CONFIG)
+    written = set()
+
+    def fake_run_pipeline(config, **kwargs):
+        # The second run finds the pipeline unchanged since its first write
+        status = "skipped" if config in written else "ok"
+        written.add(config)
+        return PipelineRun(status=status, rows=10)
+
+    argv = ["main.py", command, "--dir", str(tmp_path)]
+    with (
+        patch("sys.argv", argv),
+        patch("data_loader.batch_runner.run_pipeline", side_effect=fake_run_pipeline),
+    ):
+        cli()
         cli()
-        mock_run.assert_called_once_with(config="test.toml", save_method="parquet", mode="append", dry_run=False)
+        assert "1 pipelines: 0 ok, 0 failed, 1 skipped, 10 rows" in capsys.readouterr().out
+
+        with patch("data_loader.batch_runner.run_pipeline", side_effect=ValueError("bad data")), pytest.raises(SystemExit) as exit_info:
+            cli()
+        assert exit_info.value.code == 1
 
 
 # def test_cli_list_command(capsys):
@@ -108,13 +178,52 @@ def test_cli_validate_command(capsys):
 def test_cli_read_command(capsys):
     mock_df = Mock()
     mock_df.head.return_value = "test_data"
-    with patch("sys.argv", ["main.py", "read", "--file", "test.csv"]), patch("main.read_input_data", return_value=mock_df):
+    with (
+        patch("sys.argv", ["main.py", "read", "--file", "test.csv"]),
+        patch("data_loader.file_type_readers.read_input_data", return_value=mock_df),
+    ):
         cli()
         captured = capsys.readouterr()
         assert "test_data" in captured.out
         assert "Successfully loaded file:" in captured.out
 
 
+def test_cli_cache_clear_command(tmp_path, capsys):
+    cache_dir = tmp_path / "extracts"
+    cache_dir.mkdir()
+    (cache_dir / "a.arrow").write_bytes(b"a")
+    (cache_dir / "b.arrow").write_bytes(b"b")
+    with patch("sys.argv", ["main.py", "cache", "clear", "--dir", str(cache_dir)]):
+        cli()
+        captured = capsys.readouterr()
+        assert f"Removed 2 cached extracts from {cache_dir}" in captured.out
+        assert not list(cache_dir.iterdir())
+
+
+def test_cli_cache_clear_command_from_config(capsys):
+    mock_config_dict = Mock()
+    mock_config_dict.details.project_path = "/test/path"
+    with (
+        patch("sys.argv", ["main.py", "cache", "clear", "--config", "test.toml"]),
+        patch("main.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.extract_cache.ExtractCache") as mock_cache,
+    ):
+        mock_cache.return_value.clear.return_value = 0
+        cli()
+        assert str(mock_cache.call_args.kwargs["cache_dir"]).endswith("/test/path/.data_loader_cache/extracts")
+        mock_cache.return_value.clear.assert_called_once()
+
+
+def test_cli_generate_command(tmp_path, capsys):
+    output = tmp_path / "customers.csv"
+    argv = ["main.py", "generate", "--schema", "sample_projects/models/customer_model.py", "--rows", "50", "--format", "csv"]
+    with patch("sys.argv", argv + ["--output", str(output), "--seed", "1"]):
+        cli()
+        captured = capsys.readouterr()
+        assert "Generated 50 rows in" in captured.out
+        assert len(output.read_text().splitlines()) == 51
+
+
 def test_cli_no_command():
     with patch("sys.argv", ["main.py"]), patch("argparse.ArgumentParser.print_help") as mock_help:
         cli()
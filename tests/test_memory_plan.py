@@ -0,0 +1,105 @@
+from data_loader.file_type_readers import detect_file
+from data_loader.memory_plan import ExtractEstimate, estimate_extract, estimate_row_bytes, estimate_rows, plan_memory
+from data_loader.schema_pushdown import schema_read_options
+
+import gzip
+import numpy as np
+import pandas as pd
+import pytest
+from pandera.pandas import Column, DataFrameSchema
+
+SCHEMA = DataFrameSchema({"id": Column(int), "name": Column(str), "score": Column(float)}, coerce=True)
+
+
+@pytest.fixture
+def frame():
+    rows = 50_000
+    return pd.DataFrame({"id": np.arange(rows), "name": [f"name {i}" for i in range(rows)], "score": np.linspace(0, 1, rows)})
+
+
+@pytest.mark.parametrize(
+    "suffix,write",
+    [
+        (".csv", lambda df, path: df.to_csv(path, index=False)),
+        (".csv.gz", lambda df, path: df.to_csv(path, index=False, compression="gzip")),
+        (".parquet", lambda df, path: df.to_parquet(path, index=False)),
+        (".feather", lambda df, path: df.to_feather(path)),
+    ],
+)
+def test_estimate_extract_matches_the_frame_read(tmp_path, frame, suffix, write):
+    path = tmp_path / f"data{suffix}"
+    write(frame, path)
+    estimate = estimate_extract(
+        label="data", data_file=path, schema=SCHEMA, read_options={"engine": "pandas-c", **schema_read_options(SCHEMA)}
+    )
+    assert estimate.rows == pytest.approx(len(frame), rel=0.02)
+    assert estimate.frame_bytes == pytest.approx(frame.memory_usage(deep=True, index=False).sum(), rel=0.05)
+
+
+def test_estimate_rows_of_small_files_and_excel(tmp_path, frame):
+    csv_file, excel_file = tmp_path / "data.csv", tmp_path / "data.xlsx"
+    frame.head(10).to_csv(csv_file, index=False)
+    frame.head(10).to_excel(excel_file, index=False)
+    assert estimate_rows(csv_file, detection=detect_file(csv_file)) == 10
+    assert estimate_rows(excel_file, detection=detect_file(excel_file)) == 10
+
+
+def test_estimate_row_bytes_uses_the_declared_types():
+    sample = pd.DataFrame({"id": ["1", "2"], "name": ["a", "b"]})
+    measured = sample.memory_usage(deep=True, index=False) / len(sample)
+    assert estimate_row_bytes(sample, schema=SCHEMA) == 8 + measured["name"]
+
+
+def estimate(label: str, rows: int, row_bytes: float = 100, file_type: str = "csv") -> ExtractEstimate:
+    return ExtractEstimate(label=label, data_file=f"{label}.csv", file_type=file_type, file_bytes=0, rows=rows, row_bytes=row_bytes)
+
+
+def test_plan_memory_reads_whole_files_within_the_limit():
+    plan = plan_memory([estimate("a", 1_000), estimate("b", 1_000)], memory_limit_bytes=400_000, chunksize=None, fallback_chunksize=500)
+    assert plan.fits and plan.chunksize is None
+    assert plan.peak_bytes == 400_000
+    assert "read whole files" in plan.format_table()
+
+
+@pytest.mark.parametrize("chunksize,expected", [(None, 5_000), (2_000, 2_000), (50_000, 25_000)])
+def test_plan_memory_falls_back_to_streaming_the_first_file(chunksize, expected):
+    # A peak of twice the frames held leaves 5 MB of a 10 MB budget: 2.5 MB for the second file and 25,000 rows of the first
+    extracts = [estimate("big", 1_000_000), estimate("lookup", 25_000)]
+    plan = plan_memory(extracts, memory_limit_bytes=10_000_000, chunksize=chunksize, fallback_chunksize=5_000)
+    assert plan.fits and plan.chunksize == expected
+    assert plan.peak_bytes <= 10_000_000
+    assert f"stream 'big' in batches of {expected} rows" in plan.format_table()
+
+
+@pytest.mark.parametrize(
+    "extracts",
+    [
+        [estimate("big", 1_000_000), estimate("lookup", 60_000)],
+        [estimate("big", 1_000_000, file_type="excel")],
+    ],
+    ids=["other files exceed the limit", "excel cannot stream"],
+)
+def test_plan_memory_refuses_runs_that_cannot_fit(extracts):
+    plan = plan_memory(extracts, memory_limit_bytes=10_000_000, chunksize=None, fallback_chunksize=5_000)
+    assert not plan.fits and plan.chunksize is None
+    assert "refuse to run" in plan.format_table()
+
+
+def test_plan_memory_refuses_to_stream_a_transformer_that_cannot_run_on_batches():
+    extracts = [estimate("big", 1_000_000), estimate("lookup", 25_000)]
+    plan = plan_memory(extracts, memory_limit_bytes=10_000_000, chunksize=None, fallback_chunksize=5_000, can_stream=False)
+    assert not plan.fits and plan.chunksize is None
+    assert "the transformer cannot run on batches" in plan.format_table()
+
+    # A run that already streams only gets smaller batches
+    plan = plan_memory(extracts, memory_limit_bytes=10_000_000, chunksize=50_000, fallback_chunksize=5_000, can_stream=False)
+    assert plan.fits and plan.chunksize == 25_000
+
+
+def test_plan_memory_streams_every_file_of_a_streaming_transformer():
+    # Batches of both files share the 5 MB left of a 10 MB budget: 200 bytes per row of batch
+    extracts = [estimate("big", 1_000_000), estimate("other", 1_000_000)]
+    plan = plan_memory(extracts, memory_limit_bytes=10_000_000, chunksize=50_000, fallback_chunksize=5_000, streamed_files=2)
+    assert plan.fits and plan.chunksize == 25_000
+    assert plan.peak_bytes == 10_000_000
+    assert "stream 'big', 'other' in batches of 25000 rows" in plan.format_table()
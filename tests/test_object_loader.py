@@ -1,5 +1,6 @@
-from data_loader.object_loader import load_object_from_file
+from data_loader.object_loader import clear_module_cache, load_object_from_file
 
+import os
 import pytest
 from pathlib import Path
 from importlib.machinery import ModuleSpec
@@ -67,3 +68,65 @@ def test_import_error_when_spec_none(monkeypatch, tmp_path):
 
     with pytest.raises(ImportError):
         load_object_from_file(tmp_path, "mod.py", "a")
+
+
+def _counting_module(tmp_path: Path, value: int) -> str:
+    """Module source that appends a line to runs.txt each time it is executed."""
+    runs_file = (tmp_path / "runs.txt").as_posix()
+    return f"with open({runs_file!r}, 'a') as f:\n    f.write('run\\n')\nvalue = {value}\n"
+
+
+def _runs(tmp_path: Path) -> int:
+    return len((tmp_path / "runs.txt").read_text().splitlines())
+
+
+def test_module_executed_once_for_repeated_loads(tmp_path):
+    _write_module(tmp_path, _counting_module(tmp_path, 1))
+    first = load_object_from_file(tmp_path, "mod.py", "value")
+    second = load_object_from_file(tmp_path, "mod.py", "value")
+    assert first == second == 1
+    assert _runs(tmp_path) == 1
+
+
+def test_loads_share_objects(tmp_path):
+    _write_module(tmp_path, "items = []\n")
+    assert load_object_from_file(tmp_path, "mod.py", "items") is load_object_from_file(tmp_path, "mod.py", "items")
+
+
+def test_changed_file_is_executed_again(tmp_path):
+    path = _write_module(tmp_path, _counting_module(tmp_path, 1))
+    assert load_object_from_file(tmp_path, "mod.py", "value") == 1
+
+    path.write_text(_counting_module(tmp_path, 2))
+    # make sure the modification time differs even on filesystems with coarse timestamps
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_object_from_file(tmp_path, "mod.py", "value") == 2
+    assert _runs(tmp_path) == 2
+
+
+def test_clear_module_cache_for_one_file(tmp_path):
+    path = _write_module(tmp_path, _counting_module(tmp_path, 1))
+    load_object_from_file(tmp_path, "mod.py", "value")
+    clear_module_cache(path)
+    load_object_from_file(tmp_path, "mod.py", "value")
+    assert _runs(tmp_path) == 2
+
+
+def test_clear_module_cache_for_all_files(tmp_path):
+    _write_module(tmp_path, _counting_module(tmp_path, 1))
+    load_object_from_file(tmp_path, "mod.py", "value")
+    clear_module_cache()
+    load_object_from_file(tmp_path, "mod.py", "value")
+    assert _runs(tmp_path) == 2
+
+
+def test_failed_module_is_not_cached(tmp_path):
+    path = _write_module(tmp_path, "raise ValueError('broken')\n")
+    with pytest.raises(ValueError):
+        load_object_from_file(tmp_path, "mod.py", "a")
+
+    path.write_text("a = 1\n")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_object_from_file(tmp_path, "mod.py", "a") == 1
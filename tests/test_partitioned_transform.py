@@ -0,0 +1,125 @@
+from data_loader.partitioned_transform import Partitioning, split_inputs, transform_partitioned, transformer_partitioning
+from data_loader.transformer_loader import load_transformer_function
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+from pathlib import Path
+
+TEMPLATE_FILE = Path("src/data_loader/models/default_signature_model.py")
+
+OUTPUT_SCHEMA = """
+from pandera.pandas import Column, DataFrameSchema
+
+schema = DataFrameSchema({"customer_id": Column(str), "total": Column(float)})
+"""
+
+TRANSFORMERS = {
+    "row_local": """
+from pandas import DataFrame
+
+ROW_LOCAL = True
+
+
+def transform(*dfs: DataFrame, **kwargs) -> DataFrame:
+    df = dfs[0].copy()
+    df["customer_id"] = df["customer_id"].str.replace("C", "")
+    df["total"] = df["price"] * df["quantity"]
+    return df[["customer_id", "total"]]
+""",
+    "partition_by": """
+from pandas import DataFrame
+
+PARTITION_BY = "customer_id"
+
+
+def transform(*dfs: DataFrame, **kwargs) -> DataFrame:
+    orders, refunds = dfs
+    totals = (orders["price"] * orders["quantity"]).groupby(orders["customer_id"]).sum()
+    totals = totals.sub(refunds.groupby("customer_id")["refund"].sum(), fill_value=0)
+    return totals.rename("total").reset_index()
+""",
+}
+
+
+@pytest.fixture
+def inputs():
+    customers = [f"C{i % 37}" for i in range(1_000)]
+    orders = pd.DataFrame(
+        {"customer_id": customers, "price": [float(i % 11) for i in range(1_000)], "quantity": [i % 3 for i in range(1_000)]}
+    )
+    refunds = pd.DataFrame({"customer_id": customers[::5], "refund": 1.0})
+    return orders, refunds
+
+
+def write_transformer(tmp_path: Path, name: str) -> Path:
+    transformer_file = tmp_path / f"{name}_transformer.py"
+    transformer_file.write_text(TRANSFORMERS[name])
+    (tmp_path / "output_model.py").write_text(OUTPUT_SCHEMA)
+    return transformer_file
+
+
+@pytest.mark.parametrize("name,expected", [("row_local", Partitioning()), ("partition_by", Partitioning(partition_by="customer_id"))])
+def test_transformer_partitioning(tmp_path, name, expected):
+    func = load_transformer_function(transformer_file=write_transformer(tmp_path, name), template_file=TEMPLATE_FILE.resolve())
+    assert transformer_partitioning(func) == expected
+    assert transformer_partitioning(lambda *dfs, **kwargs: dfs[0]) is None
+
+
+def test_split_inputs_by_key_keeps_keys_together(inputs):
+    orders, refunds = inputs
+    lookup = pd.DataFrame({"currency": ["USD"]})
+    parts = split_inputs((orders, refunds, lookup), partitioning=Partitioning(partition_by="customer_id"), partitions=4)
+    assert len(parts) == 4
+    assert sum(len(part_orders) for part_orders, _, _ in parts) == len(orders)
+    for part_orders, part_refunds, part_lookup in parts:
+        assert set(part_refunds["customer_id"]) <= set(part_orders["customer_id"])
+        assert part_lookup is lookup
+    key_sets = [set(part_orders["customer_id"]) for part_orders, _, _ in parts]
+    assert sum(len(keys) for keys in key_sets) == len(set().union(*key_sets))
+
+
+def test_split_inputs_row_local_and_missing_key(inputs):
+    orders, refunds = inputs
+    parts = split_inputs((orders, refunds), partitioning=Partitioning(), partitions=3)
+    assert_frame_equal(pd.concat([part_orders for part_orders, _ in parts]), orders)
+    assert all(part_refunds is refunds for _, part_refunds in parts)
+    with pytest.raises(ValueError, match="not a column of its first input"):
+        split_inputs((orders.drop(columns="customer_id"),), partitioning=Partitioning(partition_by="customer_id"), partitions=2)
+
+
+@pytest.mark.parametrize("name", ["row_local", "partition_by"])
+def test_transform_partitioned_matches_one_process(tmp_path, inputs, name):
+    transformer_file = write_transformer(tmp_path, name)
+    func = load_transformer_function(transformer_file=transformer_file, template_file=TEMPLATE_FILE.resolve())
+    dfs = inputs if name == "partition_by" else inputs[:1]
+    output = transform_partitioned(
+        func,
+        *dfs,
+        output_schema=None,
+        partitioning=transformer_partitioning(func),
+        transformer_file=transformer_file,
+        template_file=TEMPLATE_FILE,
+        output_schema_file=tmp_path / "output_model.py",
+        max_workers=2,
+        min_partition_rows=100,
+    )
+    expected = func(*dfs, output_schema=None)
+    sort = ["customer_id", "total"]
+    assert_frame_equal(output.sort_values(sort, ignore_index=True), expected.sort_values(sort, ignore_index=True))
+
+
+def test_transform_partitioned_runs_small_inputs_in_process(inputs):
+    calls = []
+    output = transform_partitioned(
+        lambda *dfs, **kwargs: calls.append(dfs) or dfs[0],
+        *inputs,
+        output_schema=None,
+        partitioning=Partitioning(),
+        transformer_file=Path("unused.py"),
+        template_file=TEMPLATE_FILE,
+        output_schema_file=Path("unused.py"),
+        max_workers=4,
+    )
+    assert len(calls) == 1
+    assert output is inputs[0]
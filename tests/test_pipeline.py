@@ -0,0 +1,878 @@
+from data_loader.pipeline import run_pipeline
+from data_loader.logging_utilties import _stop_listener
+from data_loader.memory_plan import ExtractEstimate, MemoryBudgetError
+from data_loader.partitioned_transform import Partitioning
+from data_loader.models.pipeline_run_model import PipelineRun
+import json
+import logging
+import pandas as pd
+import pytest
+import time
+from pathlib import Path
+from unittest.mock import patch, Mock, MagicMock
+
+
+@pytest.fixture
+def mock_config_dict(tmp_path):
+    mock = Mock()
+    mock.details = Mock()
+    mock.details.project_path = str(tmp_path / "test" / "path")
+    mock.details.name = "Test Pipeline"
+    mock.details.description = "Test Description"
+    mock.details.transformer_pipeline = "transform.py"
+    mock.details.streaming = False
+    mock.details.chunksize = 100_000
+    mock.details.engine = "pandas-c"
+    mock.details.schema_pushdown = False
+    mock.details.detection_cache = False
+    mock.details.extract_cache = False
+    mock.details.extract_cache_max_mb = 1024
+    mock.details.max_workers = 1
+    mock.details.validation_engine = "pandera"
+    mock.details.validation_workers = None
+    mock.details.validation_cache = False
+    mock.details.copy_on_write = False
+    mock.details.structured_logging = False
+    mock.details.skip_unchanged = False
+    mock.details.checkpoints = False
+    mock.details.memory_limit_mb = None
+    mock.details.memory_fallback = "stream"
+    mock.details.transform_workers = 1
+
+    mock.extract_files = [Mock()]
+    mock.extract_files[0].data_file = "test.csv"
+    mock.extract_files[0].schema_file = "schema.py"
+    mock.extract_files[0].label = "test_data"
+    mock.extract_files[0].engine = None
+    mock.extract_files[0].prune_unknown_columns = False
+
+    mock.output_table = Mock()
+    mock.output_table.schema_file = "output_schema.py"
+    mock.output_table.output_path = "/output/path"
+    mock.output_table.db = "test_db"
+    mock.output_table.table_name = "test_table"
+    mock.output_table.data_label = "test_label"
+
+    return mock
+
+
+@pytest.mark.parametrize("dry_run", [True, False])
+def test_run_pipeline(mock_config_dict, dry_run):
+    with (
+        patch("data_loader.pipeline.load_pipeline_config") as mock_load_config,
+        patch("data_loader.pipeline.setup_logger") as mock_logger,
+        patch("data_loader.pipeline.read_input_data") as mock_read_data,
+        patch("data_loader.pipeline.load_object_from_file") as mock_load_object,
+        patch("data_loader.pipeline.load_transformer_function") as mock_load_transformer,
+        patch("data_loader.pipeline.DataFrameWriter") as mock_writer,
+    ):
+        # Setup mocks
+        mock_load_config.return_value = mock_config_dict
+        mock_logger.return_value = Mock()
+        mock_read_data.return_value = MagicMock()
+        mock_load_object.return_value = MagicMock()
+        mock_load_transformer.return_value = lambda *args, **kwargs: MagicMock()
+        mock_writer.return_value = Mock()
+        mock_load_object.return_value.validate.return_value.__len__.return_value = 3
+
+        # Run pipeline
+        run = run_pipeline("test_config.yaml", dry_run=dry_run)
+
+        assert run == PipelineRun(status="ok", rows=3)
+
+        # Verify calls
+        mock_load_config.assert_called_once()
+        mock_logger.assert_called_once()
+        mock_read_data.assert_called_once()
+        assert mock_load_object.call_count >= 2  # Called for schema and output schema
+        mock_load_transformer.assert_called_once()
+
+        if dry_run:
+            mock_writer.return_value.write.assert_not_called()
+        else:
+            mock_writer.assert_called_once()
+            mock_writer.return_value.write.assert_called_once()
+            # The writer adds the data label itself instead of receiving a labelled copy of the output
+            assert mock_writer.call_args.kwargs["df"] is mock_load_object.return_value.validate.return_value
+            assert mock_writer.call_args.kwargs["static_partitions"] == {"data_label": "test_label"}
+
+
+@pytest.mark.parametrize("dry_run", [True, False])
+def test_run_pipeline_streaming(mock_config_dict, dry_run):
+    with (
+        patch("data_loader.pipeline.load_pipeline_config") as mock_load_config,
+        patch("data_loader.pipeline.setup_logger") as mock_logger,
+        patch("data_loader.pipeline.read_input_data") as mock_read_data,
+        patch("data_loader.pipeline.read_input_batches") as mock_read_batches,
+        patch("data_loader.pipeline.load_object_from_file") as mock_load_object,
+        patch("data_loader.pipeline.load_transformer_function") as mock_load_transformer,
+        patch("data_loader.pipeline.DataFrameWriter") as mock_writer,
+    ):
+        mock_load_config.return_value = mock_config_dict
+        mock_logger.return_value = Mock()
+        mock_read_batches.return_value = iter([MagicMock(), MagicMock(), MagicMock()])
+        mock_load_object.return_value = MagicMock()
+        mock_load_transformer.return_value = lambda *args, **kwargs: MagicMock()
+
+        run_pipeline("test_config.yaml", mode="overwrite", dry_run=dry_run, chunksize=10)
+
+        mock_read_data.assert_not_called()
+        mock_read_batches.assert_called_once_with(path="test.csv", chunksize=10, detection_cache=None, engine="pandas-c")
+        # The transformer does not say it is row-local, so the run warns that it only sees one batch at a time
+        mock_logger.return_value.warning.assert_called_once()
+
+        if dry_run:
+            mock_writer.assert_not_called()
+        else:
+            # The first batch honours the requested mode and the rest are appended
+            assert [call.kwargs["mode"] for call in mock_writer.call_args_list] == ["overwrite", "append", "append"]
+            assert mock_writer.return_value.write.call_count == 3
+
+
+def test_run_pipeline_streaming_from_config(mock_config_dict):
+    mock_config_dict.details.streaming = True
+    mock_config_dict.details.chunksize = 500
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.read_input_batches", return_value=iter([])) as mock_read_batches,
+        patch("data_loader.pipeline.load_object_from_file"),
+        patch("data_loader.pipeline.load_transformer_function"),
+        patch("data_loader.pipeline.DataFrameWriter") as mock_writer,
+    ):
+        run_pipeline("test_config.yaml")
+
+        mock_read_batches.assert_called_once_with(path="test.csv", chunksize=500, detection_cache=None, engine="pandas-c")
+        mock_writer.assert_not_called()
+
+
+def test_run_pipeline_streaming_transformer(mock_config_dict):
+    second_input = Mock(data_file="lookup.csv", schema_file="lookup_model.py", label="lookup", engine=None, prune_unknown_columns=False)
+    mock_config_dict.extract_files = [mock_config_dict.extract_files[0], second_input]
+
+    def transform_batches(*batches, **kwargs):
+        orders, lookup = batches
+        lookup_rows = sum(len(batch) for batch in lookup)
+        for batch in orders:
+            yield batch.assign(b=batch["a"] + lookup_rows)
+
+    def read_batches(path, chunksize, **kwargs):
+        if path == "lookup.csv":
+            return iter([pd.DataFrame({"c": [1, 2, 3]})])
+        return iter([pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [3]})])
+
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.read_input_data") as mock_read_data,
+        patch("data_loader.pipeline.read_input_batches", side_effect=read_batches) as mock_read_batches,
+        patch("data_loader.pipeline.load_object_from_file") as mock_load_object,
+        patch("data_loader.pipeline.load_transformer_function", return_value=transform_batches),
+        patch("data_loader.pipeline.DataFrameWriter") as mock_writer,
+    ):
+        mock_load_object.return_value.validate.side_effect = lambda df, **kwargs: df
+        run = run_pipeline("test_config.yaml", mode="overwrite")
+
+    assert run.rows == 3
+    mock_read_data.assert_not_called()
+    # Every extract file is streamed, in batches of the config chunksize, as the transformer pulls its batches
+    assert sorted(call.kwargs["path"] for call in mock_read_batches.call_args_list) == ["lookup.csv", "test.csv"]
+    assert all(call.kwargs["chunksize"] == 100_000 for call in mock_read_batches.call_args_list)
+    assert [call.kwargs["mode"] for call in mock_writer.call_args_list] == ["overwrite", "append"]
+    assert [call.kwargs["df"]["b"].tolist() for call in mock_writer.call_args_list] == [[4, 5], [6]]
+
+
+PROJECT_FILES = {
+    "orders.csv": "order_id,customer_id,amount\n" + "".join(f"{i},C{i % 4},{i * 1.5}\n" for i in range(50)),
+    "customers.csv": "customer_id,region\nC0,north\nC1,south\nC2,east\nC3,west\n",
+    "orders_model.py": """
+from pandera.pandas import Column, DataFrameSchema
+
+schema = DataFrameSchema({"order_id": Column(int, unique=True), "customer_id": Column(str), "amount": Column(float)})
+""",
+    "customers_model.py": """
+from pandera.pandas import Column, DataFrameSchema
+
+schema = DataFrameSchema({"customer_id": Column(str, unique=True), "region": Column(str)})
+""",
+    "output_model.py": """
+from pandera.pandas import Column, DataFrameSchema
+
+schema = DataFrameSchema(
+    {"order_id": Column(int, unique=True), "customer_id": Column(str), "region": Column(str), "amount": Column(float)}
+)
+""",
+}
+
+PROJECT_CONFIG = """
+[details]
+project_path = "{project_path}"
+name = "orders"
+description = "Orders with the region of their customer"
+transformer_pipeline = "transformer.py"
+
+[[extract_files]]
+data_file = "{project_path}/orders.csv"
+schema_file = "orders_model.py"
+label = "orders"
+
+[[extract_files]]
+data_file = "{project_path}/customers.csv"
+schema_file = "customers_model.py"
+label = "customers"
+
+[output]
+schema_file = "{project_path}/output_model.py"
+output_path = "{project_path}/output"
+table_name = "orders"
+db = "db"
+data_label = "test"
+"""
+
+TRANSFORMER = """
+from pandas import DataFrame
+{declaration}
+
+def transform(*dfs: DataFrame, **kwargs) -> DataFrame:
+    orders, customers = dfs
+    return orders.merge(customers, how="left", on="customer_id")[["order_id", "customer_id", "region", "amount"]]
+"""
+
+
+def write_project(path: Path, declaration: str = "ROW_LOCAL = True") -> Path:
+    """Write a pipeline that looks up the customer of each order, and return its config file."""
+    path.mkdir(parents=True)
+    for file_name, content in PROJECT_FILES.items():
+        (path / file_name).write_text(content)
+    (path / "transformer.py").write_text(TRANSFORMER.format(declaration=declaration))
+    config_file = path / "config.toml"
+    config_file.write_text(PROJECT_CONFIG.format(project_path=path.as_posix()))
+    return config_file
+
+
+def test_run_pipeline_streaming_several_files_matches_whole_files(tmp_path):
+    outputs = {}
+    for name, chunksize in [("whole", None), ("streamed", 7)]:
+        config_file = write_project(tmp_path / name)
+        assert run_pipeline(str(config_file), mode="overwrite", save_method="csv", chunksize=chunksize).rows == 50
+        outputs[name] = pd.read_csv(tmp_path / name / "output" / "db" / "orders.csv")
+
+    assert len(outputs["streamed"]) == 50
+    assert outputs["streamed"]["region"].notna().all()
+    pd.testing.assert_frame_equal(outputs["streamed"], outputs["whole"])
+
+
+def test_run_pipeline_streaming_several_files_needs_a_row_local_transformer(tmp_path):
+    config_file = write_project(tmp_path / "project", declaration="")
+    with pytest.raises(ValueError, match="ROW_LOCAL = True"):
+        run_pipeline(str(config_file), mode="overwrite", save_method="csv", chunksize=7)
+    assert not (tmp_path / "project" / "output").exists()
+
+
+@pytest.mark.parametrize(
+    "memory_limit_mb,memory_fallback,chunksize",
+    [(1024, "stream", None), (100, "stream", 52_428), (100, "refuse", None), (1, "stream", None)],
+)
+def test_run_pipeline_memory_limit(mock_config_dict, memory_limit_mb, memory_fallback, chunksize):
+    mock_config_dict.details.memory_fallback = memory_fallback
+    estimate = ExtractEstimate(label="test_data", data_file="test.csv", file_type="csv", file_bytes=0, rows=100_000, row_bytes=1_000)
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.estimate_extract", return_value=estimate),
+        patch("data_loader.pipeline.read_input_data") as mock_read_data,
+        patch("data_loader.pipeline.read_input_batches", return_value=iter([])) as mock_read_batches,
+        patch("data_loader.pipeline.load_object_from_file"),
+        patch("data_loader.pipeline.load_transformer_function", return_value=lambda *args, **kwargs: MagicMock()),
+        patch("data_loader.pipeline.transformer_partitioning", return_value=Partitioning()),
+        patch("data_loader.pipeline.DataFrameWriter"),
+    ):
+        # The file takes about 95 MB in memory and twice that at the peak of a run, so a 100 MB limit fits batches of
+        # 50 MB, and a 1 MB limit fits fewer rows than the smallest batch
+        if memory_limit_mb == 1024 or chunksize:
+            run_pipeline("test_config.yaml", dry_run=True, memory_limit_mb=memory_limit_mb)
+        else:
+            with pytest.raises(MemoryBudgetError):
+                run_pipeline("test_config.yaml", dry_run=True, memory_limit_mb=memory_limit_mb)
+
+        if chunksize:
+            mock_read_batches.assert_called_once_with(path="test.csv", chunksize=chunksize, detection_cache=None, engine="pandas-c")
+            mock_read_data.assert_not_called()
+        elif memory_limit_mb == 1024:
+            mock_read_data.assert_called_once()
+            mock_read_batches.assert_not_called()
+        else:
+            mock_read_data.assert_not_called()
+            mock_read_batches.assert_not_called()
+
+
+@pytest.mark.parametrize("lookup_file", [False, True])
+def test_run_pipeline_memory_limit_does_not_stream_a_transformer_that_is_not_row_local(mock_config_dict, lookup_file):
+    if lookup_file:
+        lookup = Mock(data_file="lookup.csv", schema_file="schema.py", label="lookup", engine=None, prune_unknown_columns=False)
+        mock_config_dict.extract_files.append(lookup)
+    estimate = ExtractEstimate(label="test_data", data_file="test.csv", file_type="csv", file_bytes=0, rows=100_000, row_bytes=1_000)
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger") as mock_logger,
+        patch("data_loader.pipeline.estimate_extract", return_value=estimate),
+        patch("data_loader.pipeline.read_input_data") as mock_read_data,
+        patch("data_loader.pipeline.read_input_batches") as mock_read_batches,
+        patch("data_loader.pipeline.load_object_from_file"),
+        patch("data_loader.pipeline.load_transformer_function", return_value=lambda *args, **kwargs: MagicMock()),
+    ):
+        # A transformer that deduplicates or groups rows would give a different output on each batch, and batches of the
+        # first file would be joined against the whole lookup file, so the run is refused instead
+        with pytest.raises(MemoryBudgetError, match="the transformer cannot run on batches"):
+            run_pipeline("test_config.yaml", dry_run=True, memory_limit_mb=150)
+
+        mock_read_data.assert_not_called()
+        mock_read_batches.assert_not_called()
+        logged = [call.args[0] for call in mock_logger.return_value.info.call_args_list]
+        assert "Decision: refuse to run, the transformer cannot run on batches" in "\n".join(logged)
+
+
+@pytest.mark.parametrize(
+    "transform_workers,profile,chunksize,partitioned",
+    [(0, False, None, True), (4, False, None, True), (1, False, None, False), (0, True, None, False), (4, False, 10, False)],
+)
+def test_run_pipeline_partitioned_transformer(mock_config_dict, transform_workers, profile, chunksize, partitioned):
+    mock_config_dict.details.transform_workers = transform_workers
+    transform = MagicMock()
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.read_input_data"),
+        patch("data_loader.pipeline.read_input_batches", return_value=iter([MagicMock()])),
+        patch("data_loader.pipeline.load_object_from_file"),
+        patch("data_loader.pipeline.load_transformer_function", return_value=transform),
+        patch("data_loader.pipeline.transformer_partitioning", return_value=Partitioning(partition_by="customer_id")),
+        patch("data_loader.pipeline.transform_partitioned") as mock_transform_partitioned,
+    ):
+        run_pipeline("test_config.yaml", dry_run=True, profile=profile, chunksize=chunksize)
+
+        if partitioned:
+            mock_transform_partitioned.assert_called_once()
+            args, kwargs = mock_transform_partitioned.call_args
+            assert args[0] is transform
+            assert kwargs["partitioning"] == Partitioning(partition_by="customer_id")
+            assert kwargs["max_workers"] == transform_workers
+            transform.assert_not_called()
+        else:
+            mock_transform_partitioned.assert_not_called()
+            transform.assert_called_once()
+
+
+def test_run_pipeline_extract_file_engine_overrides_pipeline_engine(mock_config_dict):
+    mock_config_dict.extract_files[0].engine = "pyarrow"
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.read_input_data") as mock_read_data,
+        patch("data_loader.pipeline.load_object_from_file"),
+        patch("data_loader.pipeline.load_transformer_function", return_value=lambda *args, **kwargs: MagicMock()),
+        patch("data_loader.pipeline.DataFrameWriter"),
+    ):
+        run_pipeline("test_config.yaml", dry_run=True)
+
+        mock_read_data.assert_called_once_with(path="test.csv", detection_cache=None, engine="pyarrow")
+
+
+def test_run_pipeline_schema_pushdown(mock_config_dict):
+    mock_config_dict.details.schema_pushdown = True
+    mock_config_dict.extract_files[0].prune_unknown_columns = True
+    read_options = {"usecols": ["a"], "dtype": {"a": str}}
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.read_input_data") as mock_read_data,
+        patch("data_loader.pipeline.load_object_from_file") as mock_load_object,
+        patch("data_loader.pipeline.schema_read_options", return_value=read_options) as mock_read_options,
+        patch("data_loader.pipeline.load_transformer_function", return_value=lambda *args, **kwargs: MagicMock()),
+        patch("data_loader.pipeline.DataFrameWriter"),
+    ):
+        run_pipeline("test_config.yaml", dry_run=True)
+
+        mock_read_options.assert_called_once_with(mock_load_object.return_value, prune_unknown_columns=True)
+        mock_read_data.assert_called_once_with(path="test.csv", detection_cache=None, engine="pandas-c", usecols=["a"], dtype={"a": str})
+
+
+def test_run_pipeline_detection_cache(mock_config_dict):
+    mock_config_dict.details.detection_cache = True
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.read_input_data") as mock_read_data,
+        patch("data_loader.pipeline.DetectionCache") as mock_cache,
+        patch("data_loader.pipeline.load_object_from_file"),
+        patch("data_loader.pipeline.load_transformer_function", return_value=lambda *args, **kwargs: MagicMock()),
+        patch("data_loader.pipeline.DataFrameWriter"),
+    ):
+        run_pipeline("test_config.yaml", dry_run=True)
+
+        assert mock_read_data.call_args.kwargs["detection_cache"] is mock_cache.return_value
+        mock_cache.return_value.save.assert_called_once()
+
+
+def test_run_pipeline_parallel_extract_keeps_config_order(mock_config_dict):
+    mock_config_dict.details.max_workers = 3
+    mock_config_dict.extract_files = []
+    for number in range(3):
+        extract_file = Mock(data_file=f"test_{number}.csv", schema_file="schema.py", label=f"data_{number}", engine=None)
+        mock_config_dict.extract_files.append(extract_file)
+
+    started = []
+
+    def read_input_data(path, **kwargs):
+        # Later files finish first, so the results come back out of order
+        started.append(path)
+        time.sleep(0.05 * (3 - int(path[5])))
+        return path
+
+    schema = Mock()
+    schema.validate.side_effect = lambda data, **kwargs: f"validated_{data}"
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.read_input_data", side_effect=read_input_data),
+        patch("data_loader.pipeline.load_object_from_file", return_value=schema),
+        patch("data_loader.pipeline.load_transformer_function", return_value=MagicMock()) as mock_load_transformer,
+        patch("data_loader.pipeline.DataFrameWriter"),
+    ):
+        run_pipeline("test_config.yaml", dry_run=True)
+
+        assert sorted(started) == ["test_0.csv", "test_1.csv", "test_2.csv"]
+        assert mock_load_transformer.return_value.call_args.args == (
+            "validated_test_0.csv",
+            "validated_test_1.csv",
+            "validated_test_2.csv",
+        )
+
+
+def test_run_pipeline_extract_error_propagates(mock_config_dict):
+    mock_config_dict.details.max_workers = 2
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.read_input_data", side_effect=FileNotFoundError("test.csv")),
+        patch("data_loader.pipeline.load_object_from_file"),
+        patch("data_loader.pipeline.load_transformer_function", return_value=MagicMock()) as mock_load_transformer,
+    ):
+        with pytest.raises(FileNotFoundError):
+            run_pipeline("test_config.yaml", dry_run=True)
+        mock_load_transformer.return_value.assert_not_called()
+
+
+@pytest.mark.parametrize("cached", [True, False])
+def test_run_pipeline_extract_cache(mock_config_dict, cached):
+    mock_config_dict.details.extract_cache = True
+    cached_data = MagicMock()
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.read_input_data") as mock_read_data,
+        patch("data_loader.pipeline.ExtractCache") as mock_cache,
+        patch("data_loader.pipeline.load_object_from_file") as mock_load_object,
+        patch("data_loader.pipeline.load_transformer_function", return_value=MagicMock()) as mock_load_transformer,
+        patch("data_loader.pipeline.DataFrameWriter"),
+    ):
+        schema, output_schema = MagicMock(), MagicMock()
+        mock_load_object.side_effect = [output_schema, schema]
+        mock_cache.return_value.get.return_value = cached_data if cached else None
+        run_pipeline("test_config.yaml", dry_run=True)
+
+        assert mock_cache.call_args.kwargs["max_bytes"] == 1024 * 1024**2
+        cache_key = mock_cache.return_value.key.return_value
+        mock_cache.return_value.get.assert_called_once_with(cache_key)
+        transformer = mock_load_transformer.return_value
+        if cached:
+            mock_read_data.assert_not_called()
+            schema.validate.assert_not_called()
+            mock_cache.return_value.put.assert_not_called()
+            assert transformer.call_args.args == (cached_data,)
+        else:
+            mock_read_data.assert_called_once()
+            mock_cache.return_value.put.assert_called_once_with(cache_key, schema.validate.return_value)
+            assert transformer.call_args.args == (schema.validate.return_value,)
+
+
+def test_run_pipeline_validation_engine(mock_config_dict):
+    mock_config_dict.details.validation_engine = "parallel"
+    mock_config_dict.details.validation_workers = 4
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.read_input_data") as mock_read_data,
+        patch("data_loader.pipeline.load_object_from_file", side_effect=[Mock(), Mock()]),
+        patch("data_loader.pipeline.load_transformer_function", return_value=MagicMock()) as mock_load_transformer,
+        patch("data_loader.pipeline.validate_dataframe") as mock_validate,
+    ):
+        run_pipeline("test_config.yaml", dry_run=True)
+
+        extract_call, output_call = mock_validate.call_args_list
+        assert extract_call.kwargs["df"] is mock_read_data.return_value
+        assert str(extract_call.kwargs["schema_file"]).endswith("/test/path/schema.py")
+        assert output_call.kwargs["df"] is mock_load_transformer.return_value.return_value
+        assert str(output_call.kwargs["schema_file"]) == "output_schema.py"
+        for call in (extract_call, output_call):
+            assert call.kwargs["engine"] == "parallel"
+            assert call.kwargs["max_workers"] == 4
+
+
+@pytest.mark.parametrize("cached", [True, False])
+def test_run_pipeline_validation_cache(mock_config_dict, cached):
+    mock_config_dict.details.validation_cache = True
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.read_input_data"),
+        patch("data_loader.pipeline.load_object_from_file"),
+        patch("data_loader.pipeline.load_transformer_function", return_value=MagicMock()),
+        patch("data_loader.pipeline.is_cacheable", return_value=True),
+        patch("data_loader.pipeline.ValidationCache") as mock_cache,
+        patch("data_loader.pipeline.validate_dataframe") as mock_validate,
+    ):
+        mock_cache.return_value.contains.return_value = cached
+        run_pipeline("test_config.yaml", dry_run=True)
+
+        # The input file and the output are both looked up
+        assert mock_cache.return_value.contains.call_count == 2
+        if cached:
+            mock_validate.assert_not_called()
+            assert mock_cache.return_value.coerce.call_count == 2
+            mock_cache.return_value.record.assert_not_called()
+        else:
+            assert mock_validate.call_count == 2
+            assert mock_cache.return_value.record.call_count == 2
+        mock_cache.return_value.save.assert_called_once()
+
+
+def test_run_pipeline_validation_cache_unhashable_values(mock_config_dict):
+    mock_config_dict.details.validation_cache = True
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger") as mock_logger,
+        patch("data_loader.pipeline.read_input_data"),
+        patch("data_loader.pipeline.load_object_from_file"),
+        patch("data_loader.pipeline.load_transformer_function", return_value=MagicMock()),
+        patch("data_loader.pipeline.is_cacheable", return_value=True),
+        patch("data_loader.pipeline.ValidationCache") as mock_cache,
+        patch("data_loader.pipeline.validate_dataframe") as mock_validate,
+    ):
+        mock_cache.return_value.key.side_effect = TypeError("unhashable type: 'list'")
+        run_pipeline("test_config.yaml", dry_run=True)
+
+        # Frames that cannot be fingerprinted are validated as if the cache were off
+        assert mock_validate.call_count == 2
+        mock_cache.return_value.contains.assert_not_called()
+        mock_cache.return_value.record.assert_not_called()
+        logged = "\n".join(call.args[0] for call in mock_logger.return_value.info.call_args_list)
+        assert "Data 'test_data' holds unhashable values and is validated without the validation cache" in logged
+
+
+def test_run_pipeline_streaming_uses_validation_engine_and_cache(mock_config_dict):
+    mock_config_dict.details.validation_engine = "parallel"
+    mock_config_dict.details.validation_workers = 4
+    mock_config_dict.details.validation_cache = True
+    batches = [pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [3]})]
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.read_input_batches", return_value=iter(batches)),
+        patch("data_loader.pipeline.load_object_from_file"),
+        patch("data_loader.pipeline.load_transformer_function", return_value=lambda *dfs, **kwargs: dfs[0]),
+        patch("data_loader.pipeline.is_cacheable", return_value=True),
+        patch("data_loader.pipeline.ValidationCache") as mock_cache,
+        patch("data_loader.pipeline.validate_dataframe", side_effect=lambda df, **kwargs: df) as mock_validate,
+    ):
+        mock_cache.return_value.contains.return_value = False
+        assert run_pipeline("test_config.yaml", dry_run=True, chunksize=2).rows == 3
+
+    # Every batch and every batch of output goes through the configured engine and the validation cache, in this process
+    validated = [call.kwargs["df"] for call in mock_validate.call_args_list]
+    assert [id(df) for df in validated] == [id(batches[0]), id(batches[0]), id(batches[1]), id(batches[1])]
+    assert {call.kwargs["engine"] for call in mock_validate.call_args_list} == {"parallel"}
+    assert {call.kwargs["max_workers"] for call in mock_validate.call_args_list} == {1}
+    assert mock_cache.return_value.record.call_count == 4
+
+
+@pytest.mark.parametrize(
+    "unchanged, output_exists, force, dry_run, runs",
+    [
+        (True, True, False, False, False),
+        (True, True, True, False, True),
+        (True, False, False, False, True),
+        (False, True, False, False, True),
+        (True, True, False, True, True),
+    ],
+)
+def test_run_pipeline_skip_unchanged(mock_config_dict, unchanged, output_exists, force, dry_run, runs):
+    mock_config_dict.details.skip_unchanged = True
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.read_input_data") as mock_read_data,
+        patch("data_loader.pipeline.load_object_from_file", return_value=MagicMock()),
+        patch("data_loader.pipeline.load_transformer_function", return_value=MagicMock()),
+        patch("data_loader.pipeline.DataFrameWriter") as mock_writer,
+        patch("data_loader.pipeline.RunManifest") as mock_manifest,
+        patch("data_loader.pipeline.target_path") as mock_target_path,
+    ):
+        mock_manifest.return_value.unchanged.return_value = {"rows": 7} if unchanged else None
+        mock_target_path.return_value.exists.return_value = output_exists
+        run = run_pipeline("test_config.toml", dry_run=dry_run, force=force)
+
+        if dry_run:
+            # Dry runs write nothing, so they neither skip nor record
+            mock_manifest.assert_not_called()
+        if runs:
+            mock_read_data.assert_called_once()
+            assert run == PipelineRun(status="ok", rows=0)
+        else:
+            mock_read_data.assert_not_called()
+            mock_writer.assert_not_called()
+            assert run == PipelineRun(status="skipped", rows=7)
+        if runs and not dry_run:
+            mock_manifest.return_value.record.assert_called_once_with(
+                target=mock_manifest.target.return_value,
+                fingerprint=mock_manifest.fingerprint.return_value,
+                rows=0,
+                config_file="test_config.toml",
+            )
+        else:
+            mock_manifest.return_value.record.assert_not_called()
+
+
+@pytest.mark.parametrize("completed", [[], ["extract_0"], ["extract_0", "transform"], ["extract_0", "transform", "output"]])
+def test_run_pipeline_resume(mock_config_dict, completed):
+    stages = {stage: MagicMock(name=stage) for stage in completed}
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.read_input_data") as mock_read_data,
+        patch("data_loader.pipeline.load_object_from_file", return_value=MagicMock()) as mock_load_object,
+        patch("data_loader.pipeline.load_transformer_function", return_value=MagicMock()) as mock_load_transformer,
+        patch("data_loader.pipeline.DataFrameWriter") as mock_writer,
+        patch("data_loader.pipeline.RunCheckpoints") as mock_checkpoints,
+        patch("data_loader.pipeline.RunManifest") as mock_manifest,
+    ):
+        checkpoints = mock_checkpoints.resume.return_value
+        checkpoints.has.side_effect = lambda stage: stage in stages
+        checkpoints.load.side_effect = lambda stage: stages[stage]
+
+        run_pipeline("test_config.toml", resume="run-1")
+
+        assert mock_checkpoints.resume.call_args.kwargs["run_id"] == "run-1"
+        assert mock_checkpoints.resume.call_args.kwargs["inputs"] is mock_manifest.inputs.return_value
+        mock_checkpoints.create.assert_not_called()
+        transformer = mock_load_transformer.return_value
+        output_schema = mock_load_object.return_value
+        if "output" in completed:
+            transformer.assert_not_called()
+            output_schema.validate.assert_not_called()
+            assert mock_writer.call_args.kwargs["df"] is stages["output"]
+        elif "transform" in completed:
+            transformer.assert_not_called()
+            output_schema.validate.assert_called_once_with(stages["transform"], lazy=True)
+        elif "extract_0" in completed:
+            mock_read_data.assert_not_called()
+            assert transformer.call_args.args == (stages["extract_0"],)
+        else:
+            mock_read_data.assert_called_once()
+            saved = [call.args[0] for call in checkpoints.save.call_args_list]
+            assert saved == ["extract_0", "transform", "output"]
+        checkpoints.delete.assert_called_once()
+
+
+def test_run_pipeline_checkpoints_are_kept_when_the_write_fails(mock_config_dict):
+    mock_config_dict.details.checkpoints = True
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.read_input_data"),
+        patch("data_loader.pipeline.load_object_from_file", return_value=MagicMock()),
+        patch("data_loader.pipeline.load_transformer_function", return_value=MagicMock()),
+        patch("data_loader.pipeline.DataFrameWriter") as mock_writer,
+        patch("data_loader.pipeline.RunCheckpoints") as mock_checkpoints,
+        patch("data_loader.pipeline.RunManifest") as mock_manifest,
+    ):
+        checkpoints = mock_checkpoints.create.return_value
+        checkpoints.has.return_value = False
+        mock_writer.return_value.write.side_effect = OSError("database is locked")
+        with pytest.raises(OSError):
+            run_pipeline("test_config.toml")
+
+        assert mock_checkpoints.create.call_args.kwargs["inputs"] is mock_manifest.inputs.return_value
+        assert [call.args[0] for call in checkpoints.save.call_args_list] == ["extract_0", "transform", "output"]
+        checkpoints.delete.assert_not_called()
+
+
+def test_run_pipeline_resume_streaming(mock_config_dict):
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.load_object_from_file"),
+        patch("data_loader.pipeline.load_transformer_function", return_value=MagicMock()),
+    ):
+        with pytest.raises(ValueError, match="cannot be resumed"):
+            run_pipeline("test_config.toml", chunksize=10, resume="run-1")
+
+
+@pytest.mark.parametrize("copy_on_write", [False, True])
+def test_run_pipeline_copy_on_write(mock_config_dict, copy_on_write):
+    mock_config_dict.details.copy_on_write = copy_on_write
+    extract = pd.DataFrame({"a": [1, 2, 3]})
+    modes = []
+
+    def transform(*dfs, **kwargs):
+        modes.append(pd.get_option("mode.copy_on_write"))
+        df = dfs[0]
+        df["b"] = df["a"] * 2
+        return df
+
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.read_input_data", return_value=extract),
+        patch("data_loader.pipeline.load_object_from_file") as mock_load_object,
+        patch("data_loader.pipeline.load_transformer_function", return_value=transform),
+        patch("data_loader.pipeline.DataFrameWriter"),
+        patch("data_loader.pipeline.get_timestamp", return_value="2024_01_01__00_00_00"),
+    ):
+        mock_load_object.return_value.validate.side_effect = lambda df, **kwargs: df
+        run_pipeline("test_config.toml")
+
+    assert modes == [copy_on_write]
+    assert pd.get_option("mode.copy_on_write") is False
+    # The transformer only changes the pipeline's frame when the mode is off
+    assert list(extract.columns) == (["a"] if copy_on_write else ["a", "b"])
+
+    report_file = Path(mock_config_dict.details.project_path) / "logs" / "metrics__2024_01_01__00_00_00.json"
+    stages = {stage["stage"]: stage for stage in json.loads(report_file.read_text())["stages"]}
+    # Only the new column is new memory; without the mode it was also added to the pipeline's frame
+    assert stages["transform"]["bytes_copied"] == (24 if copy_on_write else 0)
+
+
+def test_run_pipeline_structured_logging(mock_config_dict):
+    mock_config_dict.details.structured_logging = True
+    try:
+        with (
+            patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+            patch("data_loader.pipeline.read_input_data", return_value=pd.DataFrame({"a": [1, 2, 3]})),
+            patch("data_loader.pipeline.load_object_from_file") as mock_load_object,
+            patch("data_loader.pipeline.load_transformer_function", return_value=lambda *args, **kwargs: pd.DataFrame({"a": [1, 2]})),
+            patch("data_loader.pipeline.DataFrameWriter"),
+            patch("data_loader.pipeline.get_timestamp", return_value="2024_01_01__00_00_00"),
+        ):
+            mock_load_object.return_value.validate.side_effect = lambda df, **kwargs: df
+            run_pipeline("test_config.toml")
+    finally:
+        _stop_listener(logging.getLogger("Logger"))
+
+    log_file = Path(mock_config_dict.details.project_path) / "logs" / "log_file__2024_01_01__00_00_00"
+    records = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert {record["run_id"] for record in records} == {"2024_01_01__00_00_00"}
+    stages = {record["stage"]: record for record in records if "stage" in record}
+    assert {"read: test_data", "validate: test_data", "transform", "write"} <= set(stages)
+    assert stages["read: test_data"]["rows"] == 3
+    assert stages["transform"]["rows"] == 2
+    assert stages["write"]["duration"] >= 0
+    # Records of the run are written before it returns
+    assert records[-1]["message"].startswith("Stage metrics have been saved to")
+
+
+def test_run_pipeline_stage_metrics(mock_config_dict):
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger") as mock_logger,
+        patch("data_loader.pipeline.read_input_data", return_value=pd.DataFrame({"a": [1, 2, 3]})),
+        patch("data_loader.pipeline.load_object_from_file", return_value=MagicMock()) as mock_load_object,
+        patch("data_loader.pipeline.load_transformer_function", return_value=lambda *args, **kwargs: pd.DataFrame({"a": [1, 2]})),
+        patch("data_loader.pipeline.DataFrameWriter"),
+        patch("data_loader.pipeline.get_timestamp", return_value="2024_01_01__00_00_00"),
+    ):
+        mock_load_object.return_value.validate.side_effect = lambda df, **kwargs: df
+        run_pipeline("test_config.toml")
+
+    report_file = Path(mock_config_dict.details.project_path) / "logs" / "metrics__2024_01_01__00_00_00.json"
+    report = json.loads(report_file.read_text())
+    stages = {stage["stage"]: stage for stage in report["stages"]}
+    assert report["status"] == "ok"
+    assert list(stages) == [
+        "config load",
+        "schema load: output",
+        "transformer load",
+        "schema load: test_data",
+        "read: test_data",
+        "validate: test_data",
+        "transform",
+        "validate: output",
+        "write",
+    ]
+    assert stages["read: test_data"]["rows_out"] == 3
+    assert (stages["transform"]["rows_in"], stages["transform"]["rows_out"]) == (3, 2)
+    assert stages["write"]["rows_in"] == 2
+    assert all(stage["wall_seconds"] >= 0 for stage in report["stages"])
+
+    logged = [call.args[0] for call in mock_logger.return_value.info.call_args_list]
+    assert any(line.startswith("Stage") and "Wall s" in line for line in logged)
+    assert any(line.startswith("transform ") for line in logged)
+
+
+def test_run_pipeline_stage_metrics_of_a_failed_run(mock_config_dict):
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.read_input_data", return_value=pd.DataFrame({"a": [1, 2, 3]})),
+        patch("data_loader.pipeline.load_object_from_file", return_value=MagicMock()) as mock_load_object,
+        patch("data_loader.pipeline.load_transformer_function", return_value=lambda *args, **kwargs: pd.DataFrame({"a": [1, 2]})),
+        patch("data_loader.pipeline.DataFrameWriter") as mock_writer,
+        patch("data_loader.pipeline.get_timestamp", return_value="2024_01_01__00_00_00"),
+    ):
+        mock_load_object.return_value.validate.side_effect = lambda df, **kwargs: df
+        mock_writer.return_value.write.side_effect = OSError("database is locked")
+        with pytest.raises(OSError):
+            run_pipeline("test_config.toml")
+
+    report_file = Path(mock_config_dict.details.project_path) / "logs" / "metrics__2024_01_01__00_00_00.json"
+    report = json.loads(report_file.read_text())
+    assert report["status"] == "failed"
+    # The stage that failed is reported with the stages before it
+    assert [stage["stage"] for stage in report["stages"]][-2:] == ["validate: output", "write"]
+
+
+@pytest.mark.parametrize("profile", [True, False])
+def test_run_pipeline_profile(mock_config_dict, profile):
+    with (
+        patch("data_loader.pipeline.load_pipeline_config", return_value=mock_config_dict),
+        patch("data_loader.pipeline.setup_logger"),
+        patch("data_loader.pipeline.read_input_data"),
+        patch("data_loader.pipeline.load_object_from_file"),
+        patch("data_loader.pipeline.load_transformer_function") as mock_load_transformer,
+        patch("data_loader.pipeline.TransformerProfiler") as mock_profiler,
+        patch("data_loader.pipeline.format_hot_spots", return_value=""),
+        patch("data_loader.pipeline.get_timestamp", return_value="2024_01_01__00_00_00"),
+    ):
+        profiler = mock_profiler.return_value
+        profiler.save.return_value = ("profile.pstats", "profile.collapsed")
+        run_pipeline("test_config.toml", dry_run=True, profile=profile)
+
+        if profile:
+            profiler.wrap.assert_called_once_with(mock_load_transformer.return_value)
+            profiler.wrap.return_value.assert_called_once()
+            mock_load_transformer.return_value.assert_not_called()
+            profiler.hot_spots.assert_called_once_with(Path(mock_config_dict.details.project_path) / "transform.py")
+            profiler.save.assert_called_once_with(
+                Path(mock_config_dict.details.project_path).resolve() / "logs" / "profile__2024_01_01__00_00_00"
+            )
+        else:
+            mock_profiler.assert_not_called()
+            mock_load_transformer.return_value.assert_called_once()
+
+
+def test_run_pipeline_config_error():
+    with patch("data_loader.pipeline.load_pipeline_config") as mock_load_config:
+        mock_load_config.side_effect = Exception("Config error")
+
+        with pytest.raises(ValueError, match="Error trying to import configuration"):
+            run_pipeline("invalid_config.yaml")
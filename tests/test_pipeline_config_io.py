@@ -55,6 +55,8 @@ def test_load_pipeline_config_success(tmp_path):
     assert config.extract_files[0].data_file == "/data/input1.csv"
     assert config.extract_files[1].data_file == "/data/input2.parquet"
     assert config.extract_files[2].data_file == "/data/input3.tsv"
+    # Reader options only come from the schemas when a pipeline asks for it
+    assert config.details.schema_pushdown is False
 
 
 def test_load_pipeline_config_file_not_found(tmp_path):
@@ -0,0 +1,95 @@
+from data_loader.models.pipeline_config_model import InputFile, OutputTable, PipelineConfig, PipelineDetails
+from data_loader.extract_cache import hash_file
+from data_loader.run_manifest import RunManifest, target_path
+
+import pytest
+from pathlib import Path
+
+
+@pytest.fixture
+def pipeline_files(tmp_path):
+    files = {
+        "config": tmp_path / "pipeline.toml",
+        "data": tmp_path / "data.csv",
+        "schema": tmp_path / "schema.py",
+        "transformer": tmp_path / "transformer.py",
+        "output_schema": tmp_path / "output_schema.py",
+    }
+    for name, path in files.items():
+        path.write_text(f"{name}\n")
+
+    config_dict = PipelineConfig(
+        details=PipelineDetails(project_path=str(tmp_path), name="test", description="", transformer_pipeline="transformer.py"),
+        extract_files=[InputFile(data_file=str(files["data"]), schema_file="schema.py", label="data")],
+        output_table=OutputTable(
+            schema_file=str(files["output_schema"]), output_path=str(tmp_path / "out"), table_name="table", db="db", data_label="Set1"
+        ),
+    )
+    return files, config_dict
+
+
+@pytest.mark.parametrize("changed", ["config", "data", "schema", "transformer", "output_schema"])
+def test_fingerprint_changes_with_every_input(pipeline_files, changed):
+    files, config_dict = pipeline_files
+    fingerprint = RunManifest.fingerprint(config_file=files["config"], config_dict=config_dict, save_method="parquet")
+    assert fingerprint == RunManifest.fingerprint(config_file=files["config"], config_dict=config_dict, save_method="parquet")
+
+    files[changed].write_text("changed\n")
+    assert fingerprint != RunManifest.fingerprint(config_file=files["config"], config_dict=config_dict, save_method="parquet")
+
+
+def test_fingerprint_reuses_inputs(pipeline_files):
+    files, config_dict = pipeline_files
+    inputs = RunManifest.inputs(config_file=files["config"], config_dict=config_dict)
+    assert inputs["data_files"] == [hash_file(files["data"])]
+    assert RunManifest.fingerprint(config_file=files["config"], config_dict=config_dict, save_method="parquet", inputs=inputs) == (
+        RunManifest.fingerprint(config_file=files["config"], config_dict=config_dict, save_method="parquet")
+    )
+
+
+def test_fingerprint_changes_with_target(pipeline_files):
+    files, config_dict = pipeline_files
+    fingerprint = RunManifest.fingerprint(config_file=files["config"], config_dict=config_dict, save_method="parquet")
+    assert fingerprint != RunManifest.fingerprint(config_file=files["config"], config_dict=config_dict, save_method="duckdb")
+
+    config_dict.output_table.data_label = "Set2"
+    assert fingerprint != RunManifest.fingerprint(config_file=files["config"], config_dict=config_dict, save_method="parquet")
+
+
+def test_record_and_unchanged(tmp_path):
+    manifest = RunManifest(output_path=tmp_path, db="db")
+    assert manifest.unchanged(target="target", fingerprint="abc") is None
+
+    manifest.record(target="target", fingerprint="abc", rows=10, config_file="pipeline.toml")
+    manifest.record(target="other", fingerprint="def", rows=5, config_file="other.toml")
+
+    # A new instance reads the records from disk
+    manifest = RunManifest(output_path=tmp_path, db="db")
+    assert manifest.unchanged(target="target", fingerprint="abc")["rows"] == 10
+    assert manifest.unchanged(target="target", fingerprint="changed") is None
+    assert manifest.unchanged(target="other", fingerprint="def")["config"] == "other.toml"
+    assert RunManifest(output_path=tmp_path, db="other_db").unchanged(target="target", fingerprint="abc") is None
+
+
+def test_corrupt_manifest_is_ignored(tmp_path):
+    manifest = RunManifest(output_path=tmp_path, db="db")
+    manifest.manifest_file.parent.mkdir(parents=True)
+    manifest.manifest_file.write_text("{not json")
+    assert manifest.unchanged(target="target", fingerprint="abc") is None
+
+    manifest.record(target="target", fingerprint="abc", rows=1, config_file="pipeline.toml")
+    assert manifest.unchanged(target="target", fingerprint="abc") is not None
+
+
+@pytest.mark.parametrize(
+    "save_method, expected",
+    [
+        ("parquet", "out/db/table"),
+        ("duckdb", "out/db.duckdb"),
+        ("sqlite", "out/db.sqlite"),
+        ("csv", "out/db/table.csv"),
+        ("tsv", "out/db/table.tsv"),
+    ],
+)
+def test_target_path(save_method, expected):
+    assert target_path("out", db="db", table_name="table", save_method=save_method) == Path(expected)
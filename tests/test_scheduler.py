@@ -0,0 +1,205 @@
+from data_loader.models.pipeline_run_model import PipelineRun
+from data_loader.pipeline_config_io import load_pipeline_config
+from data_loader.scheduler import build_dag, run_dag
+
+import graphlib
+import pytest
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+
+CONFIG = """
+[details]
+name = "{name}"
+description = "test"
+project_path = "./"
+transformer_pipeline = "transformer.py"
+
+[[extract_files]]
+data_file = "data.csv"
+schema_file = "schema.py"
+label = "data"
+{extra_files}
+[output]
+schema_file = "output_schema.py"
+output_path = "{output_path}"
+table_name = "{name}"
+db = "db"
+data_label = "test"
+"""
+
+DEPENDENT_FILE = """
+[[extract_files]]
+data_file = "{data_file}"
+schema_file = "schema.py"
+label = "{depends_on} output"
+depends_on = "{depends_on}"
+"""
+
+
+def _write_config(config_dir: Path, name: str, depends_on: list[str] = (), output_path: str | None = None) -> Path:
+    extra_files = "".join(
+        DEPENDENT_FILE.format(data_file=f"out_{dependency}/db/{dependency}", depends_on=dependency) for dependency in depends_on
+    )
+    path = config_dir / f"{name}.toml"
+    path.write_text(CONFIG.format(name=name, output_path=output_path or f"out_{name}", extra_files=extra_files))
+    return path
+
+
+def _run(config_dir: Path, workers: int, fail: tuple[str, ...] = (), unchanged: tuple[str, ...] = ()) -> tuple[list, list[str]]:
+    """Run the DAG with a fake run_pipeline that records the order pipelines start in."""
+    started = []
+    lock = threading.Lock()
+
+    def fake_run_pipeline(config, **kwargs):
+        with lock:
+            started.append(Path(config).stem)
+        load_pipeline_config(path=Path(config))
+        if Path(config).stem in fail:
+            raise ValueError("bad data")
+        return PipelineRun(status="skipped" if Path(config).stem in unchanged else "ok", rows=1)
+
+    with (
+        patch("data_loader.batch_runner.run_pipeline", side_effect=fake_run_pipeline),
+        patch("data_loader.scheduler.ProcessPoolExecutor", lambda max_workers, mp_context: ThreadPoolExecutor(max_workers)),
+    ):
+        results = run_dag(config_dir=config_dir, workers=workers, save_method="parquet")
+    return results, started
+
+
+def test_build_dag(tmp_path):
+    first = _write_config(tmp_path, "first")
+    second = _write_config(tmp_path, "second")
+    aggregate = _write_config(tmp_path, "aggregate", depends_on=["first", "second"])
+
+    assert build_dag([first, second, aggregate]) == {first: set(), second: set(), aggregate: {first, second}}
+
+
+def test_build_dag_unknown_dependency(tmp_path):
+    config = _write_config(tmp_path, "aggregate", depends_on=["missing"])
+    with pytest.raises(ValueError, match="unknown pipeline 'missing'"):
+        build_dag([config])
+
+
+def test_build_dag_unreadable_configs(tmp_path):
+    invalid = tmp_path / "invalid.toml"
+    invalid.write_text('[details]\nname = "invalid"\n')
+    broken = tmp_path / "broken.toml"
+    broken.write_text("not toml [")
+    report = _write_config(tmp_path, "report", depends_on=["invalid"])
+    other = _write_config(tmp_path, "other", depends_on=["missing"])
+
+    # A file that is not valid TOML may be the unknown pipeline
+    assert build_dag([invalid, broken, report, other]) == {invalid: set(), broken: set(), report: {invalid}, other: {broken}}
+
+
+def test_build_dag_duplicate_name(tmp_path):
+    first = _write_config(tmp_path, "first")
+    copy = tmp_path / "copy.toml"
+    copy.write_text(first.read_text())
+    with pytest.raises(ValueError, match="is used by both"):
+        build_dag([first, copy])
+
+
+def test_run_dag_cycle(tmp_path):
+    _write_config(tmp_path, "first", depends_on=["second"])
+    _write_config(tmp_path, "second", depends_on=["first"])
+    with pytest.raises(graphlib.CycleError):
+        _run(tmp_path, workers=1)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_run_dag_respects_dependencies(tmp_path, workers):
+    _write_config(tmp_path, "set1")
+    _write_config(tmp_path, "set2")
+    _write_config(tmp_path, "aggregate", depends_on=["set1", "set2"])
+    _write_config(tmp_path, "report", depends_on=["aggregate"])
+
+    results, started = _run(tmp_path, workers=workers)
+
+    assert [(Path(result.config).stem, result.status) for result in results] == [
+        ("aggregate", "ok"),
+        ("report", "ok"),
+        ("set1", "ok"),
+        ("set2", "ok"),
+    ]
+    assert set(started[:2]) == {"set1", "set2"}
+    assert started[2:] == ["aggregate", "report"]
+
+
+def test_run_dag_skips_pipelines_downstream_of_a_failure(tmp_path):
+    _write_config(tmp_path, "set1")
+    _write_config(tmp_path, "set2")
+    _write_config(tmp_path, "aggregate", depends_on=["set1", "set2"])
+    _write_config(tmp_path, "report", depends_on=["aggregate"])
+    _write_config(tmp_path, "other", depends_on=["set2"])
+
+    results, started = _run(tmp_path, workers=2, fail=("set1",))
+
+    statuses = {Path(result.config).stem: result for result in results}
+    assert {name: result.status for name, result in statuses.items()} == {
+        "aggregate": "skipped",
+        "other": "ok",
+        "report": "skipped",
+        "set1": "failed",
+        "set2": "ok",
+    }
+    assert statuses["aggregate"].error == "Upstream pipeline did not succeed: set1.toml"
+    assert statuses["report"].error == "Upstream pipeline did not succeed: aggregate.toml"
+    assert "aggregate" not in started and "report" not in started
+
+
+def test_run_dag_reports_unreadable_configs(tmp_path):
+    (tmp_path / "invalid.toml").write_text('[details]\nname = "invalid"\n')
+    _write_config(tmp_path, "set1")
+    _write_config(tmp_path, "report", depends_on=["invalid"])
+
+    results, started = _run(tmp_path, workers=1)
+
+    statuses = {Path(result.config).stem: result for result in results}
+    assert {name: result.status for name, result in statuses.items()} == {"invalid": "failed", "report": "skipped", "set1": "ok"}
+    assert statuses["report"].error == "Upstream pipeline did not succeed: invalid.toml"
+    assert "report" not in started
+
+
+def test_run_dag_runs_pipelines_downstream_of_an_unchanged_pipeline(tmp_path):
+    _write_config(tmp_path, "set1")
+    _write_config(tmp_path, "report", depends_on=["set1"])
+
+    results, started = _run(tmp_path, workers=1, unchanged=("set1",))
+
+    assert [(Path(result.config).stem, result.status, result.error) for result in results] == [
+        ("report", "ok", None),
+        ("set1", "skipped", None),
+    ]
+    assert started == ["set1", "report"]
+
+
+def test_run_dag_never_runs_pipelines_with_the_same_output_together(tmp_path):
+    for name in ["a", "b", "c"]:
+        _write_config(tmp_path, name, output_path="shared")
+
+    running = []
+    overlaps = []
+    lock = threading.Lock()
+
+    def fake_run_pipeline(config, **kwargs):
+        with lock:
+            if running:
+                overlaps.append(Path(config).stem)
+            running.append(config)
+        threading.Event().wait(0.05)
+        with lock:
+            running.remove(config)
+        return PipelineRun(status="ok", rows=1)
+
+    with (
+        patch("data_loader.batch_runner.run_pipeline", side_effect=fake_run_pipeline),
+        patch("data_loader.scheduler.ProcessPoolExecutor", lambda max_workers, mp_context: ThreadPoolExecutor(max_workers)),
+    ):
+        results = run_dag(config_dir=tmp_path, workers=3)
+
+    assert [result.status for result in results] == ["ok", "ok", "ok"]
+    assert overlaps == []
@@ -0,0 +1,40 @@
+from data_loader.schema_pushdown import schema_read_options, column_read_dtype
+
+import numpy as np
+from pandera.pandas import DataFrameSchema, Column
+
+
+def test_column_read_dtype_only_for_coerced_columns():
+    assert column_read_dtype(Column(str, coerce=True), coerce=False) is str
+    assert column_read_dtype(Column(str), coerce=True) is str
+    assert column_read_dtype(Column(str), coerce=False) is None
+
+
+def test_column_read_dtype_numeric_and_other_types():
+    assert column_read_dtype(Column("float64"), coerce=True) == np.dtype("float64")
+    assert column_read_dtype(Column(bool), coerce=True) == np.dtype("bool")
+    assert column_read_dtype(Column(int, nullable=False), coerce=True) == np.dtype("int64")
+    # Nulls cannot be held by a numpy integer dtype
+    assert column_read_dtype(Column(int, nullable=True), coerce=True) is None
+    assert column_read_dtype(Column("datetime64[ns]"), coerce=True) is None
+    assert column_read_dtype(Column("object"), coerce=True) is None
+    assert column_read_dtype(Column(str, regex=True), coerce=True) is None
+
+
+def test_schema_read_options_dtype():
+    schema = DataFrameSchema({"id": Column(str), "cost": Column("float64"), "date": Column("datetime64[ns]")}, coerce=True)
+
+    options = schema_read_options(schema)
+
+    assert options["usecols"] is None
+    assert options["dtype"] == {"id": str, "cost": np.dtype("float64")}
+
+
+def test_schema_read_options_prune_unknown_columns():
+    columns = {"id": Column(str), "cost": Column("float64")}
+
+    assert schema_read_options(DataFrameSchema(columns, strict=False), prune_unknown_columns=True)["usecols"] == ["id", "cost"]
+    assert schema_read_options(DataFrameSchema(columns, strict="filter"), prune_unknown_columns=True)["usecols"] == ["id", "cost"]
+    assert schema_read_options(DataFrameSchema(columns, strict=False), prune_unknown_columns=False)["usecols"] is None
+    # A strict schema must see the unknown columns to reject them
+    assert schema_read_options(DataFrameSchema(columns, strict=True), prune_unknown_columns=True)["usecols"] is None
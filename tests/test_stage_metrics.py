@@ -0,0 +1,102 @@
+from data_loader.stage_metrics import StageRecorder, WrittenFiles, bytes_copied, path_size
+
+import json
+import numpy as np
+import pandas as pd
+import pytest
+import time
+
+
+def test_stage_records_time_and_rows():
+    metrics = StageRecorder()
+    with metrics.stage("transform", rows_in=10) as stage:
+        time.sleep(0.01)
+        stage.rows_out = 5
+
+    [recorded] = metrics.report()["stages"]
+    assert recorded["stage"] == "transform"
+    assert recorded["calls"] == 1
+    assert recorded["wall_seconds"] >= 0.01
+    assert recorded["cpu_seconds"] >= 0
+    assert (recorded["rows_in"], recorded["rows_out"]) == (10, 5)
+    assert recorded["bytes_read"] is None
+
+
+def test_stage_is_recorded_when_it_raises():
+    metrics = StageRecorder()
+    with pytest.raises(ValueError):
+        with metrics.stage("validate: output"):
+            raise ValueError("check failed")
+    assert metrics.stages["validate: output"].calls == 1
+
+
+def test_calls_of_a_stage_are_added_up():
+    metrics = StageRecorder()
+    for rows in [3, 4]:
+        with metrics.stage("write", rows_in=rows) as stage:
+            stage.bytes_written = 100
+    with metrics.stage("config load"):
+        pass
+
+    report = metrics.report(status="ok")
+    assert report["status"] == "ok"
+    assert [stage["stage"] for stage in report["stages"]] == ["write", "config load"]
+    assert report["stages"][0]["calls"] == 2
+    assert report["stages"][0]["rows_in"] == 7
+    assert report["stages"][0]["bytes_written"] == 200
+
+
+def test_iterate_measures_every_batch():
+    metrics = StageRecorder()
+    batches = list(metrics.iterate("read: data", [[1, 2], [3]], bytes_read=50))
+
+    assert batches == [[1, 2], [3]]
+    read = metrics.stages["read: data"]
+    assert read.calls == 2
+    assert read.rows_out == 3
+    assert read.bytes_read == 50
+
+
+def test_write_report_and_format_table(tmp_path):
+    metrics = StageRecorder()
+    with metrics.stage("read: customers", bytes_read=2 * 1024**2) as stage:
+        stage.rows_out = 100
+
+    metrics.write_report(tmp_path / "logs" / "metrics.json", config="pipeline.toml")
+    report = json.loads((tmp_path / "logs" / "metrics.json").read_text())
+    assert report["config"] == "pipeline.toml"
+    assert report["stages"][0]["rows_out"] == 100
+
+    header, line = metrics.format_table().splitlines()
+    assert header.split()[:3] == ["Stage", "Calls", "Wall"]
+    assert line.startswith("read: customers")
+    assert "2.0" in line.split()
+
+
+def test_path_size_and_bytes_written(tmp_path):
+    folder = tmp_path / "table"
+    folder.mkdir()
+    (folder / "part-0.parquet").write_bytes(b"x" * 10)
+    assert path_size(folder) == 10
+    assert path_size(folder / "part-0.parquet") == 10
+    assert path_size(tmp_path / "missing") == 0
+
+    written_files = WrittenFiles(folder)
+    (folder / "part-1.parquet").write_bytes(b"y" * 5)
+    assert written_files.bytes_written() == 5
+    # Each write counts the files it created or modified since the previous one
+    (folder / "part-2.parquet").write_bytes(b"z" * 3)
+    assert written_files.bytes_written() == 3
+    assert written_files.bytes_written() == 0
+    assert WrittenFiles(tmp_path / "missing").bytes_written() == 0
+
+
+@pytest.mark.parametrize("copy_on_write", [False, True])
+def test_bytes_copied(copy_on_write):
+    with pd.option_context("mode.copy_on_write", copy_on_write):
+        df = pd.DataFrame({"a": np.arange(100), "b": np.arange(100.0), "c": pd.array(range(100), dtype="Int64")})
+        assert bytes_copied(df.copy(), sources=[df]) == 800 + 800 + 900
+        assert bytes_copied(df.iloc[:50], sources=[df]) == 0
+        assert bytes_copied(df[["a"]].assign(d=1), sources=[df]) == (800 if copy_on_write else 1600)
+        assert bytes_copied(df.rename(columns={"a": "z"}), sources=[df]) == (0 if copy_on_write else 2500)
+    assert bytes_copied(df, sources=[]) == 2500
@@ -4,6 +4,7 @@ from pathlib import Path
 
 from inspect import Parameter, Signature
 from data_loader.transformer_loader import get_signature, compare_signatures, load_transformer_function, ParameterMismatchError
+from data_loader.transformer_loader import TransformerSignatureRegistry, is_streaming_transformer
 # import from src.utilities.transformer_loader
 
 TRANSFORMER_LOADER_PATH = "data_loader.transformer_loader"
@@ -174,3 +175,28 @@ def test_load_transformer_function_transformer_load_error(monkeypatch):
 
 #     with pytest.raises(ValueError, match="Missing signature for transform function"):
 #         load_transformer_function(Path("/path/transformer.py"), Path("/path/template.py"))
+
+
+def test_load_transformer_function_streaming_signature(tmp_path):
+    transformer_file = tmp_path / "transformer.py"
+    transformer_file.write_text(
+        "from pandas import DataFrame\n"
+        "from typing import Iterator\n\n"
+        "def transform_batches(*batches: Iterator[DataFrame], **kwargs) -> Iterator[DataFrame]:\n"
+        "    yield from batches[0]\n"
+    )
+    template_file = Path("src/data_loader/models/default_signature_model.py").resolve()
+
+    func = load_transformer_function(transformer_file, template_file)
+    assert func.__name__ == "transform_batches"
+    assert is_streaming_transformer(func)
+    assert TransformerSignatureRegistry.available_signatures() == ["transform", "transform_batches"]
+
+
+def test_load_transformer_function_no_registered_name(tmp_path):
+    transformer_file = tmp_path / "transformer.py"
+    transformer_file.write_text("def run(*dfs, **kwargs):\n    pass\n")
+    template_file = Path("src/data_loader/models/default_signature_model.py").resolve()
+
+    with pytest.raises(ValueError, match="defines none of: transform, transform_batches"):
+        load_transformer_function(transformer_file, template_file)
@@ -0,0 +1,79 @@
+from data_loader.object_loader import load_object_from_file
+from data_loader.transformer_profiler import TransformerProfiler, format_hot_spots
+
+import pstats
+import pytest
+import signal
+import time
+
+TRANSFORMER = """
+def busy(n):
+    return sum(i * i for i in range(n))
+
+
+def transform(seconds):
+    end = __import__("time").process_time() + seconds
+    while __import__("time").process_time() < end:
+        busy(1000)
+    return list(map(lambda value: value + 1, range(10)))
+"""
+
+
+@pytest.fixture
+def transformer_file(tmp_path):
+    path = tmp_path / "transformer.py"
+    path.write_text(TRANSFORMER)
+    return path
+
+
+def test_hot_spots_of_the_transformer_file(transformer_file):
+    profiler = TransformerProfiler()
+    transform = profiler.wrap(load_object_from_file(transformer_file.parent, transformer_file.name, "transform"))
+
+    assert transform(0.01) == list(range(1, 11))
+    assert transform(0.01) == list(range(1, 11))
+
+    spots = {function: (line, calls) for function, line, calls, _, _ in profiler.hot_spots(transformer_file)}
+    assert profiler.calls == 2
+    assert spots["transform"] == (6, 2)
+    assert spots["<lambda>"] == (10, 20)
+    assert "busy" in spots
+    assert "profiled" not in spots
+    assert format_hot_spots(profiler.hot_spots(transformer_file)).splitlines()[0].split()[0] == "Function"
+
+
+requires_setitimer = pytest.mark.skipif(not hasattr(signal, "setitimer"), reason="Sampling needs signal.setitimer")
+
+
+@requires_setitimer
+def test_save_pstats_and_collapsed_stacks(tmp_path, transformer_file):
+    profiler = TransformerProfiler(interval=0.001)
+    transform = profiler.wrap(load_object_from_file(transformer_file.parent, transformer_file.name, "transform"))
+    transform(0.1)
+
+    stats_file, stacks_file = profiler.save(tmp_path / "logs" / "profile")
+    assert stats_file.name == "profile.pstats"
+    assert any(function == "busy" for _, _, function in pstats.Stats(str(stats_file)).stats)
+
+    lines = stacks_file.read_text().splitlines()
+    assert lines
+    for line in lines:
+        stack, weight = line.rsplit(" ", 1)
+        # Stacks start at the transformer, not at the code that called it
+        assert stack.startswith("transform (transformer.py:")
+        assert int(weight) > 0
+
+
+@requires_setitimer
+def test_running_restores_the_signal_handler():
+    def handler(signum, frame):
+        pass
+
+    previous = signal.signal(signal.SIGPROF, handler)
+    try:
+        with TransformerProfiler().running():
+            time.sleep(0)
+        assert signal.getsignal(signal.SIGPROF) is handler
+        assert signal.getitimer(signal.ITIMER_PROF) == (0.0, 0.0)
+    finally:
+        signal.signal(signal.SIGPROF, previous)
@@ -0,0 +1,88 @@
+from data_loader.validation_cache import ValidationCache, frame_fingerprint, is_cacheable
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+from pandera.pandas import Column, DataFrameSchema
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", None]})
+
+
+@pytest.fixture
+def schema_file(tmp_path):
+    path = tmp_path / "schema.py"
+    path.write_text("schema = None\n")
+    return path
+
+
+def test_frame_fingerprint(df):
+    fingerprint = frame_fingerprint(df)
+    assert fingerprint == frame_fingerprint(df.copy())
+    assert fingerprint != frame_fingerprint(df.assign(a=[1, 2, 4]))
+    assert fingerprint != frame_fingerprint(df.astype({"a": "float64"}))
+    assert fingerprint != frame_fingerprint(df.rename(columns={"b": "c"}))
+    assert fingerprint != frame_fingerprint(df.set_axis([1, 2, 3]))
+
+
+def test_key_changes_with_schema(tmp_path, df, schema_file):
+    cache = ValidationCache(tmp_path / "validation.json")
+    key = cache.key(df=df, schema_file=schema_file)
+    assert key == cache.key(df=df, schema_file=schema_file)
+    schema_file.write_text("schema = 1\n")
+    assert key != cache.key(df=df, schema_file=schema_file)
+
+
+def test_key_unhashable_values(tmp_path, df, schema_file):
+    cache = ValidationCache(tmp_path / "validation.json")
+    with pytest.raises(TypeError):
+        cache.key(df=df.assign(b=[[1], {"x": 1}, None]), schema_file=schema_file)
+
+
+def test_record_and_save(tmp_path):
+    cache_file = tmp_path / "cache" / "validation.json"
+    cache = ValidationCache(cache_file)
+    assert not cache.contains("key")
+    cache.record("key")
+    assert cache.contains("key")
+    cache.save()
+
+    assert ValidationCache(cache_file).contains("key")
+    assert not ValidationCache(cache_file).contains("other")
+
+
+def test_save_keeps_most_recent_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr("data_loader.validation_cache.MAX_ENTRIES", 2)
+    cache = ValidationCache(tmp_path / "validation.json")
+    for key in ["first", "second", "third"]:
+        cache.record(key)
+    cache.contains("first")
+    cache.save()
+
+    reloaded = ValidationCache(tmp_path / "validation.json")
+    assert reloaded.contains("first") and reloaded.contains("third")
+    assert not reloaded.contains("second")
+
+
+def test_coerce_matches_validate(df):
+    schema = DataFrameSchema({"a": Column(float, coerce=True), "b": Column(str, nullable=True, coerce=True)})
+    original = df.copy()
+    assert_frame_equal(ValidationCache.coerce(df, schema), schema.validate(df))
+    assert_frame_equal(df, original)
+
+
+@pytest.mark.parametrize(
+    "schema, cacheable",
+    [
+        (DataFrameSchema({"a": Column(int)}, coerce=True), True),
+        (DataFrameSchema({"a": Column(int)}, strict="filter"), False),
+        (DataFrameSchema({"a": Column(int)}, add_missing_columns=True), True),
+        (DataFrameSchema({"a": Column(int), "c": Column(int)}, add_missing_columns=True), False),
+        (DataFrameSchema({"a": Column(int)}, drop_invalid_rows=True), False),
+        (DataFrameSchema({"a": Column(int, default=0)}), False),
+    ],
+)
+def test_is_cacheable(schema, cacheable, df):
+    assert is_cacheable(schema, df) is cacheable
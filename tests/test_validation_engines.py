@@ -0,0 +1,133 @@
+from data_loader.validation_engines import ValidationEngineRegistry, split_schema, validate_dataframe
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+from pandera.errors import SchemaErrors
+from pandera.pandas import Check, Column, DataFrameSchema
+
+SCHEMA_SOURCE = """
+from pandera.pandas import DataFrameSchema, Column, Check
+
+schema = DataFrameSchema(
+    columns={
+        "id": Column(dtype=str, unique=True, coerce=True),
+        "code": Column(dtype=str, checks=[Check(lambda s: len(s) == 5, element_wise=True, name="five_digits")], coerce=True),
+        "sex": Column(dtype=str, checks=Check.isin(["M", "F"]), coerce=True),
+        "amount": Column(dtype=float, coerce=True),
+    },
+    coerce=True,
+    report_duplicates="all",
+)
+"""
+
+
+@pytest.fixture
+def schema_file(tmp_path):
+    path = tmp_path / "schema.py"
+    path.write_text(SCHEMA_SOURCE)
+    return path
+
+
+@pytest.fixture
+def schema(schema_file):
+    namespace = {}
+    exec(SCHEMA_SOURCE, namespace)
+    return namespace["schema"]
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame(
+        {
+            "id": range(40),
+            "code": ["12345"] * 40,
+            "sex": ["M", "F"] * 20,
+            "amount": range(40),
+        }
+    )
+
+
+def test_registry():
+    assert {"pandera", "parallel", "compiled"} <= set(ValidationEngineRegistry.available_engines())
+    with pytest.raises(ValueError, match="No validation engine registered for 'missing'"):
+        ValidationEngineRegistry.get_engine("missing")
+
+
+def test_split_schema():
+    schema = DataFrameSchema(
+        columns={
+            "a": Column(int, checks=[Check.ge(0), Check(lambda s: s.mean() > 0)], unique=True),
+            "b": Column(str, checks=Check(lambda v: v != "", element_wise=True)),
+        },
+        checks=[Check(lambda df: len(df) > 0)],
+        unique=["a", "b"],
+    )
+    partition_schema, global_schema = split_schema(schema)
+
+    assert [check.name for check in partition_schema.columns["a"].checks] == ["greater_than_or_equal_to"]
+    assert not partition_schema.columns["a"].unique
+    assert len(partition_schema.columns["b"].checks) == 1
+    assert partition_schema.checks == [] and partition_schema.unique is None
+
+    assert list(global_schema.columns) == ["a"]
+    assert global_schema.columns["a"].unique
+    assert [check.name for check in global_schema.columns["a"].checks] == ["<lambda>"]
+    assert len(global_schema.checks) == 1
+    assert global_schema.unique == ["a", "b"]
+
+    # The original schema is left untouched
+    assert len(schema.columns["a"].checks) == 2 and schema.columns["a"].unique
+
+
+def test_split_schema_row_local_only():
+    _, global_schema = split_schema(DataFrameSchema({"a": Column(int, checks=Check.isin([1, 2]))}))
+    assert global_schema is None
+
+
+def test_pandera_engine(schema, schema_file, df):
+    assert_frame_equal(validate_dataframe(df, schema, schema_file), schema.validate(df))
+    with pytest.raises(SchemaErrors):
+        validate_dataframe(df.assign(sex="X"), schema, schema_file)
+
+
+@pytest.mark.parametrize("engine", ValidationEngineRegistry.available_engines())
+def test_engines_raise_the_same_errors(schema, schema_file, df, engine):
+    df.loc[3, "code"] = "1"
+    df.loc[35, "sex"] = "X"
+
+    with pytest.raises(SchemaErrors) as errors:
+        validate_dataframe(df, schema, schema_file, engine=engine, max_workers=2, min_partition_rows=10)
+
+    failure_cases = errors.value.failure_cases
+    assert set(zip(failure_cases["check"], failure_cases["index"])) == {("five_digits", 3), ("isin(['M', 'F'])", 35)}
+
+
+def test_parallel_engine_matches_pandera(schema, schema_file, df):
+    validated = validate_dataframe(df, schema, schema_file, engine="parallel", max_workers=2, min_partition_rows=10)
+    assert_frame_equal(validated, schema.validate(df))
+
+
+def test_parallel_engine_merges_failures(schema, schema_file, df):
+    df.loc[3, "code"] = "1"
+    df.loc[35, "sex"] = "X"
+    df.loc[30, "id"] = 2
+
+    with pytest.raises(SchemaErrors) as errors:
+        validate_dataframe(df, schema, schema_file, engine="parallel", max_workers=2, min_partition_rows=10)
+
+    failure_cases = errors.value.failure_cases
+    assert set(zip(failure_cases["check"], failure_cases["index"])) == {
+        ("five_digits", 3),
+        ("isin(['M', 'F'])", 35),
+        ("field_uniqueness", 2),
+        ("field_uniqueness", 30),
+    }
+    assert dict(errors.value.error_counts) == {"DATAFRAME_CHECK": 2, "SERIES_CONTAINS_DUPLICATES": 1}
+
+
+@pytest.mark.parametrize("options", [{"max_workers": 2}, {"max_workers": 1, "min_partition_rows": 10}])
+def test_parallel_engine_small_frame_runs_in_process(schema, df, options):
+    # The schema file is never loaded when the frame is too small to partition or there is one worker
+    validated = validate_dataframe(df, schema, "missing.py", engine="parallel", **options)
+    assert_frame_equal(validated, schema.validate(df))